@@ -0,0 +1,364 @@
+"""
+This module defines the DialogCrawler class, which fetches dialogs from the
+API concurrently, as the dialog endpoint only accepts a single ID per request.
+"""
+
+import json
+import os
+from collections.abc import Generator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from email.utils import parsedate_to_datetime
+from itertools import count
+from pathlib import Path
+from threading import local
+from time import perf_counter, sleep, time
+
+from requests import JSONDecodeError, RequestException, Session
+
+from aq3d_api import utils
+from aq3d_api.enums.endpoints import Endpoints
+
+CHECKPOINT_VERSION = 1
+
+# Client errors which mean the request should be sent again later, such as
+# when rate limited, rather than that the ID has no dialog.
+RETRY_STATUSES = (408, 429)
+
+
+class DialogCrawler:
+    """
+    Crawls a range of dialog IDs with many requests in flight at once.
+
+    Each worker thread keeps its own HTTP session, so connections are reused.
+    IDs the API has no dialog for (`ID <= 0`) are counted as gaps and skipped.
+    Timeouts, rate limits (408 and 429, honouring `Retry-After`) and server
+    errors are retried with backoff, and count as failed once out of retries.
+    Without a `max_index` the crawl continues until `gap_limit` IDs in a row
+    after the highest found dialog were gaps.
+
+    With a checkpoint, found dialogs are appended to a JSON Lines file next to
+    it (`<stem>-dialogs.jsonl`) and the crawled IDs are saved every
+    `checkpoint_every` IDs, so an interrupted crawl resumes where it stopped.
+    IDs which failed after every retry aren't saved as crawled.
+
+    ```
+    crawler = DialogCrawler(max_index=20000, checkpoint=Path("dialogs.json"))
+    print(crawler.crawl())
+    dialogs = Dialogs()
+    dialogs.load_raw(Dialog, crawler.records())
+    ```
+    """
+
+    def __init__(self,
+                 min_index: int = 1,
+                 max_index: int | None = None,
+                 workers: int = 32,
+                 gap_limit: int = 500,
+                 retries: int = 2,
+                 timeout: float = 10.0,
+                 checkpoint: Path | None = None,
+                 checkpoint_every: int = 500):
+        """
+        ### Parameters:
+            **min_index (int, optional)**: The first dialog ID to crawl.
+            **max_index (int, optional)**: The last dialog ID to crawl, open ended if None.
+            **workers (int, optional)**: How many requests are in flight at once.
+            **gap_limit (int, optional)**: How many gaps in a row end an open ended crawl.
+            **retries (int, optional)**: How many times a failed request is retried.
+            **timeout (float, optional)**: The most seconds to wait on a request.
+            **checkpoint (Path, optional)**: The file the progress is saved to and resumed from.
+            **checkpoint_every (int, optional)**: How many crawled IDs between saves.
+
+        ### Raises:
+            **ValueError**: If the range, workers or gap limit are invalid.
+        """
+
+        if min_index < 1 or (max_index is not None and max_index < min_index):
+            raise ValueError("Expected a min index of at least 1 and at most the max index.")
+
+        if workers < 1 or gap_limit < 1:
+            raise ValueError("Expected at least 1 worker and a gap limit of at least 1.")
+
+        if checkpoint is not None and not isinstance(checkpoint, Path):
+            raise ValueError("Expected a Path instance of the checkpoint file.")
+
+        self.__min_index = min_index
+        self.__max_index = max_index
+        self.__workers = workers
+        self.__gap_limit = gap_limit
+        self.__retries = retries
+        self.__timeout = timeout
+        self.__checkpoint = checkpoint
+        self.__checkpoint_every = checkpoint_every
+        self.__sessions = local()
+        self.__opened_sessions = []
+        self.__records = {}
+
+        # Every ID below the watermark was crawled, along with the IDs in done.
+        self.__watermark = min_index
+        self.__done = set()
+        self.__highest_found = min_index - 1
+        self.__stats = {"requested": 0, "found": 0, "gaps": 0, "failed": 0, "elapsed": 0.0}
+
+        if checkpoint is not None and checkpoint.exists():
+            self.__load_checkpoint()
+
+    @property
+    def records_path(self) -> Path | None:
+        """
+        Returns the JSON Lines file the found dialogs are written to.
+
+        ### Returns:
+            **Path | None**: The path, or None without a checkpoint.
+        """
+
+        if self.__checkpoint is None:
+            return None
+
+        return self.__checkpoint.with_name(f"{self.__checkpoint.stem}-dialogs.jsonl")
+
+    @property
+    def report(self) -> dict:
+        """
+        Returns the throughput of the crawl so far.
+
+        ### Returns:
+            **dict**: The requested, found, gap and failed ID counts, the elapsed
+            seconds and the requests and dialogs per second.
+        """
+
+        elapsed = self.__stats["elapsed"]
+        return {
+            **self.__stats,
+            "requests_per_second": self.__stats["requested"] / elapsed if elapsed else 0.0,
+            "dialogs_per_second": self.__stats["found"] / elapsed if elapsed else 0.0
+        }
+
+    def crawl(self) -> dict:
+        """
+        Crawls every dialog ID which wasn't crawled yet.
+
+        ### Returns:
+            **dict**: The throughput report of the crawl, see `report`.
+        """
+
+        started = perf_counter() - self.__stats["elapsed"]
+        records = self.__open_records()
+        ids = self.__pending()
+        next_id = next(ids, None)
+        pending = {}
+        since_checkpoint = 0
+
+        try:
+            with ThreadPoolExecutor(self.__workers) as executor:
+                while True:
+                    # Keeps at most two requests per worker queued.
+                    while (next_id is not None and len(pending) < self.__workers * 2
+                           and self.__within_gap_limit(next_id)):
+                        pending[executor.submit(self.__fetch, next_id)] = next_id
+                        next_id = next(ids, None)
+
+                    if not pending:
+                        break
+
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        self.__complete(pending.pop(future), future, records)
+                        since_checkpoint += 1
+
+                    if since_checkpoint >= self.__checkpoint_every:
+                        self.__save_checkpoint(records)
+                        since_checkpoint = 0
+        finally:
+            self.__stats["elapsed"] = perf_counter() - started
+            self.__save_checkpoint(records)
+            if records is not None:
+                records.close()
+
+            self.__close_sessions()
+
+        return self.report
+
+    def records(self) -> Generator[dict]:
+        """
+        Yields the raw API data of every found dialog, in order of ID.
+        The dialogs can be loaded into a container with `load_raw(Dialog, records)`.
+
+        ### Yields:
+            **Generator[dict]**: The raw data of each dialog.
+        """
+
+        if self.records_path is None:
+            yield from (self.__records[key] for key in sorted(self.__records))
+            return None
+
+        if not self.records_path.exists():
+            return None
+
+        # Dialogs written again after an interrupted checkpoint are only yielded once.
+        found = {raw["ID"]: raw for raw in utils.read_jsonl(self.records_path)}
+        yield from (found[key] for key in sorted(found))
+
+    def __pending(self) -> Generator[int]:
+        """
+        Yields the IDs which weren't crawled yet.
+        """
+
+        end = self.__max_index + 1 if self.__max_index is not None else None
+        ids = range(self.__watermark, end) if end is not None else count(self.__watermark)
+        return (dialog_id for dialog_id in ids if dialog_id not in self.__done)
+
+    def __within_gap_limit(self, dialog_id: int) -> bool:
+        """
+        Returns if an ID is within the gap limit after the highest found
+        dialog, always true for crawls with a max index.
+        """
+
+        return self.__max_index is not None or dialog_id - self.__highest_found <= self.__gap_limit
+
+    def __fetch(self, dialog_id: int) -> dict | None:
+        """
+        Requests a single dialog, retrying failed requests.
+
+        ### Returns:
+            **dict | None**: The raw dialog, or None if the ID has no dialog.
+
+        ### Raises:
+            **RequestException**: If every attempt failed.
+            **ValueError**: If the dialog has no integer ID.
+        """
+
+        session = getattr(self.__sessions, "session", None)
+        if session is None:
+            session = self.__sessions.session = Session()
+            self.__opened_sessions.append(session)
+
+        url, param_key = Endpoints.GET_DIALOGS.value
+        for attempt in range(self.__retries + 1):
+            delay = 0.5 * 2 ** attempt
+            try:
+                response = session.get(url, params={param_key: dialog_id}, timeout=self.__timeout)
+                status = response.status_code
+                if status in RETRY_STATUSES or status >= 500:
+                    delay = max(delay, _retry_after(response))
+                    response.raise_for_status()
+                # Other client errors are answers about the ID, not failures worth retrying.
+                elif status >= 400:
+                    return None
+
+                data = response.json()
+                break
+            except (RequestException, JSONDecodeError):
+                if attempt == self.__retries:
+                    raise
+
+                sleep(delay)
+
+        if isinstance(data, list):
+            data = data[0] if data else None
+
+        if not isinstance(data, dict):
+            return None
+
+        dialog_id = data.get("ID")
+        if not isinstance(dialog_id, int) or isinstance(dialog_id, bool):
+            raise ValueError(f"Expected an integer ID in the dialog, got {dialog_id!r}.")
+
+        if dialog_id <= 0:
+            return None
+
+        return data
+
+    def __complete(self, dialog_id: int, future, records):
+        """
+        Records the result of a finished request.
+        """
+
+        self.__stats["requested"] += 1
+        try:
+            raw = future.result()
+        except (RequestException, ValueError):
+            # JSONDecodeError and malformed dialogs are ValueErrors too.
+            self.__stats["failed"] += 1
+            return None
+
+        if raw is None:
+            self.__stats["gaps"] += 1
+        else:
+            self.__stats["found"] += 1
+            self.__highest_found = max(self.__highest_found, dialog_id)
+            if records is None:
+                self.__records[raw["ID"]] = raw
+            else:
+                records.write(json.dumps(raw, separators=(",", ":")) + "\n")
+
+        self.__done.add(dialog_id)
+        while self.__watermark in self.__done:
+            self.__done.remove(self.__watermark)
+            self.__watermark += 1
+
+    def __close_sessions(self):
+        """
+        Closes the sessions of the worker threads, which end with the crawl.
+        """
+
+        for session in self.__opened_sessions:
+            session.close()
+
+        self.__opened_sessions.clear()
+        self.__sessions = local()
+
+    def __open_records(self):
+        if self.records_path is None:
+            return None
+
+        return open(self.records_path, "a")
+
+    def __load_checkpoint(self):
+        state = json.loads(self.__checkpoint.read_text())
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported dialog crawl checkpoint in {self.__checkpoint}.")
+
+        self.__watermark = max(state["watermark"], self.__min_index)
+        self.__done = set(state["done"])
+        self.__highest_found = state["highest_found"]
+        self.__stats = state["stats"]
+
+    def __save_checkpoint(self, records):
+        if self.__checkpoint is None:
+            return None
+
+        # The dialogs are written before the IDs are saved as crawled.
+        records.flush()
+        os.fsync(records.fileno())
+
+        temporary = self.__checkpoint.with_stem(f"{self.__checkpoint.stem}.tmp")
+        temporary.write_text(json.dumps({
+            "version": CHECKPOINT_VERSION,
+            "watermark": self.__watermark,
+            "done": sorted(self.__done),
+            "highest_found": self.__highest_found,
+            "stats": self.__stats
+        }, separators=(",", ":")))
+        os.replace(temporary, self.__checkpoint)
+
+
+def _retry_after(response) -> float:
+    """
+    Returns the seconds a response asks to wait before retrying,
+    from its `Retry-After` header in seconds or as a date.
+    """
+
+    value = response.headers.get("Retry-After")
+    if not value:
+        return 0.0
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time(), 0.0)
+    except (TypeError, ValueError):
+        return 0.0
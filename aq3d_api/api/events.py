@@ -0,0 +1,329 @@
+"""
+This module defines the change events published by the containers when an
+update replaces their data, and the ChangeEvents class which tracks what
+changed between updates and delivers it to callbacks and async iterators.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import Callable, Iterable
+from threading import Lock
+from time import time
+
+_logger = logging.getLogger(__name__)
+
+# Schema fields which change whenever the API refreshes an object, left out of its fingerprint.
+VOLATILE_FIELDS = ("last_updated",)
+
+
+class ChangeSet:
+    """
+    The ids of the objects which were added, removed or changed by an update.
+    """
+
+    __slots__ = ("__cls", "__added", "__removed", "__changed", "__timestamp")
+
+    def __init__(self, cls: type, added: Iterable = (), removed: Iterable = (),
+                 changed: Iterable = (), timestamp: float | None = None):
+        """
+        ### Parameters:
+            **cls (type)**: The class of the objects, such as Item.
+            **added (Iterable)**: The ids of the new objects.
+            **removed (Iterable)**: The ids of the objects which no longer exist.
+            **changed (Iterable)**: The ids of the objects whose data changed.
+            **timestamp (float, optional)**: When the update happened, the current time if None.
+        """
+
+        self.__cls = cls
+        self.__added = frozenset(added)
+        self.__removed = frozenset(removed)
+        self.__changed = frozenset(changed)
+        self.__timestamp = time() if timestamp is None else timestamp
+
+    @property
+    def cls(self) -> type:
+        """
+        Returns the class of the changed objects.
+
+        ### Returns:
+            **type**: The class, such as Item.
+        """
+
+        return self.__cls
+
+    @property
+    def added(self) -> frozenset:
+        """
+        Returns the ids of the objects the update added.
+
+        ### Returns:
+            **frozenset**: The ids of the new objects.
+        """
+
+        return self.__added
+
+    @property
+    def removed(self) -> frozenset:
+        """
+        Returns the ids of the objects which no longer exist.
+
+        ### Returns:
+            **frozenset**: The ids of the removed objects.
+        """
+
+        return self.__removed
+
+    @property
+    def changed(self) -> frozenset:
+        """
+        Returns the ids of the objects whose data changed.
+
+        ### Returns:
+            **frozenset**: The ids of the changed objects.
+        """
+
+        return self.__changed
+
+    @property
+    def timestamp(self) -> float:
+        """
+        Returns when the update happened.
+
+        ### Returns:
+            **float**: The seconds since epoch of the update.
+        """
+
+        return self.__timestamp
+
+    def __len__(self) -> int:
+        return len(self.__added) + len(self.__removed) + len(self.__changed)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __repr__(self) -> str:
+        return (
+            f"ChangeSet({self.__cls.__name__}, added={len(self.__added)}, "
+            f"removed={len(self.__removed)}, changed={len(self.__changed)})"
+        )
+
+
+class ChangeSubscription:
+    """
+    An async iterator of the change sets published after it was created.
+
+    ```
+    async with container.events.subscription() as changes:
+        async for change_set in changes:
+            ...
+    ```
+    """
+
+    def __init__(self, events: "ChangeEvents", maxsize: int = 0):
+        """
+        ### Parameters:
+            **events (ChangeEvents)**: The events to subscribe to.
+            **maxsize (int, optional)**: The most change sets queued, the oldest
+            are dropped once full. Unbounded by default.
+
+        ### Raises:
+            **RuntimeError**: If there is no running event loop.
+        """
+
+        self.__events = events
+        self.__loop = asyncio.get_running_loop()
+        self.__queue = asyncio.Queue(maxsize)
+        self.__closed = False
+        events.subscribe(self.__publish)
+
+    def close(self):
+        """
+        Stops receiving change sets, iteration ends once the queued sets are read.
+        """
+
+        if self.__closed:
+            return None
+
+        self.__closed = True
+        self.__events.unsubscribe(self.__publish)
+        self.__loop.call_soon_threadsafe(self.__put, None)
+
+    def __publish(self, changes: ChangeSet):
+        # Updates may run in other threads, such as warm start refreshes.
+        self.__loop.call_soon_threadsafe(self.__put, changes)
+
+    def __put(self, changes: ChangeSet | None):
+        if self.__queue.full():
+            self.__queue.get_nowait()
+
+        self.__queue.put_nowait(changes)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> ChangeSet:
+        if self.__closed and self.__queue.empty():
+            raise StopAsyncIteration
+
+        changes = await self.__queue.get()
+        if changes is None:
+            raise StopAsyncIteration
+
+        return changes
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+
+class ChangeEvents:
+    """
+    Tracks the objects of a container between updates and publishes
+    a ChangeSet of what each update added, removed or changed.
+
+    Objects are compared by the fingerprint of the raw API data of their schema
+    fields, which is only tracked while there are subscribers. Timestamps of
+    when the API last refreshed an object (see `VOLATILE_FIELDS`) are left out,
+    so objects aren't reported as changed for them alone. The first update
+    after subscribing reports every object as added.
+    """
+
+    def __init__(self):
+        self.__callbacks = []
+        self.__fingerprints = None
+        self.__lock = Lock()
+
+    @property
+    def active(self) -> bool:
+        """
+        Returns if anything is subscribed to the changes.
+
+        ### Returns:
+            **bool**: If there are subscribers.
+        """
+
+        return bool(self.__callbacks)
+
+    def subscribe(self, callback: Callable[[ChangeSet], None]) -> Callable[[], None]:
+        """
+        Calls the callback with the ChangeSet of every update which changed something.
+
+        ### Parameters:
+            **callback (Callable[[ChangeSet], None])**: The function to call.
+
+        ### Returns:
+            **Callable[[], None]**: A function which unsubscribes the callback.
+        """
+
+        with self.__lock:
+            self.__callbacks.append(callback)
+
+        return lambda: self.unsubscribe(callback)
+
+    def unsubscribe(self, callback: Callable[[ChangeSet], None]):
+        """
+        Stops calling a subscribed callback.
+
+        ### Parameters:
+            **callback (Callable[[ChangeSet], None])**: The subscribed function.
+        """
+
+        with self.__lock:
+            if callback in self.__callbacks:
+                self.__callbacks.remove(callback)
+
+            # Nothing is tracked without subscribers, so the next
+            # subscriber doesn't get changes against stale data.
+            if not self.__callbacks:
+                self.__fingerprints = None
+
+    def subscription(self, maxsize: int = 0) -> ChangeSubscription:
+        """
+        Returns an async iterator of the change sets, see ChangeSubscription.
+
+        ### Parameters:
+            **maxsize (int, optional)**: The most change sets queued, unbounded by default.
+
+        ### Returns:
+            **ChangeSubscription**: The subscription, which has to be closed when done.
+        """
+
+        return ChangeSubscription(self, maxsize)
+
+    def track(self, cls: type, raws: list[dict]) -> ChangeSet | None:
+        """
+        Compares the raw data of an update against the previous update.
+
+        ### Parameters:
+            **cls (type)**: The class of the objects.
+            **raws (list[dict])**: The raw API data of every object.
+
+        ### Returns:
+            **ChangeSet | None**: What changed, or None without subscribers.
+        """
+
+        if not self.active:
+            return None
+
+        id_path = next(field.path for field in cls.schema if field.name == "id")
+        paths = [field.path for field in cls.schema if field.name not in VOLATILE_FIELDS]
+        fingerprints = {}
+        for raw in raws:
+            values = [_read(raw, path) for path in paths]
+            fingerprints[_read(raw, id_path)] = hash(json.dumps(values, sort_keys=True, default=str))
+
+        # Updates may run concurrently, such as a warm start refresh and a
+        # regular one, so each compares against the one swapped in before it.
+        with self.__lock:
+            if not self.__callbacks:
+                return None
+
+            previous = self.__fingerprints or {}
+            self.__fingerprints = fingerprints
+
+        return ChangeSet(
+            cls,
+            added=fingerprints.keys() - previous.keys(),
+            removed=previous.keys() - fingerprints.keys(),
+            changed=(
+                oid for oid, fingerprint in fingerprints.items()
+                if oid in previous and previous[oid] != fingerprint
+            )
+        )
+
+    def publish(self, changes: ChangeSet):
+        """
+        Calls every subscriber with a change set, if anything changed.
+        A failing subscriber doesn't stop the others from being called,
+        its exception is logged to the `aq3d_api.api.events` logger.
+
+        ### Parameters:
+            **changes (ChangeSet)**: The changes to publish.
+        """
+
+        if not changes:
+            return None
+
+        with self.__lock:
+            callbacks = list(self.__callbacks)
+
+        for callback in callbacks:
+            try:
+                callback(changes)
+            except Exception:
+                _logger.exception("Change subscriber %r failed on %r.", callback, changes)
+
+
+def _read(raw: dict, path: tuple):
+    """
+    Returns the value at a path of keys in raw API data, None if it is missing.
+    """
+
+    value = raw
+    for key in path:
+        value = value.get(key) if isinstance(value, dict) else None
+
+    return value
@@ -3,8 +3,14 @@ This module provides the APIService base class, which manages automatic updating
 It defines the interface and logic for checking update intervals and fetching fresh data, intended to be extended by subclasses.
 """
 
+import os
 from time import time
 from abc import abstractmethod
+from pathlib import Path
+from threading import Thread
+
+from aq3d_api import utils
+from aq3d_api.api.events import ChangeEvents
 
 class APIService:
     """
@@ -14,6 +20,9 @@ class APIService:
     Subclasses should implement the `_fetch` method with specific retrieval logic.
     """
 
+    # If the API is requested for an id range, otherwise every object is fetched at once.
+    _ranged = True
+
     def __init__(self, options: dict = {}):
         """
         ### Parameters:
@@ -21,12 +30,31 @@ class APIService:
             **min-index (int)**: Minimum number of dialogs by ID range.
             **max-index (int)**: Maximum number of dialogs by ID range.
             **update-interval (int)**: Interval (in seconds) for automatic updates.
+            **lazy (bool)**: Keeps the raw records and only creates objects once accessed.
+            **storage (SQLiteStorage)**: Upserts the objects into a database, which the
+            container then reads from instead of holding them in memory.
+            **warm-start (Path)**: A JSON Lines export (`.jsonl` or `.jsonl.gz`) or catalog
+            file which is served on the first update while the API is requested in the background.
+            **save-warm-start (bool)**: Rewrites the warm-start file with the fresh data after
+            an update, so the next start is served from recent data. Enabled by default.
+            **save-warm-start-interval (int)**: The fewest seconds between rewrites of the
+            warm-start file, an hour by default. The first update from the API always rewrites it.
         """
 
         self._auto_update = options.get("auto-update", False)
         self._min_index = options.get("min-index", 1)
         self._max_index = options.get("max-index", 1)
         self._update_interval = options.get("update-interval", -1)
+        self._lazy = options.get("lazy", False)
+        self._storage = options.get("storage")
+        self._warm_start = options.get("warm-start")
+        self._save_warm_start = options.get("save-warm-start", True)
+        self._save_warm_start_interval = options.get("save-warm-start-interval", 3600)
+        self.__warm_start_saved = None
+        self.__refresh_thread = None
+        self.__refresh_error = None
+        self.__retry_refresh = False
+        self.__events = ChangeEvents()
         self.__inital_update = False
         self._last_updated = time()
 
@@ -40,8 +68,9 @@ class APIService:
             **bool**: If the time since the last update exceeds the update interval.
         """
 
-        # At least the first update should gather data.
-        if not self.__inital_update:
+        # At least the first update should gather data, and a failed
+        # background update is retried by the next one.
+        if not self.__inital_update or self.__retry_refresh:
             return True
 
         # Shouldn't update if the value is -1, which means disabled.
@@ -54,14 +83,102 @@ class APIService:
         return True
 
 
+    @property
+    def events(self) -> ChangeEvents:
+        """
+        Returns the change events of the container, which publish the ids of the
+        objects each update from the API added, removed or changed.
+
+        ### Returns:
+            **ChangeEvents**: The events to subscribe to.
+        """
+
+        return self.__events
+
+    @property
+    def refreshing(self) -> bool:
+        """
+        Returns if a background update started by a warm start is still running.
+
+        ### Returns:
+            **bool**: If the background update is running.
+        """
+
+        return self.__refresh_thread is not None and self.__refresh_thread.is_alive()
+
+    @property
+    def last_refresh_error(self) -> Exception | None:
+        """
+        Returns the error which ended the background update started by a
+        warm start, the warm-start data is served until an update succeeds.
+
+        ### Returns:
+            **Exception | None**: The error, or None once an update succeeded.
+        """
+
+        return self.__refresh_error
+
+    def wait_for_refresh(self, timeout: float | None = None) -> bool:
+        """
+        Blocks until the background update started by a warm start has finished.
+
+        ### Parameters:
+            **timeout (float, optional)**: The most seconds to wait, forever if None.
+
+        ### Returns:
+            **bool**: If no background update is running anymore.
+        """
+
+        if self.__refresh_thread is not None:
+            self.__refresh_thread.join(timeout)
+
+        return not self.refreshing
+
     def update(self):
         """
         Fetches and updates data from the API if an update is needed.
+
+        With a warm-start file the first update serves the file instead,
+        and fetches from the API in a background thread.
         """
 
-        if not self.__needs_updating:
+        if not self.__needs_updating or self.refreshing:
+            return None
+
+        if not self.__inital_update and self._warm_start and self.__load_warm_start():
+            self.__refresh_thread = Thread(target=self.__background_refresh, daemon=True)
+            self.__refresh_thread.start()
             return None
 
+        self.__refresh()
+
+    def refresh(self) -> bool:
+        """
+        Fetches and updates data from the API now, regardless of the update interval.
+
+        ### Returns:
+            **bool**: If data was fetched, False if the API returned nothing.
+        """
+
+        return self.__refresh()
+
+    def __background_refresh(self):
+        """
+        Updates from the API in the background of a warm start. Errors are
+        recorded instead of ending the thread unnoticed, and the next update
+        requests the API again.
+        """
+
+        try:
+            self.__retry_refresh = not self.__refresh()
+        except Exception as error:
+            self.__refresh_error = error
+            self.__retry_refresh = True
+
+    def __refresh(self) -> bool:
+        """
+        Fetches the data from the API and replaces the data of the container.
+        """
 
         # The fetch method of the subclass will return a tuple
         # where the first part is the DataContainer subclass,
@@ -71,21 +188,190 @@ class APIService:
         raw_objects = handler_func(self._min_index, self._max_index)
 
         if not raw_objects or not cls:
-            return None
+            return False
 
         self._last_updated = time()
         self.__inital_update = True
+        self.__retry_refresh = False
+        self.__refresh_error = None
 
         # Some data from the API comes back as dict object rather than a list.
         # In this case make the values of that dict the list objects.
         if isinstance(raw_objects, dict):
             raw_objects = list(raw_objects.values())
 
-        objects = [cls.create_raw(obj) for obj in raw_objects]
+        # Stored objects are written in a single transaction, the
+        # container then queries the database instead of memory. Objects
+        # missing from the fetch are deleted, as they would be from memory.
+        if self._storage:
+            id_range = (self._min_index, self._max_index) if self._ranged else None
+            self._storage.sync_raw(cls, raw_objects, id_range)
+            container.load_stored(self._storage, cls)
+        # Lazy containers only create the objects which are accessed.
+        elif self._lazy:
+            container.load_raw(cls, raw_objects)
+        else:
+            objects = cls.create_many(raw_objects)
+
+            # We need to overwrite the containers objects
+            # to avoid duplication.
+            container.append(cls, True, objects)
+
+        # Only compared against the previous update while something is subscribed,
+        # and only once the container holds the data it is compared against.
+        changes = self.__events.track(cls, raw_objects)
 
-        # We need to overwrite the containers objects
-        # to avoid duplication.
-        container.append(cls, True, objects)
+        # Writing the file costs about as much as the update itself, so
+        # it isn't rewritten more often than the interval.
+        if self._warm_start and self._save_warm_start and (
+                self.__warm_start_saved is None
+                or time() - self.__warm_start_saved >= self._save_warm_start_interval):
+            self.__save_warm_start(container)
+
+        if changes:
+            self.__events.publish(changes)
+
+        return True
+
+    def __load_warm_start(self) -> bool:
+        """
+        Loads the warm-start file into the container, if it exists.
+
+        ### Returns:
+            **bool**: If the file was loaded, a missing or unreadable
+            file falls back to a regular update.
+        """
+
+        path = Path(self._warm_start)
+        if not path.exists():
+            return False
+
+        try:
+            if _is_jsonl(path):
+                self.load_jsonl(path)
+            else:
+                self.open_catalog(path)
+        except (OSError, ValueError):
+            return False
+
+        return True
+
+    def __save_warm_start(self, container):
+        """
+        Writes the data of the container into the warm-start file. The data
+        is written next to it first and then swapped in, so readers never
+        see a partially written file.
+
+        A served warm-start catalog was closed when the fresh data replaced
+        it, as a memory-mapped file can't be replaced on every platform.
+        """
+
+        path = Path(self._warm_start)
+        temporary = path.with_stem(f"{path.stem}.tmp")
+        if _is_jsonl(path):
+            container.to_jsonl(temporary)
+        else:
+            container.to_catalog(temporary)
+
+        os.replace(temporary, path)
+        self.__warm_start_saved = time()
+
+    def load_jsonl(self, path: Path):
+        """
+        Loads the data from a JSON Lines export instead of the API, the
+        objects are only created once they are accessed.
+
+        The loaded data counts as an update, so the API is only requested
+        again once the update interval has passed.
+
+        ### Parameters:
+            **path (Path)**: The path of a file written by `to_jsonl`.
+        """
+
+        container, _, cls = self._fetch()
+        container.load_raw(cls, utils.read_jsonl(path), record=True)
+
+        self._last_updated = time()
+        self.__inital_update = True
+
+    def load_storage(self):
+        """
+        Serves the objects already in the storage of the container, such as
+        a catalog written by another worker, instead of requesting the API.
+
+        The loaded data counts as an update, so the API is only requested
+        again once the update interval has passed.
+
+        ### Raises:
+            **ValueError**: If the container has no storage option.
+        """
+
+        if not self._storage:
+            raise ValueError("Expected a container with a storage option to load from.")
+
+        container, _, cls = self._fetch()
+        container.load_stored(self._storage, cls)
+
+        self._last_updated = time()
+        self.__inital_update = True
+
+    def open_catalog(self, path: Path):
+        """
+        Serves the data of a catalog file written by `to_catalog` instead of
+        the API. The file is memory-mapped, so the objects are decoded when
+        accessed and processes opening the same file share its memory.
+
+        The loaded data counts as an update, so the API is only requested
+        again once the update interval has passed.
+
+        ### Parameters:
+            **path (Path)**: The path of a file written by `to_catalog`.
+
+        ### Raises:
+            **ValueError**: If the file isn't a catalog of the containers class.
+        """
+
+        from aq3d_api.storage.catalog import Catalog
+
+        container, _, cls = self._fetch()
+        container.load_catalog(Catalog(path, cls))
+
+        self._last_updated = time()
+        self.__inital_update = True
+
+    @classmethod
+    def from_catalog(cls, path: Path, options: dict = {}):
+        """
+        Creates a container with its data loaded from a catalog file.
+
+        ### Parameters:
+            **path (Path)**: The path of a file written by `to_catalog`.
+            **options (dict, optional)**: The options of the container.
+
+        ### Returns:
+            **APIService**: The new container.
+        """
+
+        service = cls(options)
+        service.open_catalog(path)
+        return service
+
+    @classmethod
+    def from_jsonl(cls, path: Path, options: dict = {}):
+        """
+        Creates a container with its data loaded from a JSON Lines export.
+
+        ### Parameters:
+            **path (Path)**: The path of a file written by `to_jsonl`.
+            **options (dict, optional)**: The options of the container.
+
+        ### Returns:
+            **APIService**: The new container.
+        """
+
+        service = cls(options)
+        service.load_jsonl(path)
+        return service
 
     @abstractmethod
     def _fetch(self) -> tuple:
@@ -103,3 +389,11 @@ class APIService:
         """
 
         pass
+
+
+def _is_jsonl(path: Path) -> bool:
+    """
+    Returns if a path is of a JSON Lines file, otherwise it's of a catalog.
+    """
+
+    return ".jsonl" in path.suffixes
@@ -4,10 +4,12 @@ for storing and processing collections of objects, with utility methods for
 exporting the contained data to CSV and JSON formats.
 """
 
-from collections.abc import Generator
+from collections.abc import Callable, Generator, Iterable
 from pathlib import Path
 
 from aq3d_api import utils
+from aq3d_api.containers.lazy import LazyRecords
+from aq3d_api.indexes.index import ObjectIndex
 
 
 class DataContainer:
@@ -16,10 +18,17 @@ class DataContainer:
 
     Provides methods for adding objects, iterating, and exporting
     the collection to CSV and JSON files.
+
+    The storage and export backends, such as SQLite, catalogs and Arrow,
+    are only imported once a method of theirs is used.
+
+    Lazily loaded, stored and catalog records stand in for the list of objects,
+    they filter themselves (`where`) and provide views of their objects (`views`).
     """
 
     def __init__(self):
         self.__objs = []
+        self.__indexes = []
 
     @property
     def _objs(self) -> Generator:
@@ -56,7 +65,7 @@ class DataContainer:
         """
 
         if overwrite:
-            self.__objs = [obj for obj in objs[0] if isinstance(obj, cls)]
+            self._replace([obj for obj in objs[0] if isinstance(obj, cls)], cls)
             return
 
         # *objs returns a tuple with the list of items inside
@@ -66,13 +75,165 @@ class DataContainer:
                 continue
 
             self.__objs.append(obj)
+            for index in self.__indexes:
+                index.add(obj)
+
+    def load_raw(self, cls: type, raws: Iterable[dict], record: bool = False):
+        """
+        Overwrites all objects inside the container with raw records,
+        which are only decoded into objects of `cls` once accessed.
+
+        Attached indexes are refreshed from the raw records where they can,
+        without creating every object.
+
+        ### Parameters:
+            **cls (type)**: The model class with a schema to decode the records into.
+            **raws (Iterable[dict])**: The raw records, structured as from the official API.
+            **record (bool, optional)**: The records are exported records (see `utils.to_record`)
+            instead of raw API data.
+        """
+
+        records = LazyRecords(cls, raws, record)
+        self._replace(records, cls, records.views() if self.__indexes else None)
+
+    def load_stored(self, storage: "SQLiteStorage", cls: type):
+        """
+        Replaces the objects inside the container with the objects of `cls`
+        stored in a SQLiteStorage, which are read from the database when
+        accessed instead of being held in memory.
+
+        Attached indexes are refreshed from the columns they read,
+        without reading every object.
+
+        ### Parameters:
+            **storage (SQLiteStorage)**: The storage holding the objects.
+            **cls (type)**: The model class of the stored objects.
+
+        ### Raises:
+            **ValueError**: If the provided storage is not a SQLiteStorage.
+        """
+
+        from aq3d_api.storage.sqlite import SQLiteStorage
+
+        if not isinstance(storage, SQLiteStorage):
+            raise ValueError("Expected a SQLiteStorage instance to load from.")
+
+        records = storage.records(cls)
+        self._replace(records, cls, records.views() if self.__indexes else None)
+
+    def load_catalog(self, catalog: "Catalog"):
+        """
+        Replaces the objects inside the container with the objects of a
+        memory-mapped catalog, which are decoded when accessed.
+
+        Attached indexes are refreshed from the attributes they read,
+        without decoding every object. A previously loaded catalog is closed.
+
+        ### Parameters:
+            **catalog (Catalog)**: The opened catalog file.
+
+        ### Raises:
+            **ValueError**: If the provided catalog is not a Catalog.
+        """
+
+        from aq3d_api.storage.catalog import Catalog
+
+        if not isinstance(catalog, Catalog):
+            raise ValueError("Expected a Catalog instance to load from.")
+
+        self._replace(catalog, catalog.cls, catalog.views() if self.__indexes else None)
+
+    def _replace(self, objs, cls: type, views: Iterable | None = None):
+        """
+        Replaces the objects inside the container with a sequence of
+        objects of `cls`, and refreshes the attached indexes. Replaced records
+        which hold a file open, such as a catalog, are closed so the file can be replaced.
+
+        ### Parameters:
+            **objs (Sequence)**: The new objects of the container.
+            **cls (type)**: The class of the objects.
+            **views (Iterable, optional)**: Stand-ins of the objects to index
+            instead, so they don't all have to be created.
+        """
+
+        previous, self.__objs = self.__objs, objs
+        for index in self.__indexes:
+            index.refresh(objs if views is None else views, cls.__name__)
+
+        close = getattr(previous, "close", None)
+        if close is not None and previous is not objs:
+            close()
+
+    def _where(self, name: str, test: Callable) -> Generator:
+        """
+        Yields the objects whose attribute passes a test. Lazily loaded
+        records are tested on their raw data, so only matching objects
+        are created.
+
+        ### Parameters:
+            **name (str)**: The attribute name of the objects.
+            **test (Callable)**: Returns true for the attribute values to keep.
+
+        ### Yields:
+            **Generator (obj)**: Each object whose attribute passes the test.
+        """
+
+        where = getattr(self.__objs, "where", None)
+        if where is not None:
+            return where(name, test)
+
+        return (obj for obj in self.__objs if test(getattr(obj, name)))
+
+    def _where_equals(self, name: str, value) -> Generator:
+        """
+        Yields the objects whose attribute equals a value. Stored objects
+        are filtered by the database, using its indexes.
+
+        ### Parameters:
+            **name (str)**: The attribute name of the objects.
+            **value (Any)**: The value the attribute should equal.
+
+        ### Yields:
+            **Generator (obj)**: Each object whose attribute equals the value.
+        """
+
+        find = getattr(self.__objs, "find", None)
+        if find is not None:
+            return find(**{name: value})
+
+        return self._where(name, lambda attribute: attribute == value)
+
+    def add_index(self, index: ObjectIndex):
+        """
+        Attaches an index to the container, which is kept in sync
+        whenever objects are appended or the container is refreshed.
+
+        ### Parameters:
+            **index (ObjectIndex)**: The index to keep in sync with this container.
+
+        ### Raises:
+            **ValueError**: If the provided index is not an ObjectIndex.
+        """
+
+        if not isinstance(index, ObjectIndex):
+            raise ValueError("Expected an ObjectIndex instance to attach.")
+
+        objs = self.__objs
+        views = getattr(objs, "views", None)
+        if views is not None:
+            objs = views()
+
+        for obj in objs:
+            index.add(obj)
+
+        self.__indexes.append(index)
 
     def to_csv(self, path: Path):
         """
         Export the objects contained in this container to a CSV file.
 
-        This method serializes the objects stored in the container
-        and writes them to the specified CSV file.
+        This method streams the objects stored in the container
+        into the specified CSV file, gzip compressed if the path ends in `.gz`.
 
         ### Parameters:
             **path (Path)**: The file path where the CSV will be saved.
@@ -84,7 +245,7 @@ class DataContainer:
         if not isinstance(path, Path):
             raise ValueError("Expected a Path instance to write the objects to.")
 
-        utils.to_csv(list(self._objs), path)
+        utils.to_csv(self._objs, path)
 
     def to_json_file(self, path: Path):
         """
@@ -102,6 +263,114 @@ class DataContainer:
 
         utils.to_json_file(list(self._objs), path)
 
+    def to_jsonl(self, path: Path):
+        """
+        Streams the container's objects into a JSON Lines file at the specified
+        path, one record per line, gzip compressed if the path ends in `.gz`.
+
+        ### Parameters:
+            **path (Path)**: The file system path where the file will be written.
+
+        ### Raises:
+            **ValueError**: If the provided path is not an instance of pathlib.Path.
+        """
+
+        if not isinstance(path, Path):
+            raise ValueError("Expected a Path instance to write the objects to.")
+
+        utils.to_jsonl(self._objs, path)
+
+    def to_catalog(self, path: Path):
+        """
+        Writes the container's objects into a binary catalog file, which
+        is loaded back through a memory map (see `Catalog`).
+
+        ### Parameters:
+            **path (Path)**: The file system path where the catalog will be written.
+
+        ### Raises:
+            **ValueError**: If the provided path is not an instance of pathlib.Path,
+            or the container is empty.
+        """
+
+        if not isinstance(path, Path):
+            raise ValueError("Expected a Path instance to write the objects to.")
+
+        from aq3d_api.storage.catalog import write_catalog
+
+        write_catalog(self._objs, path)
+
+    def export(self,
+               directory: Path,
+               formats: Iterable[str] = ("csv", "json"),
+               shard_size: int = 10000,
+               workers: int | None = None) -> dict:
+        """
+        Exports the container's objects into shards of several formats at
+        once, serialized in parallel worker processes, along with a manifest
+        of the written files (see `exports.parallel.export_shards`).
+
+        ### Parameters:
+            **directory (Path)**: The directory to write the files to.
+            **formats (Iterable[str], optional)**: Any of `csv`, `json`, `jsonl`,
+            `parquet` and `catalog`.
+            **shard_size (int, optional)**: How many objects each shard holds.
+            **workers (int, optional)**: The amount of worker processes, by default the amount of CPUs.
+
+        ### Returns:
+            **dict**: The manifest of the export.
+
+        ### Raises:
+            **ValueError**: If the provided directory is not an instance of pathlib.Path,
+            a format is unknown or the container is empty.
+        """
+
+        from aq3d_api.exports.parallel import export_shards
+
+        return export_shards(self._objs, directory, formats, shard_size, workers)
+
+    def to_arrow(self):
+        """
+        Converts the container's objects into an Arrow table, with a typed
+        column per attribute and dictionary encoded Enum columns.
+
+        Requires the optional pyarrow dependency.
+
+        ### Returns:
+            **pyarrow.Table**: The table of the objects.
+
+        ### Raises:
+            **ValueError**: If the container is empty.
+        """
+
+        from aq3d_api.exports import arrow
+
+        return arrow.to_arrow(self._objs)
+
+    def to_parquet(self, path: Path, compression: str = "zstd"):
+        """
+        Streams the container's objects into a Parquet file at the specified
+        path, a batch of objects at a time.
+
+        Requires the optional pyarrow dependency.
+
+        ### Parameters:
+            **path (Path)**: The file system path where the file will be written.
+            **compression (str, optional)**: The Parquet compression codec, such as
+            `zstd`, `snappy`, `gzip` or `none`.
+
+        ### Raises:
+            **ValueError**: If the provided path is not an instance of pathlib.Path,
+            or the container is empty.
+        """
+
+        if not isinstance(path, Path):
+            raise ValueError("Expected a Path instance to write the objects to.")
+
+        from aq3d_api.exports import arrow
+
+        arrow.to_parquet(self._objs, path, compression)
+
     def __getitem__(self, index: int) -> object:
         return self.__objs[index]
 
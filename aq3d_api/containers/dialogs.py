@@ -9,12 +9,18 @@ from aq3d_api.api.handlers.types import Handlers
 from aq3d_api.api.service import APIService
 from aq3d_api.containers.container import DataContainer
 from aq3d_api.dialogs.dialog import Dialog
+from aq3d_api.dialogs.frame import DialogFrame
+from aq3d_api.indexes.dialog import DialogIndex
+from aq3d_api.indexes.index import ObjectIndex
 
 
 class Dialogs(DataContainer, APIService):
     """
     A container class for managing Dialog objects, with
     optional API integration.
+
+    Looking up dialogs by NPC or speaker builds a DialogIndex on the first
+    lookup, unless one is attached already, which is kept in sync on every refresh.
     """
 
     def __init__(self, options: dict = {}):
@@ -24,6 +30,8 @@ class Dialogs(DataContainer, APIService):
             **min-index (int)**: Minimum number of dialogs by ID range.
             **max-index (int)**: Maximum number of dialogs by ID range.
             **update-interval (int)**: Interval (in seconds) for automatic updates.
+            **lazy (bool)**: Only creates dialogs from the API data once they are accessed.
+            **storage (SQLiteStorage)**: Stores the dialogs in a database instead of memory.
 
         ### Example
         ```
@@ -38,7 +46,7 @@ class Dialogs(DataContainer, APIService):
 
         DataContainer.__init__(self)
         APIService.__init__(self, options)
-
+        self.__lookup = None
 
     @property
     def dialogs(self) -> list[Dialog]:
@@ -55,6 +63,76 @@ class Dialogs(DataContainer, APIService):
         self.update()
         return list(self._objs)
 
+    def add_index(self, index: ObjectIndex):
+        """
+        Attaches an index to the container, see `DataContainer.add_index`.
+        An attached DialogIndex answers `by_npc` and `frames_by_speaker`,
+        instead of building one on the first lookup.
+
+        ### Parameters:
+            **index (ObjectIndex)**: The index to keep in sync with this container.
+
+        ### Raises:
+            **ValueError**: If the provided index is not an ObjectIndex.
+        """
+
+        DataContainer.add_index(self, index)
+        if isinstance(index, DialogIndex):
+            self.__lookup = index
+
+    def by_npc(self, npc_id: int) -> list[Dialog]:
+        """
+        Returns the dialogs an NPC acts in, without scanning every dialog.
+
+        ### Parameters:
+            **npc_id (int)**: The id of the NPC.
+
+        ### Returns:
+            **list[Dialog]**: The dialogs of the NPC, in order of id.
+        """
+
+        self.update()
+        return self.__index().dialogs(npc_id)
+
+    def dialog_ids_by_npc(self, npc_id: int) -> set[int]:
+        """
+        Returns the ids of the dialogs an NPC acts in.
+
+        ### Parameters:
+            **npc_id (int)**: The id of the NPC.
+
+        ### Returns:
+            **set[int]**: The ids of the dialogs of the NPC.
+        """
+
+        self.update()
+        return self.__index().dialog_ids(npc_id)
+
+    def frames_by_speaker(self, speaker: str) -> list[tuple[Dialog, DialogFrame]]:
+        """
+        Returns every frame a speaker speaks in, ignoring case.
+
+        ### Parameters:
+            **speaker (str)**: The name of the speaker.
+
+        ### Returns:
+            **list[tuple[Dialog, DialogFrame]]**: The dialog and frame of each line of the speaker.
+
+        ### Raises:
+            **ValueError**: If the speaker is not a string.
+        """
+
+        self.update()
+        return self.__index().frames(speaker)
+
+    def __index(self) -> DialogIndex:
+        # Built on the first lookup, so containers which never look up
+        # dialogs by NPC or speaker don't pay for the reverse indexes.
+        if self.__lookup is None:
+            self.add_index(DialogIndex())
+
+        return self.__lookup
+
     def _fetch(self) -> tuple:
         """
         Fetches and returns a tuple containing the current instance,
@@ -67,7 +145,10 @@ class Dialogs(DataContainer, APIService):
         return tuple([self, Handlers.DIALOGS, Dialog]) # type: ignore
 
     def __getitem__(self, index: int) -> Dialog:
-        return self.dialogs[index]
+        # Indexes the container directly, so lazily loaded
+        # dialogs only create the object which is accessed.
+        self.update()
+        return DataContainer.__getitem__(self, index)
 
     def __iter__(self) -> Generator:
         return (dialog for dialog in self.dialogs)
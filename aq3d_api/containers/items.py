@@ -29,6 +29,8 @@ class Items(DataContainer, APIService):
             **min-index (int)**: Minimum number of items by ID range.
             **max-index (int)**: Maximum number of items by ID range.
             **update-interval (int)**: Interval (in seconds) for automatic updates.
+            **lazy (bool)**: Only creates items from the API data once they are accessed.
+            **storage (SQLiteStorage)**: Stores the items in a database instead of memory.
 
         ### Example
         ```
@@ -75,12 +77,13 @@ class Items(DataContainer, APIService):
             **Generator[Item]**: Items from the container that match the specified filter type
         """
 
+        self.update()
         if isinstance(filter_type, ItemRarity):
-            return (item for item in self.items if item.rarity == filter_type)
+            return self._where_equals("rarity", filter_type)
         if isinstance(filter_type, ItemEquipType):
-            return (item for item in self.items if item.equip_type == filter_type)
+            return self._where_equals("equip_type", filter_type)
 
-        return (item for item in self.items if item.type == filter_type)
+        return self._where_equals("type", filter_type)
 
     def by_keypair(self, key: str, value) -> Generator[Item]:
         """
@@ -105,7 +108,8 @@ class Items(DataContainer, APIService):
         if not value:
             raise ValueError("Expected a non empty value for keys value.")
 
-        return (item for item in self.items if item.__getattribute__(key))
+        self.update()
+        return self._where_equals(key, value)
 
     def _fetch(self) -> tuple:
         """
@@ -116,7 +120,10 @@ class Items(DataContainer, APIService):
         return tuple([self, Handlers.ITEMS, Item]) # type: ignore
 
     def __getitem__(self, index: int) -> Item:
-        return self.items[index]
+        # Indexes the container directly, so lazily loaded
+        # items only create the object which is accessed.
+        self.update()
+        return DataContainer.__getitem__(self, index)
 
     def __iter__(self) -> Generator:
         return (item for item in self.items)
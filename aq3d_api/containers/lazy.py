@@ -0,0 +1,189 @@
+"""
+This module defines the LazyRecords sequence, which keeps the raw records of
+the API and only creates model objects from them once they are accessed,
+along with RecordView, a stand-in for an object which isn't created yet.
+"""
+
+from collections.abc import Callable, Generator, Iterable, Sequence
+
+from aq3d_api.decoder import get_decoder
+
+
+class LazyRecords(Sequence):
+    """
+    A sequence of model objects which are decoded from their raw records
+    on first access and cached afterwards.
+
+    Attributes in the schema of the model can be read straight from the raw
+    records, so filtering doesn't need to create every object.
+    """
+
+    def __init__(self, cls: type, raws: Iterable[dict], record: bool = False):
+        """
+        ### Parameters:
+            **cls (type)**: The model class with a schema to decode the records into.
+            **raws (Iterable[dict])**: The raw records, structured as from the official API.
+            **record (bool, optional)**: The records are exported records (see `utils.to_record`)
+            instead of raw API data.
+        """
+
+        self.__cls = cls
+        self.__decoder = get_decoder(cls, record)
+        self.__raws = list(raws)
+        self.__objs = [None] * len(self.__raws)
+
+    @property
+    def cls(self) -> type:
+        """
+        Returns the model class the records are decoded into.
+
+        ### Returns:
+            **type**: The model class.
+        """
+
+        return self.__cls
+
+    @property
+    def materialized(self) -> int:
+        """
+        Returns how many of the records have been decoded into objects.
+
+        ### Returns:
+            **int**: The amount of decoded objects.
+        """
+
+        return sum(1 for obj in self.__objs if obj is not None)
+
+    def append(self, obj: object):
+        """
+        Appends an already created object to the records.
+
+        ### Parameters:
+            **obj (object)**: The object to append.
+        """
+
+        self.__raws.append(None)
+        self.__objs.append(obj)
+
+    def value(self, index: int, name: str):
+        """
+        Returns an attribute of a record, read from the raw record if
+        its object hasn't been created yet.
+
+        ### Parameters:
+            **index (int)**: The index of the record.
+            **name (str)**: The attribute name of the model.
+
+        ### Returns:
+            **Any**: The value of the attribute.
+        """
+
+        obj = self.__objs[index]
+        if obj is not None:
+            return getattr(obj, name)
+
+        getter = self.__decoder.getter(name)
+        if getter is None:
+            return getattr(self[index], name)
+
+        return getter(self.__raws[index])
+
+    def where(self, name: str, test: Callable) -> Generator:
+        """
+        Yields the objects of the records whose attribute passes a test,
+        only creating the objects which pass.
+
+        ### Parameters:
+            **name (str)**: The attribute name of the model.
+            **test (Callable)**: Returns true for the attribute values to keep.
+
+        ### Yields:
+            **Generator[object]**: Each object whose attribute passes the test.
+        """
+
+        for index in range(len(self.__objs)):
+            if test(self.value(index, name)):
+                yield self[index]
+
+    def views(self) -> list:
+        """
+        Returns a RecordView for each record, which can stand in for
+        the objects without creating them.
+
+        ### Returns:
+            **list[RecordView]**: A view of each record.
+        """
+
+        return [RecordView(self, index) for index in range(len(self.__objs))]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.__objs)))]
+
+        obj = self.__objs[index]
+        if obj is None:
+            obj = self.__decoder.decode(self.__raws[index])
+            self.__objs[index] = obj
+            # The raw record isn't needed once the object exists.
+            self.__raws[index] = None
+
+        return obj
+
+    def __len__(self) -> int:
+        return len(self.__objs)
+
+    def __iter__(self) -> Generator:
+        return (self[index] for index in range(len(self.__objs)))
+
+
+class RecordView:
+    """
+    A stand-in for the object of a LazyRecords record.
+
+    Attributes of the schema are read from the raw record, anything else,
+    such as methods, creates the object and is forwarded to it.
+
+    Any sequence with a `cls` and a `value(index, name)` method can be viewed,
+    such as stored records and catalogs, which read the attribute on its own.
+    Views aren't instances of the model class, which is read from `cls` instead.
+    """
+
+    __slots__ = ("__records", "__index")
+
+    def __init__(self, records: Sequence, index: int):
+        """
+        ### Parameters:
+            **records (Sequence)**: The records the view belongs to, such as LazyRecords.
+            **index (int)**: The index of the record.
+        """
+
+        self.__records = records
+        self.__index = index
+
+    @property
+    def cls(self) -> type:
+        """
+        Returns the model class of the object the view stands in for.
+
+        ### Returns:
+            **type**: The model class.
+        """
+
+        return self.__records.cls
+
+    @property
+    def obj(self) -> object:
+        """
+        Returns the object of the record, creating it if needed.
+
+        ### Returns:
+            **object**: The model object.
+        """
+
+        return self.__records[self.__index]
+
+    def __getattr__(self, name: str):
+        return self.__records.value(self.__index, name)
+
+    def __str__(self) -> str:
+        return str(self.obj)
@@ -19,6 +19,8 @@ class Maps(DataContainer, APIService):
             **min-index (int)**: Minimum number of maps by ID range.
             **max-index (int)**: Maximum number of maps by ID range.
             **update-interval (int)**: Interval (in seconds) for automatic updates.
+            **lazy (bool)**: Only creates maps from the API data once they are accessed.
+            **storage (SQLiteStorage)**: Stores the maps in a database instead of memory.
 
         ### Example
         ```
@@ -47,7 +49,7 @@ class Maps(DataContainer, APIService):
 
     def by_keypair(self, key: str, value) -> Generator[Map]:
         """
-        Yields all Map objects where the specified attribute (key) exists.
+        Yields all Map objects where the specified attribute (key) equals the value.
 
         ### Parameters:
             **key (str)**: The attribute name to look for in each Map object.
@@ -58,7 +60,7 @@ class Maps(DataContainer, APIService):
             **ValueError**: If value is empty or None.
 
         ### Yields:
-            **Generator[Map]**: Yields Map objects that have the specified attribute
+            **Generator[Map]**: Yields Map objects whose attribute equals the value.
         """
 
 
@@ -68,7 +70,8 @@ class Maps(DataContainer, APIService):
         if not value:
             raise ValueError("Expected a non empty value for keys value.")
 
-        return (map for map in self.maps if map.__getattribute__(key))
+        self.update()
+        return self._where_equals(key, value)
 
     def _fetch(self) -> tuple:
         """
@@ -79,7 +82,10 @@ class Maps(DataContainer, APIService):
         return tuple([self, Handlers.MAPS, Map]) # type: ignore
 
     def __getitem__(self, index: int) -> Map:
-        return self.maps[index]
+        # Indexes the container directly, so lazily loaded
+        # maps only create the object which is accessed.
+        self.update()
+        return DataContainer.__getitem__(self, index)
 
     def __iter__(self) -> Generator:
         return (map for map in self.maps)
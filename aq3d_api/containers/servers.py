@@ -4,7 +4,10 @@ It provides methods and properties to access, filter, sort, and snapshot server
 as well as aggregate statistics such as total online players.
 """
 
-from collections.abc import Generator
+from collections.abc import Generator, Mapping
+from heapq import nlargest
+from threading import Lock
+from types import MappingProxyType
 from requests import JSONDecodeError
 
 from aq3d_api.api.handlers.types import Handlers
@@ -21,6 +24,9 @@ class Servers(DataContainer, APIService):
     and snapshot server data, as well as retrieve player statistics across all servers.
     """
 
+    # Every server is fetched at once, rather than by id range.
+    _ranged = False
+
     def __init__(self, options: dict = {}):
         """
         ### Parameters:
@@ -37,6 +43,11 @@ class Servers(DataContainer, APIService):
         """
 
         DataContainer.__init__(self)
+        self.__cache = {}
+        # Bumped on every refresh, so aggregates computed from servers
+        # which were replaced meanwhile aren't cached.
+        self.__generation = 0
+        self.__cache_lock = Lock()
         APIService.__init__(self, options)
 
     @property
@@ -60,7 +71,7 @@ class Servers(DataContainer, APIService):
             **list[Server]**: A list of Server instances that are online.
         """
 
-        return [server for server in self.servers if server.is_online]
+        return list(self.__online())
 
     @property
     def total_players(self) -> int:
@@ -72,15 +83,43 @@ class Servers(DataContainer, APIService):
             **int**: Total number of players online across all servers.
         """
 
-        if not self.servers:
-            return 0
+        return self.__cached(
+            "total",
+            lambda: sum(server.players for server in self._objs)
+        )
+
+    @property
+    def players_by_region(self) -> Mapping[str, int]:
+        """
+        Returns the total number of players online per region areacode.
+
+        ### Returns:
+            **Mapping[str, int]**: A read-only mapping of the total players keyed by region, such as NA or EU.
+        """
+
+        return self.__cached(
+            "region", lambda: MappingProxyType(self.__totals_by("region"))
+        )
 
-        return sum([server.players for server in self.servers])
+    @property
+    def players_by_language(self) -> Mapping[str, int]:
+        """
+        Returns the total number of players online per server language.
+
+        ### Returns:
+            **Mapping[str, int]**: A read-only mapping of the total players keyed by language, such as en.
+        """
+
+        return self.__cached(
+            "language", lambda: MappingProxyType(self.__totals_by("language"))
+        )
 
     def sorted_servers(self, reverse: bool = True, online: bool = False) -> list[Server]:
         """
         Returns a list of Server objects sorted by the number of players.
 
+        The order is only sorted once per refresh of the container.
+
         ### Parameters:
             **reverse (bool, optional)**: Sorts the servers in descending order by player counts.
             **online (bool, optional)**: Only includes servers that are currently online.
@@ -89,13 +128,40 @@ class Servers(DataContainer, APIService):
             **list[Server]**: A list of Server objects sorted by the number of players.
         """
 
-        return [server for server in
-                sorted(
-                    self.servers if not online else self.online_servers,
-                    key=lambda server: server.players,
-                    reverse=reverse
-                )
-        ]
+        return list(self.__cached(
+            ("sorted", reverse, online),
+            lambda: tuple(sorted(
+                self.__online() if online else self._objs,
+                key=lambda server: server.players,
+                reverse=reverse
+            ))
+        ))
+
+    def top_servers(self, count: int, online: bool = True) -> list[Server]:
+        """
+        Returns the servers with the highest number of players.
+
+        Uses an already sorted order when there is one, otherwise only
+        the top servers are selected without sorting every server.
+
+        ### Parameters:
+            **count (int)**: How many servers to return.
+            **online (bool, optional)**: Only includes servers that are currently online.
+
+        ### Returns:
+            **list[Server]**: Up to `count` servers, most players first.
+        """
+
+        self.update()
+        order = self.__cache.get(("sorted", True, online))
+        if order is not None:
+            return list(order[:count])
+
+        return nlargest(
+            count,
+            self.__online() if online else self._objs,
+            key=lambda server: server.players
+        )
 
     @property
     def highest_population(self) -> Server | None:
@@ -107,13 +173,8 @@ class Servers(DataContainer, APIService):
 
         """
 
-        if not self.servers:
-            return None
-
-        try:
-            return list(self.sorted_servers(online=True))[0]
-        except IndexError:
-            return None
+        top = self.top_servers(1)
+        return top[0] if top else None
 
     def create_snapshots(self, online_only: bool = True) -> Generator[ServerSnapshot]:
         """
@@ -135,6 +196,69 @@ class Servers(DataContainer, APIService):
         )
         return snapshots
 
+    def append(self, cls: type, overwrite = False, *objs):
+        """
+        Appends servers to the container and clears the aggregates
+        which were computed from the previous servers.
+        """
+
+        DataContainer.append(self, cls, overwrite, *objs)
+        self.__clear_cache()
+
+    def _replace(self, objs, cls: type, views=None):
+        """
+        Replaces the servers, such as with lazily loaded or stored servers,
+        and clears the aggregates which were computed from the previous servers.
+        """
+
+        DataContainer._replace(self, objs, cls, views)
+        self.__clear_cache()
+
+    def __clear_cache(self):
+        with self.__cache_lock:
+            self.__cache = {}
+            self.__generation += 1
+
+    def __online(self) -> tuple[Server, ...]:
+        return self.__cached(
+            "online",
+            lambda: tuple(server for server in self._objs if server.is_online)
+        )
+
+    def __cached(self, key, compute):
+        """
+        Returns an aggregate of the servers, only computing it once
+        until the container is refreshed.
+
+        The servers can be replaced by a refresh in another thread while
+        the aggregate is computed, it is then returned without being cached.
+
+        ### Parameters:
+            **key (Hashable)**: The key the aggregate is cached under.
+            **compute (Callable)**: Computes the aggregate if it isn't cached.
+        """
+
+        self.update()
+        with self.__cache_lock:
+            generation = self.__generation
+            if key in self.__cache:
+                return self.__cache[key]
+
+        value = compute()
+        with self.__cache_lock:
+            if generation == self.__generation:
+                self.__cache[key] = value
+
+        return value
+
+    def __totals_by(self, attribute: str) -> dict[str, int]:
+        totals = {}
+        for server in self._objs:
+            group = getattr(server, attribute)
+            totals[group] = totals.get(group, 0) + server.players
+
+        return totals
+
     def _fetch(self) -> tuple:
         """
         Returns a tuple containing the current container, the Handlers.SERVERS handler,
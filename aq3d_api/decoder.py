@@ -0,0 +1,341 @@
+"""
+This module turns the declarative field schemas of the models into compiled
+decoders, which build model objects from raw API data without going through
+a chain of `dict.get` calls and Enum scans for every record.
+"""
+
+import sys
+from collections.abc import Callable, Iterable
+from enum import Enum
+from functools import cache
+from weakref import WeakValueDictionary
+
+from aq3d_api import utils
+
+
+class Field:
+    """
+    Describes a single attribute of a model and where its value is read from
+    within the raw data of the official API.
+    """
+
+    def __init__(self,
+                 name: str,
+                 source: str | tuple[str, ...],
+                 default = None,
+                 enum: type[Enum] | None = None,
+                 fallback: Enum | None = None,
+                 convert: Callable | None = None,
+                 model: type | None = None,
+                 where: Callable | None = None,
+                 intern: bool = False,
+                 shared: bool = False,
+                 computed: bool = False,
+                 kind: type | None = None):
+        """
+        ### Parameters:
+            **name (str)**: The attribute name on the model.
+            **source (str | tuple[str, ...])**: The raw key, or path of keys for nested values.
+            **default (Any, optional)**: The value used if the raw key is missing.
+            **enum (type[Enum], optional)**: Converts the raw value into a member of this Enum.
+            **fallback (Enum, optional)**: The Enum member used if the raw value has no match.
+            **convert (Callable, optional)**: Converts the raw value, applied last.
+            **model (type, optional)**: Decodes a list of raw values into a tuple of this model.
+            **where (Callable, optional)**: Only decodes the raw values of `model` this returns true for.
+            **intern (bool, optional)**: Interns string values, so repeated values share one string.
+            Interned strings live as long as the process, so only intern fields with few distinct
+            values, such as names and regions, not prose.
+            **shared (bool, optional)**: Shares one `model` object between identical raw values.
+            **computed (bool, optional)**: The public attribute is computed from the stored value,
+            so it can't be read from the raw data without creating the model.
+            **kind (type, optional)**: The type of the stored value, if it differs from the
+            type of `default`, such as values which are converted.
+        """
+
+        self.name = name
+        self.path = (source,) if isinstance(source, str) else tuple(source)
+        self.default = default
+        self.enum = enum
+        self.fallback = fallback
+        self.convert = convert
+        self.model = model
+        self.where = where
+        self.intern = intern
+        self.shared = shared
+        self.computed = computed
+        self.kind = kind
+
+
+class Decoder:
+    """
+    A decoder compiled from the schema of a model class.
+
+    The schema is compiled once into Python functions with every lookup
+    inlined, Enum conversions become dict lookups and the attributes are
+    written straight into the slots of the model, skipping its setters.
+
+    Decoders can also be compiled for records, the flat format models are
+    exported to (see `utils.to_record`), where each value is stored under its
+    attribute name, Enum members under their names and converted values as is.
+
+    Models without nested model fields can also be decoded as flyweights,
+    where identical raw records share a single object for as long as it is
+    referenced. Shared objects should be treated as read-only.
+    """
+
+    def __init__(self, cls: type, record: bool = False):
+        """
+        ### Parameters:
+            **cls (type)**: A slotted model class with a `schema` of Field objects.
+            **record (bool, optional)**: Decodes exported records instead of raw API data.
+
+        ### Raises:
+            **ValueError**: If the class has no schema.
+        """
+
+        schema = getattr(cls, "schema", None)
+        if not schema:
+            raise ValueError("Expected a model class with a field schema.")
+
+        self.__cls = cls
+        self.__decode, self.__decode_many, self.__key, self.__getters = (
+            _compile(cls, schema, record)
+        )
+        self.__shared = WeakValueDictionary()
+
+    @property
+    def cls(self) -> type:
+        """
+        Returns the model class this decoder creates.
+
+        ### Returns:
+            **type**: The decoded model class.
+        """
+
+        return self.__cls
+
+    def decode(self, raw: dict):
+        """
+        Creates a model object from a single raw record.
+
+        ### Parameters:
+            **raw (dict)**: A record structured as from the official API.
+
+        ### Returns:
+            **object**: The new model object.
+        """
+
+        return self.__decode(raw)
+
+    def decode_many(self, raws: Iterable[dict]) -> list:
+        """
+        Creates model objects from a whole page of raw records at once.
+
+        ### Parameters:
+            **raws (Iterable[dict])**: Records structured as from the official API.
+
+        ### Returns:
+            **list**: The new model objects, in the same order.
+        """
+
+        return self.__decode_many(raws)
+
+    def getter(self, name: str) -> Callable | None:
+        """
+        Returns a function decoding a single attribute from a raw record,
+        without creating the model object.
+
+        ### Parameters:
+            **name (str)**: The attribute name on the model.
+
+        ### Returns:
+            **Callable | None**: The function, or None if the attribute isn't
+            in the schema or is computed by the model.
+        """
+
+        return self.__getters.get(name)
+
+    def decode_shared(self, raw: dict):
+        """
+        Returns the shared object of a raw record, only creating a new
+        object if no identical record is currently decoded.
+
+        ### Parameters:
+            **raw (dict)**: A record structured as from the official API.
+
+        ### Returns:
+            **object**: The shared model object.
+
+        ### Raises:
+            **ValueError**: If the model has nested model fields.
+        """
+
+        if self.__key is None:
+            raise ValueError("Models with nested model fields can't be shared.")
+
+        key = self.__key(raw)
+        obj = self.__shared.get(key)
+        if obj is None:
+            obj = self.__decode(raw)
+            self.__shared[key] = obj
+
+        return obj
+
+
+@cache
+def get_decoder(cls: type, record: bool = False) -> Decoder:
+    """
+    Returns the decoder of a model class, compiling it on first use.
+
+    ### Parameters:
+        **cls (type)**: A slotted model class with a `schema` of Field objects.
+        **record (bool, optional)**: Decodes exported records instead of raw API data.
+
+    ### Returns:
+        **Decoder**: The compiled decoder of the class.
+    """
+
+    return Decoder(cls, record)
+
+
+def _compile(cls: type, schema: tuple[Field, ...], record: bool) -> tuple:
+    """
+    Generates the source of the decoding functions of a schema and
+    compiles them.
+
+    ### Parameters:
+        **cls (type)**: The model class to decode into.
+        **schema (tuple[Field, ...])**: The fields of the model.
+        **record (bool)**: Compiles for exported records instead of raw API data.
+
+    ### Returns:
+        **tuple**: The single and batch decoding functions, the function
+        returning the flyweight key of a record (None if the model has nested
+        model fields) and a dict of single attribute getters by name.
+    """
+
+    slots = utils.slot_names(cls)
+    namespace = {
+        "new": cls.__new__, "cls": cls, "EMPTY": {}, "intern_str": _intern_str
+    }
+    parents = {}
+    lines = []
+    keys = []
+    getters = []
+
+    for index, field in enumerate(schema):
+        path = (field.name,) if record else field.path
+        enum = field.enum
+        if record and enum is None and isinstance(field.default, Enum):
+            # Converted Enum values are exported by name as well.
+            enum = type(field.default)
+
+        # Nested values share the lookup of their parent dicts.
+        container = "raw"
+        parent_lines = []
+        for depth, key in enumerate(path[:-1], 1):
+            prefix = path[:depth]
+            if prefix not in parents:
+                parents[prefix] = f"parent{len(parents)}"
+                lines.append(f"{parents[prefix]} = {container}.get({key!r})")
+                lines.append(f"if {parents[prefix]} is None: {parents[prefix]} = EMPTY")
+
+            parent_lines.append(f"{parents[prefix]} = {container}.get({key!r})")
+            parent_lines.append(f"if {parents[prefix]} is None: {parents[prefix]} = EMPTY")
+            container = parents[prefix]
+
+        namespace[f"default{index}"] = field.default
+        value = f"{container}.get({path[-1]!r}, default{index})"
+        if keys is not None:
+            keys.append(value)
+
+        if field.model:
+            keys = None
+            decoder = get_decoder(field.model, record)
+            namespace[f"model{index}"] = (
+                decoder.decode_shared if field.shared else decoder.decode
+            )
+            # Exported records were already filtered when first decoded.
+            if field.where and not record:
+                namespace[f"where{index}"] = field.where
+                value = (f"tuple([model{index}(item) for item in {value} "
+                         f"if where{index}(item)])")
+            else:
+                value = f"tuple([model{index}(item) for item in {value}])"
+
+        if enum:
+            namespace[f"enum{index}"] = {
+                member.name if record else member.value: member for member in enum
+            }
+            namespace[f"fallback{index}"] = (
+                field.default if field.fallback is None and isinstance(field.default, Enum)
+                else field.fallback
+            )
+            value = f"enum{index}.get({value}, fallback{index})"
+
+        if field.convert and not record:
+            namespace[f"convert{index}"] = field.convert
+            value = f"convert{index}({value})"
+
+        if field.intern:
+            value = f"intern_str({value})"
+
+        lines.append(f"obj.{slots[field.name]} = {value}")
+        if not field.computed:
+            getters.append(
+                f"def get_{field.name}(raw):\n"
+                + "".join(f"    {line}\n" for line in parent_lines) +
+                f"    return {value}\n"
+            )
+
+    source = (
+        "def decode(raw):\n"
+        "    obj = new(cls)\n"
+        + "".join(f"    {line}\n" for line in lines) +
+        "    return obj\n"
+        "\n"
+        "def decode_many(raws):\n"
+        "    objs = []\n"
+        "    append = objs.append\n"
+        "    for raw in raws:\n"
+        "        obj = new(cls)\n"
+        + "".join(f"        {line}\n" for line in lines) +
+        "        append(obj)\n"
+        "    return objs\n"
+    )
+
+    if keys is not None:
+        source += (
+            "\n"
+            "def key(raw):\n"
+            + "".join(f"    {line}\n" for line in lines if not line.startswith("obj.")) +
+            f"    return ({', '.join(keys)},)\n"
+        )
+
+    source += "".join(f"\n{getter}" for getter in getters)
+
+    exec(compile(source, f"<decoder {cls.__qualname__}>", "exec"), namespace)
+    return (
+        namespace["decode"],
+        namespace["decode_many"],
+        namespace.get("key"),
+        {
+            field.name: namespace[f"get_{field.name}"]
+            for field in schema if not field.computed
+        }
+    )
+
+
+def _intern_str(value):
+    """
+    Interns a string so every equal string decoded shares one object,
+    any other value is returned as is.
+
+    ### Parameters:
+        **value (Any)**: The decoded value.
+
+    ### Returns:
+        **Any**: The interned string or the unchanged value.
+    """
+
+    return sys.intern(value) if type(value) is str else value
@@ -4,6 +4,7 @@ within a dialog in the AQ3D API.
 """
 
 from aq3d_api import utils
+from aq3d_api.decoder import Field, get_decoder
 
 
 class DialogActor:
@@ -11,6 +12,13 @@ class DialogActor:
     Represents a dialog actor (NPC) in the AQ3D API.
     """
 
+    __slots__ = ("__npc_id", "__weakref__")
+
+    # Where each attribute is read from in the raw API data.
+    schema = (
+        Field("npc_id", "NPCID", -1),
+    )
+
     def __init__(self, npc_id: int):
         """
         ### Parameters:
@@ -61,6 +69,7 @@ class DialogActor:
     def create_raw(cls, raw: dict):
         """
         Factory method to create an instance of the class from a raw dictionary.
+        The raw data is trusted, so the property setters are skipped.
 
         ### Parameters:
             **raw (dict)**: A dictionary containing the data to initialize the instance.
@@ -77,4 +86,4 @@ class DialogActor:
                 "Expected a dict object for using the factory method."
             )
 
-        return cls(raw.get("NPCID", -1))
+        return get_decoder(cls).decode(raw)
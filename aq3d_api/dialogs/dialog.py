@@ -6,6 +6,7 @@ as dialog frames and actors (NPCs) for AQ3D dialogs.
 from collections.abc import Sequence
 
 from aq3d_api import utils
+from aq3d_api.decoder import Field, get_decoder
 from aq3d_api.dialogs.actor import DialogActor
 from aq3d_api.dialogs.frame import DialogFrame
 
@@ -16,6 +17,16 @@ class Dialog:
     and actors (NPCs).
     """
 
+    __slots__ = ("__id", "__frames", "__actors")
+
+    # Where each attribute is read from in the raw API data.
+    schema = (
+        Field("id", "ID", -1),
+        Field("frames", "FrameCollection", (), model=DialogFrame),
+        Field("actors", "Characters", (), model=DialogActor, shared=True,
+              where=lambda raw_actor: raw_actor.get("NPCID"))
+    )
+
     def __init__(self, **data):
         """
         ### Parameters:
@@ -132,6 +143,10 @@ class Dialog:
     def create_raw(cls, raw: dict):
         """
         Factory method to create an instance of the class from a raw dictionary.
+        The raw data is trusted, so the property setters are skipped.
+
+        Identical actors are shared between dialogs as flyweights,
+        so they should be treated as read-only.
 
         ### Parameters:
             **raw (dict)**: A dictionary containing dialog data. Expected keys include
@@ -151,17 +166,22 @@ class Dialog:
                 "Expected a dict object for using the factory method."
             )
 
-        frames = [DialogFrame.create_raw(raw_frame)
-                  for raw_frame in raw.get("FrameCollection", [])]
-        actors = [DialogActor.create_raw(raw_actor)
-                  for raw_actor in raw.get("Characters", [])
-                  if raw_actor.get("NPCID")]
+        return get_decoder(cls).decode(raw)
 
-        return cls(
-            id = raw.get("ID", -1),
-            frames = frames,
-            actors = actors
-        )
+    @classmethod
+    def create_many(cls, raws: list) -> list:
+        """
+        Factory method to create an instance of the class for each raw dictionary
+        of a page, decoded in one batch.
+
+        ### Parameters:
+            **raws (list)**: A list of dictionaries structured as for `create_raw`.
+
+        ### Returns:
+            **list[Dialog]**: New instances of the Dialog, in the same order.
+        """
+
+        return get_decoder(cls).decode_many(raws)
 
     def to_dict(self) -> dict:
         """
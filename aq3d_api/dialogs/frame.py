@@ -4,6 +4,7 @@ within a dialog in the AQ3D API context.
 """
 
 from aq3d_api import utils
+from aq3d_api.decoder import Field, get_decoder
 
 
 class DialogFrame:
@@ -12,6 +13,15 @@ class DialogFrame:
     their title, and the dialog text.
     """
 
+    __slots__ = ("__speaker", "__title", "__text")
+
+    # Where each attribute is read from in the raw API data.
+    schema = (
+        Field("speaker", "DialogueName", "", intern=True),
+        Field("title", "DialogueTitle", "", intern=True),
+        Field("text", "DialogueText", "")
+    )
+
     def __init__(self, **data):
         """
         ### Parameters:
@@ -137,6 +147,7 @@ class DialogFrame:
     def create_raw(cls, raw: dict):
         """
         Factory method to create an instance of the class from a raw dictionary.
+        The raw data is trusted, so the property setters are skipped.
 
         ### Parameters:
             **raw (dict)**: A dictionary containing dialogue data with possible keys:
@@ -157,8 +168,4 @@ class DialogFrame:
                 "Expected a dict object for using the factory method."
             )
 
-        return cls(
-            speaker = raw.get("DialogueName", ""),
-            title = raw.get("DialogueTitle", ""),
-            text = raw.get("DialogueText", "")
-        )
+        return get_decoder(cls).decode(raw)
@@ -0,0 +1,411 @@
+"""
+This module exports models and server snapshots into Apache Arrow tables and
+Parquet files, with typed columns built from the model schemas.
+
+pyarrow is an optional dependency, it's only imported once an export is made.
+"""
+
+from collections.abc import Callable, Iterable
+from enum import Enum
+from functools import cache
+from itertools import chain, islice
+from operator import attrgetter
+from pathlib import Path
+
+from aq3d_api import utils
+from aq3d_api.servers.server import Server
+
+# The Arrow type names of the Python types stored by the models.
+_TYPES = {bool: "bool_", int: "int64", float: "float64", str: "string"}
+
+
+def _pyarrow():
+    """
+    Imports pyarrow along with its Parquet module.
+
+    ### Returns:
+        **module**: The pyarrow module.
+
+    ### Raises:
+        **ImportError**: If pyarrow isn't installed.
+    """
+
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as ex:
+        raise ImportError(
+            "Arrow and Parquet exports require pyarrow, install it with `pip install pyarrow`."
+        ) from ex
+
+    return pyarrow
+
+
+def arrow_schema(cls: type):
+    """
+    Returns the Arrow schema of a model class.
+
+    Enum attributes are dictionary encoded with every member name of the Enum
+    as the dictionary, so batches and files share the same codes. Nested
+    models, such as dialog frames, become lists of structs.
+
+    ### Parameters:
+        **cls (type)**: A model class with a `schema` of Field objects.
+
+    ### Returns:
+        **pyarrow.Schema**: The schema of the exported columns.
+
+    ### Raises:
+        **ValueError**: If the class has no schema.
+    """
+
+    pa = _pyarrow()
+    return pa.schema([field for field, _ in _columns(pa, _schema_of(cls))])
+
+
+def to_arrow(objs: Iterable, batch_size: int = 10000):
+    """
+    Converts model objects into an Arrow table.
+
+    ### Parameters:
+        **objs (Iterable)**: The objects to convert, all of the same model class.
+        **batch_size (int, optional)**: How many objects are converted at once.
+
+    ### Returns:
+        **pyarrow.Table**: A table with a column per schema attribute.
+
+    ### Raises:
+        **ValueError**: If there are no objects or their class has no schema.
+    """
+
+    return record_batches(objs, batch_size).read_all()
+
+
+def to_parquet(objs: Iterable,
+               path: Path,
+               compression: str = "zstd",
+               batch_size: int = 10000):
+    """
+    Streams model objects into a Parquet file, converting and writing a batch
+    of objects at a time so any iterable is written in bounded memory.
+
+    ### Parameters:
+        **objs (Iterable)**: The objects to write, all of the same model class.
+        **path (Path)**: The path to write the Parquet file to.
+        **compression (str, optional)**: The Parquet compression codec, such as
+        `zstd`, `snappy`, `gzip` or `none`.
+        **batch_size (int, optional)**: How many objects are written at once.
+
+    ### Raises:
+        **ValueError**: If the path isn't a Path, there are no objects or their
+        class has no schema.
+    """
+
+    if not isinstance(path, Path):
+        raise ValueError("Expected a path to save to a parquet file.")
+
+    _write_parquet(record_batches(objs, batch_size), path, compression)
+
+
+def record_batches(objs: Iterable, batch_size: int = 10000):
+    """
+    Returns a reader which lazily converts model objects into Arrow
+    record batches.
+
+    ### Parameters:
+        **objs (Iterable)**: The objects to convert, all of the same model class.
+        **batch_size (int, optional)**: How many objects each batch holds.
+
+    ### Returns:
+        **pyarrow.RecordBatchReader**: The reader of the batches.
+
+    ### Raises:
+        **ValueError**: If there are no objects or their class has no schema.
+    """
+
+    pa = _pyarrow()
+    objs = iter(objs)
+    first = next(objs, None)
+    if first is None:
+        raise ValueError("There were no objects to export.")
+
+    cls = first.__class__
+    columns = _columns(pa, _schema_of(cls))
+    rows = map(_row_function(cls), chain((first,), objs))
+    return _reader(pa, columns, rows, batch_size)
+
+
+def snapshots_to_arrow(snapshots: Iterable, batch_size: int = 10000):
+    """
+    Converts server snapshots into an Arrow table, with a `timestamp` column
+    of when each snapshot was taken followed by the Server columns.
+
+    ### Parameters:
+        **snapshots (Iterable[ServerSnapshot])**: The snapshots to convert.
+        **batch_size (int, optional)**: How many snapshots are converted at once.
+
+    ### Returns:
+        **pyarrow.Table**: A table with a row per snapshot.
+    """
+
+    return snapshot_batches(snapshots, batch_size).read_all()
+
+
+def snapshots_to_parquet(snapshots: Iterable,
+                         path: Path,
+                         compression: str = "zstd",
+                         batch_size: int = 10000):
+    """
+    Streams server snapshots into a Parquet file in bounded memory,
+    see `snapshots_to_arrow` for the columns.
+
+    ### Parameters:
+        **snapshots (Iterable[ServerSnapshot])**: The snapshots to write.
+        **path (Path)**: The path to write the Parquet file to.
+        **compression (str, optional)**: The Parquet compression codec.
+        **batch_size (int, optional)**: How many snapshots are written at once.
+
+    ### Raises:
+        **ValueError**: If the path isn't a Path.
+    """
+
+    if not isinstance(path, Path):
+        raise ValueError("Expected a path to save to a parquet file.")
+
+    _write_parquet(snapshot_batches(snapshots, batch_size), path, compression)
+
+
+def snapshot_batches(snapshots: Iterable, batch_size: int = 10000):
+    """
+    Returns a reader which lazily converts server snapshots into
+    Arrow record batches.
+
+    ### Parameters:
+        **snapshots (Iterable[ServerSnapshot])**: The snapshots to convert.
+        **batch_size (int, optional)**: How many snapshots each batch holds.
+
+    ### Returns:
+        **pyarrow.RecordBatchReader**: The reader of the batches.
+    """
+
+    pa = _pyarrow()
+    fields = Server.schema
+    columns = [
+        (pa.field("timestamp", pa.float64()), lambda values: pa.array(values, pa.float64())),
+        *_columns(pa, fields)
+    ]
+
+    def to_row(snapshot) -> tuple:
+        data = snapshot.server_data
+        return (snapshot.timestamp, *(data.get(field.name) for field in fields))
+
+    return _reader(pa, columns, map(to_row, snapshots), batch_size)
+
+
+def _write_parquet(reader, path: Path, compression: str):
+    """
+    Writes every batch of a reader into a Parquet file.
+
+    ### Parameters:
+        **reader (pyarrow.RecordBatchReader)**: The batches to write.
+        **path (Path)**: The path to write the Parquet file to.
+        **compression (str)**: The Parquet compression codec.
+    """
+
+    pa = _pyarrow()
+    with pa.parquet.ParquetWriter(path, reader.schema, compression=compression) as writer:
+        for batch in reader:
+            writer.write_batch(batch)
+
+
+def _reader(pa, columns: list, rows: Iterable[tuple], batch_size: int):
+    """
+    Wraps rows of values into a reader of record batches.
+
+    ### Parameters:
+        **pa (module)**: The pyarrow module.
+        **columns (list)**: The Arrow field and array function of each column.
+        **rows (Iterable[tuple])**: The rows, with a value per column.
+        **batch_size (int)**: How many rows each batch holds.
+
+    ### Returns:
+        **pyarrow.RecordBatchReader**: The reader of the batches.
+    """
+
+    if batch_size < 1:
+        raise ValueError("Expected a batch size of at least 1.")
+
+    schema = pa.schema([field for field, _ in columns])
+    rows = iter(rows)
+
+    def batches():
+        while chunk := list(islice(rows, batch_size)):
+            yield pa.RecordBatch.from_arrays(
+                [
+                    to_array(list(values))
+                    for (_, to_array), values in zip(columns, zip(*chunk))
+                ],
+                schema=schema
+            )
+
+    return pa.RecordBatchReader.from_batches(schema, batches())
+
+
+def _schema_of(cls: type) -> tuple:
+    """
+    Returns the field schema of a model class.
+
+    ### Raises:
+        **ValueError**: If the class has no schema.
+    """
+
+    schema = getattr(cls, "schema", None)
+    if not schema:
+        raise ValueError(f"Can't export {cls.__name__} objects without a field schema.")
+
+    return schema
+
+
+@cache
+def _row_function(cls: type) -> Callable:
+    """
+    Returns a function reading the stored values of a model object,
+    in the order of its schema.
+
+    ### Parameters:
+        **cls (type)**: The model class.
+
+    ### Returns:
+        **Callable**: The function returning a tuple of values.
+    """
+
+    names = [field.name for field in cls.schema]
+    slots = utils.slot_names(cls)
+    getter = attrgetter(*(slots[name] for name in names))
+
+    def to_row(obj) -> tuple:
+        try:
+            values = getter(obj)
+        except AttributeError:
+            # Objects with unset attributes or of another class.
+            attributes = utils.attributes(obj)
+            return tuple(attributes.get(name) for name in names)
+
+        return values if len(names) > 1 else (values,)
+
+    return to_row
+
+
+def _columns(pa, schema: tuple) -> list:
+    """
+    Returns the Arrow field of each Field in a schema, and a function
+    converting a list of its values into an Arrow array.
+
+    ### Parameters:
+        **pa (module)**: The pyarrow module.
+        **schema (tuple[Field, ...])**: The fields of a model.
+
+    ### Returns:
+        **list[tuple]**: The Arrow field and array function of each column.
+    """
+
+    columns = []
+    for field in schema:
+        arrow_type = _arrow_type(pa, field)
+        enum = _enum_of(field)
+        if field.model:
+            to_array = _nested_array(pa, arrow_type)
+        elif enum:
+            to_array = _enum_array(pa, enum, arrow_type)
+        else:
+            to_array = _plain_array(pa, arrow_type)
+
+        columns.append((pa.field(field.name, arrow_type), to_array))
+
+    return columns
+
+
+def _arrow_type(pa, field, nested: bool = False):
+    """
+    Returns the Arrow type of the values of a Field.
+
+    ### Parameters:
+        **pa (module)**: The pyarrow module.
+        **field (Field)**: The field of a model.
+        **nested (bool, optional)**: The field belongs to a nested model, where
+        Enum members are stored as plain strings.
+
+    ### Returns:
+        **pyarrow.DataType**: The type of the column.
+    """
+
+    if field.model:
+        return pa.list_(pa.struct([
+            pa.field(child.name, _arrow_type(pa, child, True))
+            for child in field.model.schema
+        ]))
+
+    enum = _enum_of(field)
+    if enum:
+        if nested:
+            return pa.string()
+
+        index_type = pa.int8() if len(enum) < 128 else pa.int16()
+        return pa.dictionary(index_type, pa.string())
+
+    kind = field.kind or type(field.default)
+    return getattr(pa, _TYPES.get(kind, "string"))()
+
+
+def _enum_of(field) -> type[Enum] | None:
+    """
+    Returns the Enum class of a Field's values, if any.
+    """
+
+    if field.enum:
+        return field.enum
+
+    if isinstance(field.default, Enum):
+        # Converted values such as the status of servers.
+        return type(field.default)
+
+    return None
+
+
+def _plain_array(pa, arrow_type) -> Callable:
+    return lambda values: pa.array(values, type=arrow_type)
+
+
+def _enum_array(pa, enum: type[Enum], arrow_type) -> Callable:
+    # Every member is always in the dictionary, in definition order.
+    dictionary = pa.array([member.name for member in enum], type=pa.string())
+    codes = {member: code for code, member in enumerate(enum)}
+
+    def to_array(values: list):
+        indices = pa.array(
+            [codes.get(value) for value in values], type=arrow_type.index_type
+        )
+        return pa.DictionaryArray.from_arrays(indices, dictionary)
+
+    return to_array
+
+
+def _nested_array(pa, arrow_type) -> Callable:
+    def to_array(values: list):
+        return pa.array(
+            [[_nested_record(obj) for obj in value or ()] for value in values],
+            type=arrow_type
+        )
+
+    return to_array
+
+
+def _nested_record(obj) -> dict:
+    """
+    Converts a nested model object into the values of its struct.
+    """
+
+    return {
+        name: value.name if isinstance(value, Enum) else value
+        for name, value in utils.to_record(obj).items()
+    }
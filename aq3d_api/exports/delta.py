@@ -0,0 +1,277 @@
+"""
+This module defines the DeltaExporter class, which exports only the records
+that were added, changed or removed since the previous export, and compacts
+the written deltas back into a single base export.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+from collections.abc import Generator, Iterable
+from pathlib import Path
+
+from aq3d_api import utils
+
+STATE_VERSION = 1
+
+
+class DeltaExporter:
+    """
+    Exports a collection of objects incrementally into a directory.
+
+    The first export writes every record into a base file, each later export
+    only writes the changes as a numbered delta file of operations:
+
+        - `{"op": "upsert", "record": {...}}` for added and changed records.
+        - `{"op": "remove", "id": ...}` for records which no longer exist.
+
+    Changes are found by comparing a fingerprint of each record's content
+    against the fingerprints of the previous export, which are kept in a
+    state file next to the exports. All files are gzip compressed JSON Lines.
+
+    Reading and compacting the deltas replays them through a temporary
+    database on disk, so the records never have to fit in memory at once.
+    """
+
+    def __init__(self, directory: Path, prefix: str = "export"):
+        """
+        ### Parameters:
+            **directory (Path)**: The directory of the exports, created if needed.
+            **prefix (str, optional)**: The file name prefix of the exports.
+
+        ### Raises:
+            **ValueError**: If the directory isn't a Path.
+        """
+
+        if not isinstance(directory, Path):
+            raise ValueError("Expected a Path instance of the directory to export to.")
+
+        directory.mkdir(parents=True, exist_ok=True)
+        self.__directory = directory
+        self.__prefix = prefix
+        self.__state_path = directory / f"{prefix}-state.json"
+        self.__sequence = 0
+        self.__deltas = []
+        self.__fingerprints = {}
+
+        if self.__state_path.exists():
+            state = json.loads(self.__state_path.read_text())
+            if state.get("version") != STATE_VERSION:
+                raise ValueError(f"Unsupported delta export state in {self.__state_path}.")
+
+            self.__sequence = state["sequence"]
+            self.__deltas = state["deltas"]
+            self.__fingerprints = state["fingerprints"]
+
+    @property
+    def base_path(self) -> Path:
+        """
+        Returns the path of the base export.
+
+        ### Returns:
+            **Path**: The path of the base file.
+        """
+
+        return self.__directory / f"{self.__prefix}-base.jsonl.gz"
+
+    @property
+    def delta_paths(self) -> list[Path]:
+        """
+        Returns the paths of the deltas written since the base, oldest first.
+
+        ### Returns:
+            **list[Path]**: The paths of the delta files.
+        """
+
+        return [self.__directory / name for name in self.__deltas]
+
+    @staticmethod
+    def fingerprint(record: dict) -> str:
+        """
+        Returns a digest of the content of a record.
+
+        ### Parameters:
+            **record (dict)**: A record, see `utils.to_record`.
+
+        ### Returns:
+            **str**: The hex digest of the record.
+        """
+
+        encoded = json.dumps(
+            record, cls=utils.EnumEncoder, sort_keys=True, separators=(",", ":")
+        )
+        return hashlib.blake2b(encoded.encode(), digest_size=8).hexdigest()
+
+    def export(self, objs: Iterable) -> Path | None:
+        """
+        Exports the objects, writing the base on the first export and a delta
+        of the changes since the previous export afterwards.
+
+        ### Parameters:
+            **objs (Iterable)**: The full, current collection of objects.
+
+        ### Returns:
+            **Path | None**: The path of the written file, or None if nothing changed.
+        """
+
+        if not self.base_path.exists():
+            return self.__write_base(objs)
+
+        fingerprints = {}
+        encoder = utils.EnumEncoder(separators=(",", ":"))
+        path = self.__directory / f"{self.__prefix}-delta-{self.__sequence + 1:06d}.jsonl.gz"
+        temporary = path.with_stem(f"{path.stem}.tmp")
+        changes = 0
+        with gzip.open(temporary, "wt") as file:
+            for obj in objs:
+                record = utils.to_record(obj)
+                key = json.dumps(record["id"])
+                fingerprints[key] = self.fingerprint(record)
+                if self.__fingerprints.get(key) == fingerprints[key]:
+                    continue
+
+                file.write(encoder.encode({"op": "upsert", "record": record}))
+                file.write("\n")
+                changes += 1
+
+            # Fingerprints are keyed by the json of the id, as state keys are strings.
+            for key in self.__fingerprints.keys() - fingerprints.keys():
+                file.write(encoder.encode({"op": "remove", "id": json.loads(key)}))
+                file.write("\n")
+                changes += 1
+
+        if not changes:
+            temporary.unlink()
+            return None
+
+        os.replace(temporary, path)
+        self.__sequence += 1
+        self.__deltas.append(path.name)
+        self.__fingerprints = fingerprints
+        self.__save_state()
+        return path
+
+    def records(self) -> Generator[dict]:
+        """
+        Yields the current records, the base with every delta applied.
+        The records can be loaded into a container with `load_raw(cls, records, record=True)`.
+
+        ### Yields:
+            **Generator[dict]**: Each current record, in order of id.
+        """
+
+        return (json.loads(record) for record in self.__replay())
+
+    def compact(self) -> Path:
+        """
+        Applies every delta to the base and writes the result as the new
+        base, removing the deltas.
+
+        ### Returns:
+            **Path**: The path of the new base.
+
+        ### Raises:
+            **ValueError**: If nothing has been exported yet.
+        """
+
+        if not self.base_path.exists():
+            raise ValueError("There is no base export to compact.")
+
+        temporary = self.base_path.with_stem(f"{self.base_path.stem}.tmp")
+        with gzip.open(temporary, "wt") as file:
+            for record in self.__replay():
+                file.write(record)
+                file.write("\n")
+
+        os.replace(temporary, self.base_path)
+        deltas = self.delta_paths
+        self.__deltas = []
+        self.__save_state()
+
+        for path in deltas:
+            path.unlink(missing_ok=True)
+
+        return self.base_path
+
+    def __write_base(self, objs: Iterable) -> Path:
+        fingerprints = {}
+        encoder = utils.EnumEncoder(separators=(",", ":"))
+        temporary = self.base_path.with_stem(f"{self.base_path.stem}.tmp")
+        with gzip.open(temporary, "wt") as file:
+            for obj in objs:
+                record = utils.to_record(obj)
+                fingerprints[json.dumps(record["id"])] = self.fingerprint(record)
+                file.write(encoder.encode(record))
+                file.write("\n")
+
+        os.replace(temporary, self.base_path)
+        self.__deltas = []
+        self.__fingerprints = fingerprints
+        self.__save_state()
+        return self.base_path
+
+    def __replay(self) -> Generator[str]:
+        """
+        Yields the json of every current record in order of id. The base and
+        deltas are applied in a temporary database, which SQLite keeps on disk
+        once it outgrows its page cache.
+        """
+
+        # An empty name opens a private database which is deleted when closed.
+        connection = sqlite3.connect("")
+        try:
+            connection.execute(
+                "CREATE TABLE records (rank INTEGER, number INTEGER, key TEXT, record TEXT, "
+                "PRIMARY KEY (rank, number, key)) WITHOUT ROWID"
+            )
+            upsert = "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?)"
+            with connection:
+                connection.executemany(upsert, map(_row, utils.read_jsonl(self.base_path)))
+
+                for path in self.delta_paths:
+                    for operation in utils.read_jsonl(path):
+                        if operation["op"] == "upsert":
+                            connection.execute(upsert, _row(operation["record"]))
+                        else:
+                            connection.execute(
+                                "DELETE FROM records WHERE rank = ? AND number = ? AND key = ?",
+                                _id_order(operation["id"])
+                            )
+
+            for (record,) in connection.execute(
+                    "SELECT record FROM records ORDER BY rank, number, key"):
+                yield record
+        finally:
+            connection.close()
+
+    def __save_state(self):
+        temporary = self.__state_path.with_stem(f"{self.__state_path.stem}.tmp")
+        temporary.write_text(json.dumps({
+            "version": STATE_VERSION,
+            "sequence": self.__sequence,
+            "deltas": self.__deltas,
+            "fingerprints": self.__fingerprints
+        }, separators=(",", ":")))
+        os.replace(temporary, self.__state_path)
+
+
+def _row(record: dict) -> tuple:
+    """
+    Returns the row of a record in the replay database, its sort key and json.
+    """
+
+    return *_id_order(record["id"]), json.dumps(record, separators=(",", ":"))
+
+
+def _id_order(oid) -> tuple:
+    """
+    Returns the sort key of a record id, integer ids first in numeric order
+    and any other ids after them by their json.
+    """
+
+    if isinstance(oid, int):
+        return 0, oid, json.dumps(oid)
+
+    return 1, 0, json.dumps(oid)
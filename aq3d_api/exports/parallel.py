@@ -0,0 +1,211 @@
+"""
+This module exports large collections of models into sharded files of several
+formats at once, serializing the shards in a pool of worker processes, and
+describes the written files in a manifest.
+"""
+
+import hashlib
+import json
+import os
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+from operator import attrgetter
+from pathlib import Path
+
+from aq3d_api import utils
+from aq3d_api.exports import arrow
+from aq3d_api.storage.catalog import write_catalog
+
+MANIFEST_VERSION = 1
+
+# The file extension of each export format.
+FORMATS = {
+    "csv": ".csv",
+    "json": ".json",
+    "jsonl": ".jsonl",
+    "parquet": ".parquet",
+    "catalog": ".cat"
+}
+
+# Formats which can be gzip compressed.
+_COMPRESSIBLE = ("csv", "jsonl")
+
+
+def export_shards(objs: Iterable,
+                  directory: Path,
+                  formats: Iterable[str] = ("csv", "json"),
+                  shard_size: int = 10000,
+                  workers: int | None = None,
+                  prefix: str | None = None,
+                  compress: bool = False) -> dict:
+    """
+    Splits objects into shards and writes every shard in each format,
+    serializing the shards in parallel worker processes.
+
+    Shards are named `<prefix>-<index>.<extension>`, with a zero padded index,
+    so the same objects always produce the same files. Once every shard has
+    been written a `<prefix>-manifest.json` listing the files, their record
+    counts, sizes and SHA-256 digests is written.
+
+    ### Parameters:
+        **objs (Iterable)**: The objects to export, all of the same model class.
+        **directory (Path)**: The directory to write the files to, created if needed.
+        **formats (Iterable[str], optional)**: The formats to write, any of `FORMATS`.
+        **shard_size (int, optional)**: How many objects each shard holds.
+        **workers (int, optional)**: The amount of worker processes, by default the amount of CPUs.
+        **prefix (str, optional)**: The file name prefix, by default the lowercase class name.
+        **compress (bool, optional)**: Gzip compresses the csv and jsonl files.
+
+    ### Returns:
+        **dict**: The manifest of the export.
+
+    ### Raises:
+        **ValueError**: If the directory isn't a Path, a format is unknown,
+        the shard size is below 1 or there are no objects.
+    """
+
+    if not isinstance(directory, Path):
+        raise ValueError("Expected a Path instance of the directory to export to.")
+
+    formats = tuple(dict.fromkeys(formats))
+    unknown = [name for name in formats if name not in FORMATS]
+    if unknown or not formats:
+        raise ValueError(f"Unknown export formats {unknown}, expected any of {list(FORMATS)}.")
+
+    if shard_size < 1:
+        raise ValueError("Expected a shard size of at least 1.")
+
+    objs = iter(objs)
+    first = next(objs, None)
+    if first is None:
+        raise ValueError("There were no objects to export.")
+
+    cls = first.__class__
+    schema = getattr(cls, "schema", None)
+    if not schema:
+        raise ValueError(f"Can't export {cls.__name__} objects without a field schema.")
+
+    names = tuple(field.name for field in schema)
+    to_row = _row_function(cls, names)
+    prefix = prefix or cls.__name__.lower()
+    directory.mkdir(parents=True, exist_ok=True)
+
+    rows = map(to_row, chain((first,), objs))
+    workers = workers or os.cpu_count() or 1
+    shards = []
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        index = 0
+        while chunk := list(islice(rows, shard_size)):
+            pending.append(executor.submit(
+                _write_shard, cls, names, chunk, index, directory, prefix, formats, compress
+            ))
+            index += 1
+
+            # Only a few shards are held in memory while waiting on the workers.
+            while len(pending) >= workers * 2:
+                shards.append(pending.popleft().result())
+
+        shards.extend(future.result() for future in pending)
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "class": cls.__name__,
+        "records": sum(shard["records"] for shard in shards),
+        "shard_size": shard_size,
+        "formats": list(formats),
+        "shards": shards
+    }
+
+    path = directory / f"{prefix}-manifest.json"
+    temporary = path.with_stem(f"{path.stem}.tmp")
+    temporary.write_text(json.dumps(manifest, indent=4))
+    os.replace(temporary, path)
+    return manifest
+
+
+def shard_name(prefix: str, index: int, name: str, compress: bool = False) -> str:
+    """
+    Returns the file name of a shard in an export format.
+
+    ### Parameters:
+        **prefix (str)**: The file name prefix of the export.
+        **index (int)**: The index of the shard.
+        **name (str)**: The export format, one of `FORMATS`.
+        **compress (bool, optional)**: The file is gzip compressed.
+
+    ### Returns:
+        **str**: The file name, such as `item-00003.csv.gz`.
+    """
+
+    extension = FORMATS[name]
+    if compress and name in _COMPRESSIBLE:
+        extension += ".gz"
+
+    return f"{prefix}-{index:05d}{extension}"
+
+
+def _row_function(cls: type, names: tuple[str, ...]):
+    """
+    Returns a function reading the attribute values of an object, which
+    are cheaper to send to the workers than the object itself.
+    """
+
+    slots = utils.slot_names(cls)
+    getter = attrgetter(*(slots[name] for name in names))
+    if len(names) == 1:
+        return lambda obj: (getter(obj),)
+
+    return getter
+
+
+def _write_shard(cls: type,
+                 names: tuple[str, ...],
+                 rows: list[tuple],
+                 index: int,
+                 directory: Path,
+                 prefix: str,
+                 formats: tuple[str, ...],
+                 compress: bool) -> dict:
+    """
+    Rebuilds the objects of a shard within a worker process and writes
+    them in every format.
+
+    ### Returns:
+        **dict**: The manifest entry of the shard.
+    """
+
+    objs = [utils.create_trusted(cls, **dict(zip(names, row))) for row in rows]
+
+    files = {}
+    for name in formats:
+        path = directory / shard_name(prefix, index, name, compress)
+        if name == "csv":
+            utils.to_csv(objs, path, compress=compress)
+        elif name == "jsonl":
+            utils.to_jsonl(objs, path, compress=compress)
+        elif name == "json":
+            utils.to_json_file(objs, path)
+        elif name == "parquet":
+            arrow.to_parquet(objs, path)
+        else:
+            write_catalog(objs, path, cls)
+
+        files[name] = {
+            "path": path.name,
+            "bytes": path.stat().st_size,
+            "sha256": _digest(path)
+        }
+
+    return {"index": index, "records": len(objs), "files": files}
+
+
+def _digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while block := file.read(1 << 20):
+            digest.update(block)
+
+    return digest.hexdigest()
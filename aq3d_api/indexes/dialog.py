@@ -0,0 +1,158 @@
+"""
+This module defines the DialogIndex class, which maps NPCs and speakers
+back to the dialogs they appear in.
+"""
+
+from aq3d_api.dialogs.frame import DialogFrame
+from aq3d_api.indexes.index import ObjectIndex
+
+
+def normalize_speaker(speaker: str) -> str:
+    """
+    Normalizes a speaker name for lookups, ignoring case and surrounding whitespace.
+
+    ### Parameters:
+        **speaker (str)**: The name of the speaker.
+
+    ### Returns:
+        **str**: The normalized name.
+    """
+
+    return speaker.strip().casefold()
+
+
+class DialogIndex(ObjectIndex):
+    """
+    Reverse indexes of dialogs by the npc ids of their actors and by the
+    speakers of their frames, so neither lookup scans every dialog.
+
+    Speakers are matched ignoring case and surrounding whitespace.
+
+    Lazily loaded, stored and catalog dialogs are indexed from their actors
+    and frames alone, only the dialogs which are looked up are created.
+
+    ```
+    dialogs = Dialogs({"lazy": True})
+    dialogs.add_index(DialogIndex())
+    dialogs.by_npc(10)
+    ```
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.__npcs = {}
+        self.__speakers = {}
+        # The npc ids and speakers indexed under each key, to discard them.
+        self.__forward = {}
+
+    @property
+    def npc_ids(self) -> list[int]:
+        """
+        Returns every npc id which acts in an indexed dialog.
+
+        ### Returns:
+            **list[int]**: The npc ids.
+        """
+
+        return list(self.__npcs)
+
+    @property
+    def speakers(self) -> list[str]:
+        """
+        Returns every normalized speaker of an indexed dialog frame.
+
+        ### Returns:
+            **list[str]**: The normalized speaker names.
+        """
+
+        return list(self.__speakers)
+
+    def dialog_ids(self, npc_id: int) -> set[int]:
+        """
+        Returns the ids of the dialogs an NPC acts in.
+
+        ### Parameters:
+            **npc_id (int)**: The id of the NPC.
+
+        ### Returns:
+            **set[int]**: The dialog ids, empty if the NPC isn't in any dialog.
+        """
+
+        return {key[1] for key in self.__npcs.get(npc_id, ())}
+
+    def dialogs(self, npc_id: int) -> list:
+        """
+        Returns the dialogs an NPC acts in, in order of id.
+
+        ### Parameters:
+            **npc_id (int)**: The id of the NPC.
+
+        ### Returns:
+            **list[Dialog]**: The dialogs of the NPC.
+        """
+
+        return [self._object(key) for key in sorted(self.__npcs.get(npc_id, ()))]
+
+    def frames(self, speaker: str) -> list[tuple[object, DialogFrame]]:
+        """
+        Returns every frame a speaker speaks in, along with its dialog.
+
+        ### Parameters:
+            **speaker (str)**: The name of the speaker.
+
+        ### Returns:
+            **list[tuple[Dialog, DialogFrame]]**: The dialog and frame of each line
+            of the speaker, in order of dialog id and frame.
+
+        ### Raises:
+            **ValueError**: If the speaker is not a string.
+        """
+
+        if not isinstance(speaker, str):
+            raise ValueError("Expected a string speaker to look up frames.")
+
+        positions = self.__speakers.get(normalize_speaker(speaker), {})
+        results = []
+        for key in sorted(positions):
+            dialog = self._object(key)
+            frames = dialog.frames
+            results.extend((dialog, frames[position]) for position in positions[key])
+
+        return results
+
+    def _signature(self, obj: object) -> tuple:
+        # Frames are read from the current object on lookup, so only the
+        # actors and speakers decide whether a dialog is re-indexed.
+        return (
+            tuple(actor.npc_id for actor in obj.actors),
+            tuple(normalize_speaker(frame.speaker) for frame in obj.frames)
+        )
+
+    def _add(self, key: tuple, obj: object):
+        # The signature was just read, so the frames aren't decoded again.
+        npc_ids, speakers = self._signatures[key]
+        for npc_id in npc_ids:
+            self.__npcs.setdefault(npc_id, set()).add(key)
+
+        for position, speaker in enumerate(speakers):
+            if speaker:
+                self.__speakers.setdefault(speaker, {}).setdefault(key, []).append(position)
+
+        self.__forward[key] = (npc_ids, speakers)
+
+    def _discard(self, key: tuple):
+        npc_ids, speakers = self.__forward.pop(key, ((), ()))
+        for npc_id in set(npc_ids):
+            keys = self.__npcs[npc_id]
+            keys.discard(key)
+            if not keys:
+                del self.__npcs[npc_id]
+
+        for speaker in set(speakers):
+            if not speaker:
+                continue
+
+            positions = self.__speakers[speaker]
+            positions.pop(key, None)
+            if not positions:
+                del self.__speakers[speaker]
@@ -0,0 +1,218 @@
+"""
+This module defines the ObjectIndex base class, which keeps a secondary
+index in sync with the objects of a DataContainer across refreshes.
+"""
+
+from abc import ABC, abstractmethod
+from collections.abc import Hashable, Iterable
+
+from aq3d_api.containers.lazy import RecordView
+
+
+class ObjectIndex(ABC):
+    """
+    An abstract interface for indexes which are attached to a DataContainer.
+
+    Objects are keyed by their class name and id, so a single index can be
+    shared between several containers. On every refresh only objects whose
+    indexed content changed are re-indexed, unchanged objects just have their
+    stored reference swapped for the fresh instance.
+
+    Lazily loaded objects are indexed through their RecordView stand-ins,
+    lookups return the model object the container returns for the record.
+    """
+
+    def __init__(self):
+        self.__objects = {}
+        self.__signatures = {}
+
+    @staticmethod
+    def kind(obj: object) -> type:
+        """
+        Returns the model class of an object, or of the object a RecordView stands in for.
+
+        ### Parameters:
+            **obj (object)**: A model object or a RecordView.
+
+        ### Returns:
+            **type**: The model class.
+        """
+
+        if isinstance(obj, RecordView):
+            return obj.cls
+
+        return type(obj)
+
+    @staticmethod
+    def key(obj: object) -> tuple:
+        """
+        Returns the key an object is stored under within the index.
+
+        ### Parameters:
+            **obj (object)**: An object with an `id` attribute, or a RecordView.
+
+        ### Returns:
+            **tuple**: A tuple of the objects class name and id.
+        """
+
+        return ObjectIndex.kind(obj).__name__, obj.id
+
+    @property
+    def _objects(self) -> dict:
+        """
+        Protected property for accessing the indexed objects by their key.
+
+        ### Returns:
+            **dict**: The indexed objects keyed by `ObjectIndex.key`.
+        """
+
+        return self.__objects
+
+    @property
+    def _signatures(self) -> dict:
+        """
+        Protected property for accessing the signatures the objects were indexed with.
+
+        ### Returns:
+            **dict**: The signatures keyed by `ObjectIndex.key`.
+        """
+
+        return self.__signatures
+
+    def get(self, key: tuple) -> object | None:
+        """
+        Returns the object stored under the key, if any.
+
+        ### Parameters:
+            **key (tuple)**: The key returned from `ObjectIndex.key`.
+
+        ### Returns:
+            **object | None**: The indexed object or None.
+        """
+
+        if key not in self.__objects:
+            return None
+
+        return self._object(key)
+
+    def _object(self, key: tuple) -> object:
+        """
+        Returns the object stored under a key, creating the object of
+        a RecordView stand-in and storing it in place of the view.
+
+        ### Parameters:
+            **key (tuple)**: The key returned from `ObjectIndex.key`.
+
+        ### Returns:
+            **object**: The indexed object.
+        """
+
+        obj = self.__objects[key]
+        if isinstance(obj, RecordView):
+            obj = obj.obj
+            self.__objects[key] = obj
+
+        return obj
+
+    def add(self, obj: object):
+        """
+        Adds or re-indexes a single object.
+
+        ### Parameters:
+            **obj (object)**: The object to be indexed.
+        """
+
+        key = self.key(obj)
+        signature = self._signature(obj)
+        self.__objects[key] = obj
+
+        if self.__signatures.get(key) == signature:
+            return
+
+        if key in self.__signatures:
+            self._discard(key)
+
+        self.__signatures[key] = signature
+        self._add(key, obj)
+
+    def discard(self, obj: object):
+        """
+        Removes an object from the index if it has been indexed.
+
+        ### Parameters:
+            **obj (object)**: The object to be removed from the index.
+        """
+
+        self.__discard_key(self.key(obj))
+
+    def refresh(self, objs: Iterable, kind: str | None = None):
+        """
+        Synchronises the index with a fresh collection of objects.
+
+        New and changed objects are (re-)indexed while objects of the same
+        kind which are missing from `objs` are removed.
+
+        ### Parameters:
+            **objs (Iterable)**: The full, fresh collection of objects.
+            **kind (str, optional)**: The class name the collection is made of,
+            only keys of this kind are removed. Removes from all kinds if None.
+        """
+
+        seen = set()
+        for obj in objs:
+            seen.add(self.key(obj))
+            self.add(obj)
+
+        stale = [
+            key for key in self.__signatures
+            if key not in seen and (kind is None or key[0] == kind)
+        ]
+        for key in stale:
+            self.__discard_key(key)
+
+    def clear(self):
+        """
+        Removes every object from the index.
+        """
+
+        for key in list(self.__signatures):
+            self.__discard_key(key)
+
+    def __discard_key(self, key: tuple):
+        if key not in self.__signatures:
+            return
+
+        self._discard(key)
+        del self.__signatures[key]
+        del self.__objects[key]
+
+    @abstractmethod
+    def _signature(self, obj: object) -> Hashable:
+        """
+        Returns a comparable representation of the indexed content of an object,
+        objects with an unchanged signature are not re-indexed.
+        """
+
+        pass
+
+    @abstractmethod
+    def _add(self, key: tuple, obj: object):
+        """
+        Indexes the content of an object under its key.
+        """
+
+        pass
+
+    @abstractmethod
+    def _discard(self, key: tuple):
+        """
+        Removes all the indexed content stored under a key.
+        """
+
+        pass
+
+    def __len__(self) -> int:
+        return len(self.__signatures)
+
+    def __contains__(self, obj: object) -> bool:
+        return self.key(obj) in self.__signatures
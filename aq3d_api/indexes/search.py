@@ -0,0 +1,285 @@
+"""
+This module defines the SearchIndex class, an inverted full-text index over
+the names and descriptions of items and maps, and the frames of dialogs.
+"""
+
+import re
+from bisect import bisect_left
+from heapq import nlargest
+from math import log
+
+from aq3d_api.dialogs.dialog import Dialog
+from aq3d_api.indexes.index import ObjectIndex
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+_CLAUSE_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+# Positions of separate text segments (such as two dialog frames) are spaced
+# apart so phrase queries can't match across them.
+_SEGMENT_GAP = 16
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Splits text into lowercase word tokens.
+
+    ### Parameters:
+        **text (str)**: The text to tokenize.
+
+    ### Returns:
+        **list[str]**: The tokens of the text in order.
+    """
+
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class SearchIndex(ObjectIndex):
+    """
+    An inverted index supporting ranked term, prefix and phrase queries.
+
+    Each object is split into weighted fields, results are ranked with BM25
+    per field and summed using the field weights.
+
+    ### Query Syntax:
+        - `dragon sword` matches objects containing both terms.
+        - `drag*` matches any term starting with `drag`.
+        - `"red dragon"` matches the exact phrase.
+    """
+
+    weights = {
+        "name": 3.0,
+        "speaker": 2.0,
+        "title": 1.5,
+        "description": 1.0,
+        "text": 1.0
+    }
+
+    # BM25 tuning parameters.
+    k1 = 1.2
+    b = 0.75
+
+    # The most terms a single prefix clause can expand to.
+    max_expansions = 64
+
+    def __init__(self):
+        super().__init__()
+        self.__postings = {field: {} for field in self.weights}
+        self.__lengths = {field: {} for field in self.weights}
+        self.__total_lengths = dict.fromkeys(self.weights, 0)
+        self.__forward = {}
+        self.__vocabulary = None
+
+    @staticmethod
+    def fields(obj: object) -> dict[str, tuple[str, ...]]:
+        """
+        Returns the searchable text segments of an object by field.
+
+        ### Parameters:
+            **obj (object)**: An Item, Map, Dialog or similar object.
+
+        ### Returns:
+            **dict[str, tuple[str, ...]]**: The text segments of each field.
+        """
+
+        if issubclass(ObjectIndex.kind(obj), Dialog):
+            frames = getattr(obj, "frames", ())
+            return {
+                "speaker": tuple(frame.speaker or "" for frame in frames),
+                "title": tuple(frame.title or "" for frame in frames),
+                "text": tuple(frame.text or "" for frame in frames)
+            }
+
+        # Missing and null attributes are searched as empty text.
+        return {
+            "name": (getattr(obj, "name", None) or "",),
+            "description": (getattr(obj, "description", None) or "",)
+        }
+
+    def search(self, query: str, limit: int = 10) -> list[tuple[object, float]]:
+        """
+        Searches the index and returns the best matching objects.
+
+        Every clause of the query has to match for an object to be returned.
+
+        ### Parameters:
+            **query (str)**: The query, see the class query syntax.
+            **limit (int, optional)**: The maximum amount of results.
+
+        ### Returns:
+            **list[tuple[object, float]]**: Matching objects and their scores,
+            highest score first.
+
+        ### Raises:
+            **ValueError**: If the query is not a string.
+        """
+
+        if not isinstance(query, str):
+            raise ValueError("Expected a string for the search query.")
+
+        scores = None
+        for phrase, word in _CLAUSE_PATTERN.findall(query):
+            if phrase:
+                clause_scores = self.__score_phrase(tokenize(phrase))
+            elif word.endswith("*"):
+                clause_scores = self.__score_prefix(tokenize(word))
+            else:
+                clause_scores = self.__score_phrase(tokenize(word))
+
+            if clause_scores is None:
+                continue
+
+            if scores is None:
+                scores = clause_scores
+                continue
+
+            scores = {
+                key: score + clause_scores[key]
+                for key, score in scores.items() if key in clause_scores
+            }
+
+        if not scores:
+            return []
+
+        best = nlargest(limit, scores.items(), key=lambda pair: pair[1])
+        return [(self._object(key), score) for key, score in best]
+
+    def _signature(self, obj: object) -> tuple:
+        return tuple(self.fields(obj).items())
+
+    def _add(self, key: tuple, obj: object):
+        forward = {}
+        for field, segments in self.fields(obj).items():
+            if field not in self.__postings:
+                continue
+
+            postings = self.__postings[field]
+            position = 0
+            length = 0
+            terms = set()
+            for segment in segments:
+                for token in tokenize(segment):
+                    postings.setdefault(token, {}).setdefault(key, []).append(position)
+                    terms.add(token)
+                    position += 1
+                    length += 1
+
+                position += _SEGMENT_GAP
+
+            self.__lengths[field][key] = length
+            self.__total_lengths[field] += length
+            forward[field] = terms
+
+        self.__forward[key] = forward
+        self.__vocabulary = None
+
+    def _discard(self, key: tuple):
+        for field, terms in self.__forward.pop(key, {}).items():
+            postings = self.__postings[field]
+            for term in terms:
+                documents = postings[term]
+                del documents[key]
+                if not documents:
+                    del postings[term]
+
+            self.__total_lengths[field] -= self.__lengths[field].pop(key)
+
+        self.__vocabulary = None
+
+    @property
+    def __sorted_vocabulary(self) -> list[str]:
+        """
+        Returns every indexed term in sorted order, rebuilt lazily after
+        the index has changed.
+        """
+
+        if self.__vocabulary is None:
+            terms = set()
+            for postings in self.__postings.values():
+                terms.update(postings)
+
+            self.__vocabulary = sorted(terms)
+
+        return self.__vocabulary
+
+    def __score_prefix(self, tokens: list[str]) -> dict | None:
+        if not tokens:
+            return None
+
+        # Only the last token acts as a prefix, earlier tokens of
+        # something like `ice-dra*` are required as full terms.
+        scores = self.__score_phrase(tokens[:-1]) if len(tokens) > 1 else None
+
+        prefix = tokens[-1]
+        vocabulary = self.__sorted_vocabulary
+        prefix_scores = {}
+        index = bisect_left(vocabulary, prefix)
+        for term in vocabulary[index:index + self.max_expansions]:
+            if not term.startswith(prefix):
+                break
+
+            for key, score in self.__score_phrase([term]).items():
+                prefix_scores[key] = max(prefix_scores.get(key, 0.0), score)
+
+        if scores is None:
+            return prefix_scores
+
+        return {
+            key: score + prefix_scores[key]
+            for key, score in scores.items() if key in prefix_scores
+        }
+
+    def __score_phrase(self, tokens: list[str]) -> dict | None:
+        if not tokens:
+            return None
+
+        scores = {}
+        documents = len(self)
+        for field, weight in self.weights.items():
+            postings = self.__postings[field]
+            matches = [postings.get(token) for token in tokens]
+            if not all(matches):
+                continue
+
+            lengths = self.__lengths[field]
+            average_length = (self.__total_lengths[field] / len(lengths)) or 1.0
+            idf = sum(
+                log(1 + (documents - len(match) + 0.5) / (len(match) + 0.5))
+                for match in matches
+            )
+
+            for key in min(matches, key=len):
+                frequency = _phrase_frequency([match.get(key) for match in matches])
+                if not frequency:
+                    continue
+
+                norm = self.k1 * (1 - self.b + self.b * lengths[key] / average_length)
+                score = weight * idf * frequency * (self.k1 + 1) / (frequency + norm)
+                scores[key] = scores.get(key, 0.0) + score
+
+        return scores
+
+
+def _phrase_frequency(positions: list[list[int] | None]) -> int:
+    """
+    Counts how many times a sequence of tokens appear one after another.
+
+    ### Parameters:
+        **positions (list[list[int] | None])**: The positions of each token
+        of the phrase within a single field.
+
+    ### Returns:
+        **int**: The amount of times the phrase appears.
+    """
+
+    if not all(positions):
+        return 0
+
+    if len(positions) == 1:
+        return len(positions[0])
+
+    following = [set(token_positions) for token_positions in positions[1:]]
+    return sum(
+        1 for start in positions[0]
+        if all(start + offset in token_positions
+               for offset, token_positions in enumerate(following, 1))
+    )
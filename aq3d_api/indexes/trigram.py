@@ -0,0 +1,127 @@
+"""
+This module defines the TrigramIndex class, which allows typo tolerant
+lookups of items and maps by their names.
+"""
+
+from collections import Counter
+from heapq import nlargest
+
+from aq3d_api.indexes.index import ObjectIndex
+
+
+def trigrams(text: str) -> frozenset[str]:
+    """
+    Splits text into its set of character trigrams.
+
+    Each word is padded with two leading and one trailing space,
+    so the start of words weigh more than their end.
+
+    ### Parameters:
+        **text (str)**: The text to split into trigrams.
+
+    ### Returns:
+        **frozenset[str]**: Every unique trigram within the text.
+    """
+
+    grams = set()
+    for word in text.lower().split():
+        padded = f"  {word} "
+        grams.update(padded[index:index + 3] for index in range(len(padded) - 2))
+
+    return frozenset(grams)
+
+
+class TrigramIndex(ObjectIndex):
+    """
+    An index of name trigrams for fuzzy, similarity ranked lookups.
+
+    Similarity is the Jaccard index between the trigrams of the query
+    and of the name, ranging from 0 (nothing shared) to 1 (identical).
+    """
+
+    def __init__(self, attribute: str = "name"):
+        """
+        ### Parameters:
+            **attribute (str, optional)**: The attribute of the objects to index.
+        """
+
+        super().__init__()
+        self.__attribute = attribute
+        self.__postings = {}
+        self.__grams = {}
+
+    @property
+    def attribute(self) -> str:
+        """
+        Returns the name of the attribute which is indexed.
+
+        ### Returns:
+            **str**: The indexed attribute name.
+        """
+
+        return self.__attribute
+
+    def similar(self,
+                text: str,
+                limit: int = 5,
+                threshold: float = 0.3,
+                kind: type | None = None) -> list[tuple[object, float]]:
+        """
+        Returns the objects whose names are most similar to the text.
+
+        ### Parameters:
+            **text (str)**: The (possibly misspelled) name to look up.
+            **limit (int, optional)**: The maximum amount of results.
+            **threshold (float, optional)**: The minimum similarity of a result.
+            **kind (type, optional)**: Only return objects of this class.
+
+        ### Returns:
+            **list[tuple[object, float]]**: Matching objects and their similarity,
+            most similar first.
+
+        ### Raises:
+            **ValueError**: If the text is not a string.
+        """
+
+        if not isinstance(text, str):
+            raise ValueError("Expected a string to look up similar names.")
+
+        query = trigrams(text)
+        if not query:
+            return []
+
+        shared = Counter()
+        for gram in query:
+            shared.update(self.__postings.get(gram, ()))
+
+        kind_name = kind.__name__ if kind else None
+        scores = (
+            (key, count / (len(query) + len(self.__grams[key]) - count))
+            for key, count in shared.items()
+            if kind_name is None or key[0] == kind_name
+        )
+
+        best = nlargest(
+            limit,
+            (pair for pair in scores if pair[1] >= threshold),
+            key=lambda pair: pair[1]
+        )
+        return [(self._object(key), score) for key, score in best]
+
+    def _signature(self, obj: object) -> str:
+        # Missing and null attributes are indexed as empty text.
+        return getattr(obj, self.__attribute, None) or ""
+
+    def _add(self, key: tuple, obj: object):
+        grams = trigrams(self._signature(obj))
+        for gram in grams:
+            self.__postings.setdefault(gram, set()).add(key)
+
+        self.__grams[key] = grams
+
+    def _discard(self, key: tuple):
+        for gram in self.__grams.pop(key, ()):
+            keys = self.__postings[gram]
+            keys.discard(key)
+            if not keys:
+                del self.__postings[gram]
@@ -6,6 +6,8 @@ class ItemAttributes:
     health, attack, armor, evasion and critical.
     """
 
+    __slots__ = ("health", "attack", "armor", "evasion", "critical")
+
     def __init__(self, **data):
         """
         :param health: Health the item gives.
@@ -2,6 +2,7 @@
 
 import aq3d_api.utils as utils
 
+from aq3d_api.decoder import Field, get_decoder
 from aq3d_api.items.attributes import ItemAttributes
 from aq3d_api.enums.item_type import ItemType
 from aq3d_api.enums.item_equip_type import ItemEquipType
@@ -10,6 +11,34 @@ from aq3d_api.enums.item_rarity import ItemRarity
 class Item(ItemAttributes):
     """ The Item class defines an item object. """
 
+    __slots__ = (
+        "__id", "__name", "level", "__description", "__price", "__type",
+        "__equip_type", "__rarity", "__stack_size", "__version",
+        "__cosmetic", "__dc_purchasable"
+    )
+
+    # Where each attribute is read from in the raw API data.
+    schema = (
+        Field("id", "ID", -1),
+        Field("name", "Name", ""),
+        Field("level", "Level", 1),
+        Field("description", "Desc", ""),
+        Field("price", "Cost", 0),
+        Field("type", "Type", 0, enum=ItemType, fallback=ItemType.ITEM),
+        Field("equip_type", "EquipSlot", 0,
+              enum=ItemEquipType, fallback=ItemEquipType.NONE),
+        Field("rarity", "Rarity", 0, enum=ItemRarity, fallback=ItemRarity.JUNK),
+        Field("stack_size", "MaxStack", 1),
+        Field("version", ("bundle", "Version"), 1),
+        Field("cosmetic", "IsCosmetic", False),
+        Field("dc_purchasable", "IsMC", False),
+        Field("health", "MaxHealth", 0),
+        Field("attack", "Attack", 0),
+        Field("armor", "Armor", 0),
+        Field("evasion", "Evasion", 0),
+        Field("critical", "Crit", 0)
+    )
+
     def __init__(self, **data):
         """
         :param item_id: ID of the item.
@@ -309,35 +338,26 @@ class Item(ItemAttributes):
         Factory method to create an Item object by giving raw json
         data inputted directly from the official AQ3D API.
 
+        Data from the API is trusted, so the property setters
+        are skipped when building the item, see `Item.schema`.
+
         :param raw: The originally structured json data from the API.
         :return: Returns a new instance of the Item class.
         """
 
-        return cls(
-            item_id=raw.get("ID", -1),
-            name=raw.get("Name", ""),
-            level=raw.get("Level", 1),
-            description=raw.get("Desc", ""),
-            price=raw.get("Cost", 0),
-            item_type=utils.to_enum(
-                ItemType, raw.get("Type", 0), ItemType.ITEM
-            ),
-            equip_type=utils.to_enum(
-                ItemEquipType, raw.get("EquipSlot", 0), ItemEquipType.NONE
-            ),
-            rarity=utils.to_enum(
-                ItemRarity, raw.get("Rarity", 0), ItemRarity.JUNK
-            ),
-            stack_size=raw.get("MaxStack", 1),
-            version=raw.get("bundle")["Version"] if "bundle" in raw else 1,
-            health=raw.get("MaxHealth", 0),
-            attack=raw.get("Attack", 0),
-            armor=raw.get("Armor", 0),
-            evasion=raw.get("Evasion", 0),
-            critical=raw.get("Crit", 0),
-            is_cosmetic=raw.get("IsCosmetic", False),
-            is_dc_purchasable=raw.get("IsMC", False)
-        )
+        return get_decoder(cls).decode(raw)
+
+    @classmethod
+    def create_many(cls, raws: list) -> list:
+        """
+        Factory method to create an Item object for each record of a page
+        of raw json data from the official AQ3D API, decoded in one batch.
+
+        :param raws: The originally structured json records from the API.
+        :return: Returns a list of new Item instances.
+        """
+
+        return get_decoder(cls).decode_many(raws)
 
     def to_dict(self) -> dict:
         """
@@ -1,5 +1,6 @@
 """ This module contains the Map class. """
 from aq3d_api import utils
+from aq3d_api.decoder import Field, get_decoder
 
 
 class Map:
@@ -8,6 +9,27 @@ class Map:
     a Map class.
     """
 
+    __slots__ = (
+        "__id", "__name", "__description", "__max_players", "__min_level",
+        "__level_restriction", "__scaled", "__seasonal", "__dungeon",
+        "__challenge", "__active"
+    )
+
+    # Where each attribute is read from in the raw API data.
+    schema = (
+        Field("id", ("map", "ID"), -1),
+        Field("name", ("map", "DisplayName"), ""),
+        Field("description", ("map", "Description"), ""),
+        Field("max_players", ("map", "MaxUsers"), 1),
+        Field("min_level", ("map", "MinLevel"), 1),
+        Field("level_restriction", ("map", "levelRestriction"), 0),
+        Field("scaled", ("map", "IsScaled"), False),
+        Field("seasonal", ("map", "IsSeasonal"), False),
+        Field("dungeon", ("map", "IsDungeon"), False),
+        Field("challenge", ("map", "IsChallenge"), False),
+        Field("active", ("map", "bActive"), False)
+    )
+
     def __init__(self, **data):
         """
         :param id: The ID of the map.
@@ -301,6 +323,9 @@ class Map:
         Factory method to create a Map instance from raw
         data directly from the official API.
 
+        Data from the API is trusted, so the property setters
+        are skipped when building the map, see `Map.schema`.
+
         :param raw: The raw JSON data from the API.
         :return: Map instance using the raw data.
         """
@@ -308,20 +333,19 @@ class Map:
         if not isinstance(raw, dict) or not raw:
             raise ValueError("Expected a valid raw dict object of map data.")
 
-        map = raw["map"]
-        return cls(
-            id = map.get("ID", -1),
-            name = map.get("DisplayName", ""),
-            description = map.get("Description", ""),
-            max_players = map.get("MaxUsers", 1),
-            min_level = map.get("MinLevel", 1),
-            level_restriction = map.get("levelRestriction", 0),
-            scaled = map.get("IsScaled", False),
-            seasonal = map.get("IsSeasonal", False),
-            dungeon = map.get("IsDungeon", False),
-            challenge = map.get("IsChallenge", False),
-            active = map.get("bActive", False)
-        )
+        return get_decoder(cls).decode(raw)
+
+    @classmethod
+    def create_many(cls, raws: list) -> list:
+        """
+        Factory method to create a Map object for each record of a page
+        of raw json data from the official AQ3D API, decoded in one batch.
+
+        :param raws: The originally structured json records from the API.
+        :return: Returns a list of new Map instances.
+        """
+
+        return get_decoder(cls).decode_many(raws)
 
     def to_dict(self):
         return utils.to_dict(self)
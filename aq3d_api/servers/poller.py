@@ -0,0 +1,303 @@
+""" This module contains the ServerChange and ServerPoller classes. """
+
+from collections.abc import Callable
+from threading import Event, Lock, Thread
+
+from aq3d_api.enums.server_status import ServerStatus
+from aq3d_api.servers.server import Server
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+
+class ServerChange:
+    """ A change to a single server between two polls. """
+
+    __slots__ = ("__kind", "__server", "__previous_players", "__previous_status")
+
+    def __init__(self,
+                 kind: str,
+                 server: Server,
+                 previous_players: int | None = None,
+                 previous_status: ServerStatus | None = None):
+        """
+        :param kind: If the server was added, removed or changed.
+        :param server: The server, as it was before being removed otherwise the latest.
+        :param previous_players: The player count of the previous poll.
+        :param previous_status: The status of the previous poll.
+        """
+
+        self.__kind = kind
+        self.__server = server
+        self.__previous_players = previous_players
+        self.__previous_status = previous_status
+
+    @property
+    def kind(self) -> str:
+        """
+        Returns the kind of change, added, removed or changed.
+
+        :return: Returns the kind of change.
+        """
+
+        return self.__kind
+
+    @property
+    def server(self) -> Server:
+        """
+        Returns the server which changed.
+
+        :return: Returns the Server.
+        """
+
+        return self.__server
+
+    @property
+    def previous_players(self) -> int | None:
+        """
+        Returns the player count of the previous poll, None if the server was added.
+
+        :return: Returns the previous player count.
+        """
+
+        return self.__previous_players
+
+    @property
+    def previous_status(self) -> ServerStatus | None:
+        """
+        Returns the status of the previous poll, None if the server was added.
+
+        :return: Returns the previous ServerStatus.
+        """
+
+        return self.__previous_status
+
+    @property
+    def status_changed(self) -> bool:
+        """
+        Returns if the status of the server changed, such as into maintenance.
+
+        :return: Returns if the status changed.
+        """
+
+        return self.__kind == CHANGED and self.__previous_status != self.__server.status
+
+    def __repr__(self) -> str:
+        return (
+            f"ServerChange({self.__kind}, {self.__server.name}, "
+            f"players={self.__previous_players}->{self.__server.players}, "
+            f"status={self.__previous_status}->{self.__server.status})"
+        )
+
+
+class ServerPoller:
+    """
+    Polls the servers in the background with an interval that adapts to
+    how quickly they change.
+
+    A server being added, removed or changing status resets the interval to
+    `min_interval`. A player count changing by more than `player_change`
+    (a fraction of its previous count) shortens the interval by `speedup`,
+    otherwise a quiet poll lengthens it by `slowdown`, up to `max_interval`.
+    The callback is only called for polls where something changed.
+
+    Failed polls lengthen the interval like quiet ones, the background thread
+    keeps polling and counts them in `stats` along with the last error.
+    """
+
+    def __init__(self,
+                 servers=None,
+                 callback: Callable[[list[ServerChange]], None] | None = None,
+                 min_interval: float = 10.0,
+                 max_interval: float = 300.0,
+                 player_change: float = 0.05,
+                 speedup: float = 0.5,
+                 slowdown: float = 1.5):
+        """
+        :param servers: The Servers container to refresh, a new one if None.
+        :param callback: Called with the list of changes of each poll which changed something.
+        :param min_interval: The fewest seconds between polls.
+        :param max_interval: The most seconds between polls.
+        :param player_change: The fraction a player count has to change by to poll sooner.
+        :param speedup: What the interval is multiplied by after a busy poll, below 1.
+        :param slowdown: What the interval is multiplied by after a quiet poll, above 1.
+        """
+
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("Expected a minimum interval above 0 and at most the maximum interval.")
+
+        if not 0 < speedup <= 1 <= slowdown:
+            raise ValueError("Expected a speedup of at most 1 and a slowdown of at least 1.")
+
+        if servers is None:
+            # Imported here as the containers import the server modules.
+            from aq3d_api.containers.servers import Servers
+            servers = Servers()
+
+        self.__servers = servers
+        self.__callback = callback
+        self.__min_interval = min_interval
+        self.__max_interval = max_interval
+        self.__player_change = player_change
+        self.__speedup = speedup
+        self.__slowdown = slowdown
+        self.__interval = min_interval
+        self.__previous = None
+        self.__stats = {"polls": 0, "failures": 0, "last_error": None}
+        self.__lock = Lock()
+        self.__stopped = Event()
+        self.__thread = None
+
+    @property
+    def servers(self):
+        """
+        Returns the Servers container which is refreshed.
+
+        :return: Returns the Servers container.
+        """
+
+        return self.__servers
+
+    @property
+    def interval(self) -> float:
+        """
+        Returns the seconds until the next poll.
+
+        :return: Returns the current interval.
+        """
+
+        return self.__interval
+
+    @property
+    def stats(self) -> dict:
+        """
+        Returns the counters of the poller.
+
+        :return: Returns a dict of the poll and failed poll counts and the last error.
+        """
+
+        with self.__lock:
+            return dict(self.__stats)
+
+    @property
+    def running(self) -> bool:
+        """
+        Returns if the background thread is polling.
+
+        :return: Returns if the poller is running.
+        """
+
+        return self.__thread is not None and self.__thread.is_alive()
+
+    def poll(self) -> list[ServerChange]:
+        """
+        Refreshes the servers, adapts the interval to the changes and calls
+        the callback if anything changed. A failed refresh keeps the previous
+        servers and lengthens the interval.
+
+        The first poll only records the servers, so it has no changes.
+
+        :return: Returns the changes since the previous poll.
+        """
+
+        with self.__lock:
+            self.__stats["polls"] += 1
+
+        # The request runs without the lock, so reading the stats or
+        # interval from another thread doesn't wait on the network.
+        refreshed = self.__servers.refresh()
+        current = {server.id: server for server in self.__servers} if refreshed else None
+
+        with self.__lock:
+            if current is None:
+                self.__stats["failures"] += 1
+                self.__stats["last_error"] = "The API returned no servers."
+                self.__interval = min(self.__interval * self.__slowdown, self.__max_interval)
+                return []
+
+            previous, self.__previous = self.__previous, current
+            if previous is None:
+                return []
+
+            changes, busy = self.__changes(previous, current)
+            if any(change.kind != CHANGED or change.status_changed for change in changes):
+                self.__interval = self.__min_interval
+            elif busy:
+                self.__interval = max(self.__interval * self.__speedup, self.__min_interval)
+            else:
+                self.__interval = min(self.__interval * self.__slowdown, self.__max_interval)
+
+        if changes and self.__callback:
+            self.__callback(changes)
+
+        return changes
+
+    def start(self):
+        """
+        Starts polling in a background thread.
+        """
+
+        if self.running:
+            return None
+
+        self.__stopped.clear()
+        self.__thread = Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    def stop(self, timeout: float | None = None):
+        """
+        Stops polling, waiting for a running poll to finish.
+
+        :param timeout: The most seconds to wait, forever if None.
+        """
+
+        self.__stopped.set()
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+
+    def __changes(self, previous: dict, current: dict) -> tuple[list[ServerChange], bool]:
+        """
+        Returns the changes between two polls and if any
+        player count changed by more than the threshold.
+        """
+
+        changes = []
+        busy = False
+        for server_id, server in current.items():
+            old = previous.get(server_id)
+            if old is None:
+                changes.append(ServerChange(ADDED, server))
+                continue
+
+            if old.players == server.players and old.status == server.status:
+                continue
+
+            changes.append(ServerChange(CHANGED, server, old.players, old.status))
+            busy |= abs(server.players - old.players) > self.__player_change * max(old.players, 1)
+
+        for server_id in previous.keys() - current.keys():
+            old = previous[server_id]
+            changes.append(ServerChange(REMOVED, old, old.players, old.status))
+
+        return changes, busy
+
+    def __run(self):
+        while not self.__stopped.is_set():
+            try:
+                self.poll()
+            except Exception as ex:
+                # A failing callback or request shouldn't stop the poller.
+                with self.__lock:
+                    self.__stats["failures"] += 1
+                    self.__stats["last_error"] = repr(ex)
+                    self.__interval = min(self.__interval * self.__slowdown, self.__max_interval)
+
+            self.__stopped.wait(self.__interval)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,405 @@
+""" This module contains the LatencyHistogram, ProbeResult and ServerProber classes. """
+
+import asyncio
+from bisect import bisect_left
+from collections.abc import Iterable
+from time import perf_counter, time
+
+from aq3d_api.servers.server import Server
+
+# The upper bounds of the histogram buckets in milliseconds, the last bucket
+# holds every latency above the highest bound.
+LATENCY_BOUNDS = (1, 2, 5, 10, 20, 35, 50, 75, 100, 150, 200, 300, 500, 750, 1000, 2000, 5000)
+
+
+class LatencyHistogram:
+    """
+    Counts connect latencies into fixed buckets, so any amount of
+    probes takes the same memory.
+    """
+
+    def __init__(self, bounds: tuple = LATENCY_BOUNDS):
+        """
+        :param bounds: The ascending upper bounds of the buckets in milliseconds.
+        """
+
+        if not bounds or list(bounds) != sorted(set(bounds)):
+            raise ValueError("Expected ascending, unique histogram bounds.")
+
+        self.__bounds = tuple(bounds)
+        self.__counts = [0] * (len(bounds) + 1)
+        self.__total = 0.0
+        self.__min = None
+        self.__max = None
+
+    @property
+    def bounds(self) -> tuple:
+        """
+        Returns the upper bounds of the buckets in milliseconds.
+
+        :return: Returns a tuple of the bounds.
+        """
+
+        return self.__bounds
+
+    @property
+    def counts(self) -> list[int]:
+        """
+        Returns how many latencies fell in each bucket, the last
+        bucket being above the highest bound.
+
+        :return: Returns a list of the counts.
+        """
+
+        return list(self.__counts)
+
+    @property
+    def count(self) -> int:
+        """
+        Returns how many latencies were recorded.
+
+        :return: Returns the amount of latencies.
+        """
+
+        return sum(self.__counts)
+
+    @property
+    def mean(self) -> float | None:
+        """
+        Returns the average latency in milliseconds.
+
+        :return: Returns the mean or None if nothing was recorded.
+        """
+
+        count = self.count
+        return self.__total / count if count else None
+
+    @property
+    def min(self) -> float | None:
+        """
+        Returns the lowest recorded latency in milliseconds.
+
+        :return: Returns the min or None if nothing was recorded.
+        """
+
+        return self.__min
+
+    @property
+    def max(self) -> float | None:
+        """
+        Returns the highest recorded latency in milliseconds.
+
+        :return: Returns the max or None if nothing was recorded.
+        """
+
+        return self.__max
+
+    def record(self, latency: float):
+        """
+        Records a latency.
+
+        :param latency: The latency in milliseconds.
+        """
+
+        self.__counts[bisect_left(self.__bounds, latency)] += 1
+        self.__total += latency
+        self.__min = latency if self.__min is None else min(self.__min, latency)
+        self.__max = latency if self.__max is None else max(self.__max, latency)
+
+    def merge(self, other: "LatencyHistogram"):
+        """
+        Adds the counts of another histogram with the same bounds, such as
+        to combine the histograms of every server in a region.
+
+        :param other: The LatencyHistogram to add.
+        """
+
+        if other.bounds != self.__bounds:
+            raise ValueError("Expected a histogram with the same bounds.")
+
+        for index, count in enumerate(other.counts):
+            self.__counts[index] += count
+
+        if other.count:
+            self.__total += other.mean * other.count
+            self.__min = other.min if self.__min is None else min(self.__min, other.min)
+            self.__max = other.max if self.__max is None else max(self.__max, other.max)
+
+    def percentile(self, q: float) -> float | None:
+        """
+        Returns an estimate of a latency percentile, the upper bound of the
+        bucket it falls in, or the max latency for the last bucket.
+
+        :param q: The percentile, between 0 and 100.
+        :return: Returns the latency in milliseconds or None if nothing was recorded.
+        """
+
+        if not 0 <= q <= 100:
+            raise ValueError("Expected a percentile between 0 and 100.")
+
+        count = self.count
+        if not count:
+            return None
+
+        rank = max(1, q / 100 * count)
+        seen = 0
+        for index, bucket in enumerate(self.__counts):
+            seen += bucket
+            if seen >= rank:
+                break
+
+        if index == len(self.__bounds):
+            return self.__max
+
+        return min(self.__bounds[index], self.__max)
+
+
+class ProbeResult:
+    """ The outcome of a single connect to a server. """
+
+    __slots__ = ("__server_id", "__reachable", "__latency", "__error", "__timestamp")
+
+    def __init__(self, server_id: int, reachable: bool, latency: float | None = None,
+                 error: str | None = None, timestamp: float | None = None):
+        """
+        :param server_id: The id of the probed server.
+        :param reachable: If the connection was opened.
+        :param latency: How many milliseconds connecting took, None if it failed.
+        :param error: Why connecting failed.
+        :param timestamp: When the probe started, the current time if None.
+        """
+
+        self.__server_id = server_id
+        self.__reachable = reachable
+        self.__latency = latency
+        self.__error = error
+        self.__timestamp = time() if timestamp is None else timestamp
+
+    @property
+    def server_id(self) -> int:
+        """
+        Returns the id of the probed server.
+
+        :return: Returns the server id.
+        """
+
+        return self.__server_id
+
+    @property
+    def reachable(self) -> bool:
+        """
+        Returns if the connection was opened.
+
+        :return: Returns if the server was reachable.
+        """
+
+        return self.__reachable
+
+    @property
+    def latency(self) -> float | None:
+        """
+        Returns how many milliseconds connecting took.
+
+        :return: Returns the latency or None if connecting failed.
+        """
+
+        return self.__latency
+
+    @property
+    def error(self) -> str | None:
+        """
+        Returns why connecting failed, such as `timeout`.
+
+        :return: Returns the error or None if the server was reachable.
+        """
+
+        return self.__error
+
+    @property
+    def timestamp(self) -> float:
+        """
+        Returns when the probe started, in seconds since epoch.
+
+        :return: Returns the timestamp.
+        """
+
+        return self.__timestamp
+
+    def __repr__(self) -> str:
+        if self.__reachable:
+            return f"ProbeResult({self.__server_id}, reachable, {self.__latency:.1f}ms)"
+
+        return f"ProbeResult({self.__server_id}, unreachable, {self.__error})"
+
+
+class ServerProber:
+    """
+    Opens TCP connections to the hostname and port of every server
+    concurrently, recording the connect latency and reachability of each.
+
+    Connections are closed as soon as they're opened, nothing is sent.
+    At most `concurrency` connections are opened at once, and each
+    connect is given up after `timeout` seconds.
+    """
+
+    def __init__(self, timeout: float = 3.0, concurrency: int = 64,
+                 bounds: tuple = LATENCY_BOUNDS):
+        """
+        :param timeout: The most seconds a connect may take.
+        :param concurrency: The most connects in flight at once.
+        :param bounds: The bucket bounds of the latency histograms in milliseconds.
+        """
+
+        if timeout <= 0 or concurrency < 1:
+            raise ValueError("Expected a timeout above 0 and a concurrency of at least 1.")
+
+        self.__timeout = timeout
+        self.__concurrency = concurrency
+        self.__bounds = bounds
+        self.__histograms = {}
+        self.__probes = {}
+        self.__latest = {}
+
+    @property
+    def latest(self) -> dict[int, ProbeResult]:
+        """
+        Returns the latest probe result of every server.
+
+        :return: Returns a dict of server ids to their ProbeResult.
+        """
+
+        return dict(self.__latest)
+
+    def histogram(self, server_id: int) -> LatencyHistogram:
+        """
+        Returns the latency histogram of a server.
+
+        :param server_id: The id of the server.
+        :return: Returns the LatencyHistogram, empty if the server was never reached.
+        """
+
+        return self.__histograms.get(server_id) or LatencyHistogram(self.__bounds)
+
+    def reachability(self, server_id: int) -> float | None:
+        """
+        Returns the fraction of probes of a server which connected.
+
+        :param server_id: The id of the server.
+        :return: Returns the fraction or None if the server was never probed.
+        """
+
+        probes = self.__probes.get(server_id)
+        if not probes:
+            return None
+
+        return self.histogram(server_id).count / probes
+
+    async def probe(self, servers: Iterable[Server]) -> dict[int, ProbeResult]:
+        """
+        Probes every server concurrently.
+
+        :param servers: The servers to probe.
+        :return: Returns a dict of server ids to their ProbeResult.
+        """
+
+        semaphore = asyncio.Semaphore(self.__concurrency)
+
+        async def limited(server: Server) -> ProbeResult:
+            async with semaphore:
+                return await self.probe_address(server.id, server.hostname, server.port)
+
+        results = await asyncio.gather(*(limited(server) for server in servers))
+        return {result.server_id: result for result in results}
+
+    async def probe_address(self, server_id: int, hostname: str, port: int) -> ProbeResult:
+        """
+        Opens and closes a single TCP connection and records the result.
+
+        :param server_id: The id the result is recorded under.
+        :param hostname: The hostname or address to connect to.
+        :param port: The port to connect to.
+        :return: Returns the ProbeResult.
+        """
+
+        timestamp = time()
+        started = perf_counter()
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(hostname, port), self.__timeout
+            )
+        except asyncio.TimeoutError:
+            result = ProbeResult(server_id, False, error="timeout", timestamp=timestamp)
+        except OSError as ex:
+            result = ProbeResult(server_id, False, error=ex.strerror or repr(ex), timestamp=timestamp)
+        else:
+            latency = (perf_counter() - started) * 1000
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+            result = ProbeResult(server_id, True, latency, timestamp=timestamp)
+
+        self.__record(result)
+        return result
+
+    def run(self, servers: Iterable[Server]) -> dict[int, ProbeResult]:
+        """
+        Probes every server from synchronous code, see `probe`.
+
+        :param servers: The servers to probe.
+        :return: Returns a dict of server ids to their ProbeResult.
+        """
+
+        return asyncio.run(self.probe(servers))
+
+    def report(self, servers: Iterable[Server]) -> list[dict]:
+        """
+        Returns the probe statistics of each server alongside its API data.
+
+        :param servers: The servers to report on.
+        :return: Returns a list of dicts of the server's id, name, region, API status,
+        latest reachability, reachable fraction and latency percentiles.
+        """
+
+        rows = []
+        for server in servers:
+            histogram = self.histogram(server.id)
+            latest = self.__latest.get(server.id)
+            rows.append({
+                "id": server.id,
+                "name": server.name,
+                "region": server.region,
+                "status": server.status.name,
+                "reachable": latest.reachable if latest else None,
+                "reachability": self.reachability(server.id),
+                "p50": histogram.percentile(50),
+                "p90": histogram.percentile(90),
+                "p99": histogram.percentile(99)
+            })
+
+        return rows
+
+    def by_region(self, servers: Iterable[Server]) -> dict[str, LatencyHistogram]:
+        """
+        Combines the latency histograms of the servers of each region.
+
+        :param servers: The servers to group.
+        :return: Returns a dict of region areacodes to their LatencyHistogram.
+        """
+
+        regions = {}
+        for server in servers:
+            histogram = regions.setdefault(server.region, LatencyHistogram(self.__bounds))
+            histogram.merge(self.histogram(server.id))
+
+        return regions
+
+    def __record(self, result: ProbeResult):
+        self.__probes[result.server_id] = self.__probes.get(result.server_id, 0) + 1
+        self.__latest[result.server_id] = result
+        if result.reachable:
+            self.__histograms.setdefault(
+                result.server_id, LatencyHistogram(self.__bounds)
+            ).record(result.latency)
@@ -1,13 +1,80 @@
 """ This module contains the Server class. """
 from datetime import datetime
+from functools import lru_cache
 
 from aq3d_api import utils
+from aq3d_api.decoder import Field, get_decoder
 from aq3d_api.enums.server_status import ServerStatus
 from aq3d_api.snapshots.server import ServerSnapshot
 
+
+def _strip_areacode(name: str) -> str:
+    """
+    Some server names have the regions areacode attached to the name,
+    this will filter them so only the name itself is used.
+
+    :param name: The name of the server.
+    :return: The name of the server without an areacode.
+    """
+
+    if "[" in name:
+        name = name.split("[")[0].strip()
+
+    return name
+
+
+def _statuscode_to_status(statuscode: int) -> ServerStatus:
+    """
+    Returns the ServerStatus representation of an integer status code.
+
+    :param statuscode: An integer of the status code, 0 or 1.
+    :return: Returns a ServerStatus representation of the status code.
+    """
+
+    if statuscode == 0:
+        return ServerStatus.OFFLINE
+
+    return ServerStatus.ONLINE
+
+
+@lru_cache(maxsize=4096)
+def _parse_timestamp(timestamp: str) -> float:
+    """
+    Parses a timestamp from the API into seconds since epoch. Servers
+    are usually refreshed at the same time, so results are cached.
+
+    :param timestamp: A timestamp such as 2024-01-31T12:00:00.
+    :return: The seconds since epoch of the timestamp.
+    """
+
+    return datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%S").timestamp()
+
+
 class Server:
     """ Metadata about a server is bundled up into a Server class. """
 
+    __slots__ = (
+        "__id", "__name", "__region", "__language", "__players",
+        "__max_players", "__hostname", "__port", "__access_level",
+        "__status", "__last_updated"
+    )
+
+    # Where each attribute is read from in the raw API data.
+    schema = (
+        Field("id", "ID", -1),
+        Field("name", "Name", "", convert=_strip_areacode, intern=True),
+        Field("region", "Region", "NA", convert=str.upper, intern=True),
+        Field("language", "Language", "en", intern=True),
+        Field("players", "UserCount", 0, computed=True),
+        Field("max_players", "MaxUsers", 0),
+        Field("hostname", "HostName", intern=True, kind=str),
+        Field("port", "Port", 0),
+        Field("access_level", "AccessLevel", 0),
+        Field("status", "Status", ServerStatus.OFFLINE,
+              convert=_statuscode_to_status, computed=True),
+        Field("last_updated", "LastUpdated", "", convert=_parse_timestamp, kind=float)
+    )
+
     maintenance_buffer = 10
 
     def __init__(self, **data):
@@ -72,12 +139,7 @@ class Server:
         if not isinstance(name, str) or not name.strip():
             raise ValueError("None/invalid name was provided for the server.")
 
-        # Some server names have the regions areacode attached to the name,
-        # this will filter them so only the name itself is used.
-        if "[" in name:
-            name = name.split("[")[0].strip()
-
-        self.__name = name
+        self.__name = _strip_areacode(name)
 
     @property
     def region(self) -> str:
@@ -335,28 +397,26 @@ class Server:
         Factory method to return a Server object based on raw json
         structured as if it were from the official AQ3D API endpoint.
 
+        Data from the API is trusted, so the property setters
+        are skipped when building the server, see `Server.schema`.
+
         :param raw: Expects raw json based on the structure of the servers AQ3D API.
         :return Server: Returns a Server object based on the raw json data.
+        """
+
+        return get_decoder(cls).decode(raw)
+
+    @classmethod
+    def create_many(cls, raws: list) -> list:
+        """
+        Factory method to create a Server object for each record of
+        raw json data from the official AQ3D API, decoded in one batch.
 
+        :param raws: The originally structured json records from the API.
+        :return: Returns a list of new Server instances.
         """
 
-        return cls(
-            id = raw.get("ID", -1),
-            name = raw.get("Name", ""),
-            region = raw.get("Region", "NA"),
-            language = raw.get("Language", "en"),
-            players = raw.get("UserCount", 0),
-            max_players = raw.get("MaxUsers", 0),
-            hostname = raw.get("HostName"),
-            port = raw.get("Port", 0),
-            access_level = raw.get("AccessLevel", 0),
-            status = _statuscode_to_status(
-                raw.get("Status", ServerStatus.OFFLINE)
-            ),
-            last_updated = datetime.strptime(
-                raw.get("LastUpdated", ""), "%Y-%m-%dT%H:%M:%S"
-            ).timestamp()
-        )
+        return get_decoder(cls).decode_many(raws)
 
     def to_dict(self) -> dict:
         """
@@ -372,16 +432,3 @@ class Server:
         players = f"{self.players}/{self.max_players}"
 
         return f"({self.id}) {self.name} ({online_status}) -> {players}"
-
-def _statuscode_to_status(statuscode: int) -> ServerStatus:
-    """
-    Returns the ServerStatus representation of an integer status code.
-
-    :param statuscode: An integer of the status code, 0 or 1.
-    :return: Returns a ServerStatus representation of the status code.
-    """
-
-    if statuscode == 0:
-        return ServerStatus.OFFLINE
-
-    return ServerStatus.ONLINE
@@ -0,0 +1,315 @@
+"""
+This module contains the SnapshotFrame class, which summarizes server
+snapshot history with vectorized numpy operations.
+
+numpy is an optional dependency, it's only imported once a frame is created.
+"""
+
+from collections.abc import Iterable
+
+from aq3d_api import utils
+from aq3d_api.servers.server import Server
+
+# The groups samples can be aggregated by.
+GROUPS = ("server", "region", "language", "all")
+
+# The aggregations of the samples of a server within a bucket.
+AGGREGATIONS = ("mean", "max", "min", "sum", "last")
+
+
+def _numpy():
+    """
+    Imports numpy.
+
+    :return: Returns the numpy module.
+    """
+
+    try:
+        import numpy
+    except ImportError as ex:
+        raise ImportError(
+            "Snapshot analytics require numpy, install it with `pip install numpy`."
+        ) from ex
+
+    return numpy
+
+
+class SnapshotFrame:
+    """
+    A columnar table of player count samples, sorted by server and time.
+
+    Frames are created from a HistoryStore, which only copies its arrays,
+    or from ServerSnapshot objects. Samples can be grouped by server,
+    region, language or all together (`all`), where the group population
+    is the sum of the players of its servers.
+    """
+
+    def __init__(self, timestamps, server_ids, players, servers: dict | None = None):
+        """
+        :param timestamps: The timestamps of the samples.
+        :param server_ids: The server id of each sample.
+        :param players: The player count of each sample.
+        :param servers: The Server objects by id, used to group by region and language.
+        """
+
+        np = _numpy()
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        server_ids = np.asarray(server_ids, dtype=np.int64)
+        players = np.asarray(players, dtype=np.int64)
+
+        if not len(timestamps) == len(server_ids) == len(players):
+            raise ValueError("Expected the same amount of timestamps, server ids and players.")
+
+        # Histories are already in order, so they're only sorted when needed.
+        same = server_ids[1:] == server_ids[:-1]
+        if not np.all((server_ids[1:] > server_ids[:-1]) | (same & (timestamps[1:] >= timestamps[:-1]))):
+            order = np.lexsort((timestamps, server_ids))
+            timestamps, server_ids, players = timestamps[order], server_ids[order], players[order]
+
+        self.__np = np
+        self.__timestamps = timestamps
+        self.__server_ids = server_ids
+        self.__players = players
+        self.__servers = servers or {}
+
+    @classmethod
+    def from_history(cls, store, servers: Iterable[Server] = (), start: float | None = None,
+                     end: float | None = None):
+        """
+        Creates a frame from the samples of a HistoryStore.
+
+        :param store: The HistoryStore to read.
+        :param servers: The servers of the history, used to group by region and language.
+        :param start: The earliest timestamp to include.
+        :param end: The latest timestamp to include.
+        :return: Returns the new SnapshotFrame.
+        """
+
+        np = _numpy()
+        timestamps, server_ids, players = [], [], []
+        for history in store:
+            columns = history.between(start, end)
+            timestamps.append(np.frombuffer(columns["timestamp"], dtype=np.float64))
+            players.append(np.frombuffer(columns["players"], dtype=np.int32))
+            server_ids.append(np.full(len(columns["timestamp"]), history.server_id, dtype=np.int64))
+
+        if not timestamps:
+            return cls((), (), (), {server.id: server for server in servers})
+
+        return cls(
+            np.concatenate(timestamps),
+            np.concatenate(server_ids),
+            np.concatenate(players),
+            {server.id: server for server in servers}
+        )
+
+    @classmethod
+    def from_snapshots(cls, snapshots: Iterable):
+        """
+        Creates a frame from ServerSnapshot objects.
+
+        :param snapshots: The snapshots to read.
+        :return: Returns the new SnapshotFrame.
+        """
+
+        timestamps, server_ids, players = [], [], []
+        servers = {}
+        for snapshot in snapshots:
+            # The server is rebuilt so the public player count is used.
+            server = utils.create_trusted(Server, **snapshot.server_data)
+            timestamps.append(snapshot.timestamp)
+            server_ids.append(server.id)
+            players.append(server.players)
+            servers[server.id] = server
+
+        return cls(timestamps, server_ids, players, servers)
+
+    def __len__(self) -> int:
+        return len(self.__timestamps)
+
+    def resample(self, interval: float, by: str = "server", agg: str = "mean") -> dict:
+        """
+        Aggregates the samples into fixed time buckets.
+
+        The samples of each server are first aggregated per bucket, for groups
+        other than `server` the bucket values of their servers are then summed.
+
+        :param interval: The length of each bucket in seconds.
+        :param by: The group, one of `GROUPS`.
+        :param agg: The aggregation of a server's samples in a bucket, one of `AGGREGATIONS`.
+        :return: Returns a dict of each group to a tuple of the bucket start
+        timestamps and their values, as numpy arrays.
+        """
+
+        np = self.__np
+        if interval <= 0:
+            raise ValueError("Expected an interval above 0 seconds.")
+
+        if agg not in AGGREGATIONS:
+            raise ValueError(f"Expected an aggregation of {', '.join(AGGREGATIONS)}.")
+
+        if not len(self):
+            return {}
+
+        buckets = np.floor(self.__timestamps / interval).astype(np.int64)
+        first_bucket = buckets.min()
+        buckets -= first_bucket
+        bucket_count = int(buckets.max()) + 1
+
+        # Samples are sorted by server and time, so each (server, bucket)
+        # pair is a contiguous run of samples.
+        keys = self.__server_ids * bucket_count + buckets
+        starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+        values = self.__reduce(self.__players, starts, agg)
+        run_servers = self.__server_ids[starts]
+        run_buckets = buckets[starts]
+
+        labels, codes = self.__group_codes(run_servers, by)
+        group_keys = codes * bucket_count + run_buckets
+        size = len(labels) * bucket_count
+        totals = np.bincount(group_keys, weights=values, minlength=size).reshape(len(labels), -1)
+        present = np.bincount(group_keys, minlength=size).reshape(len(labels), -1) > 0
+        bucket_starts = (np.arange(bucket_count) + first_bucket) * interval
+
+        return {
+            label: (bucket_starts[present[code]], totals[code][present[code]])
+            for code, label in enumerate(labels)
+        }
+
+    def rolling(self, interval: float, window: int, by: str = "server", agg: str = "mean") -> dict:
+        """
+        Returns the trailing rolling average of resampled buckets.
+
+        The window spans `window` buckets of time, buckets of a group without
+        samples are left out of its averages rather than shortening the window.
+
+        :param interval: The length of each bucket in seconds.
+        :param window: How many buckets each average covers.
+        :param by: The group, one of `GROUPS`.
+        :param agg: The aggregation of a server's samples in a bucket.
+        :return: Returns a dict of each group to a tuple of the bucket start
+        timestamps and their rolling averages.
+        """
+
+        np = self.__np
+        if window < 1:
+            raise ValueError("Expected a window of at least 1 bucket.")
+
+        rolled = {}
+        for label, (starts, values) in self.resample(interval, by, agg).items():
+            # Reindexed onto every bucket since the group's first, missing buckets as NaN.
+            positions = np.rint((starts - starts[0]) / interval).astype(np.int64)
+            dense = np.full(positions[-1] + 1, np.nan)
+            dense[positions] = values
+            rolled[label] = (starts, rolling_mean(dense, window)[positions])
+
+        return rolled
+
+    def peaks(self, interval: float = 86400, resolution: float = 600, by: str = "region") -> dict:
+        """
+        Returns the peak population of each group per interval, such as daily peaks.
+
+        :param interval: The length of each peak period in seconds, a day by default.
+        :param resolution: The length of the buckets the population is measured in.
+        :param by: The group, one of `GROUPS`.
+        :return: Returns a dict of each group to a tuple of the period start
+        timestamps and their peak populations.
+        """
+
+        np = self.__np
+        peaks = {}
+        for label, (starts, values) in self.resample(resolution, by).items():
+            periods = np.floor(starts / interval).astype(np.int64)
+            firsts = np.flatnonzero(np.concatenate(([True], periods[1:] != periods[:-1])))
+            peaks[label] = (periods[firsts] * interval, np.maximum.reduceat(values, firsts))
+
+        return peaks
+
+    def percentiles(self, q: Iterable[float] = (50, 90, 99), by: str = "server") -> dict:
+        """
+        Returns percentiles of the sampled player counts of each group.
+
+        :param q: The percentiles to compute, between 0 and 100.
+        :param by: The group, one of `GROUPS`.
+        :return: Returns a dict of each group to a dict of each percentile and its value.
+        """
+
+        np = self.__np
+        q = list(q)
+        if not len(self):
+            return {}
+
+        labels, codes = self.__group_codes(self.__server_ids, by)
+        # A stable sort of the small group codes keeps each group contiguous,
+        # the percentiles of each group are then found by partitioning.
+        order = np.argsort(codes, kind="stable")
+        players = self.__players[order]
+        bounds = np.searchsorted(codes[order], np.arange(len(labels) + 1))
+
+        results = {}
+        for code, label in enumerate(labels):
+            values = players[bounds[code]:bounds[code + 1]]
+            results[label] = dict(zip(q, np.percentile(values, q).tolist()))
+
+        return results
+
+    def __reduce(self, values, starts, agg: str):
+        np = self.__np
+        if agg == "max":
+            return np.maximum.reduceat(values, starts).astype(np.float64)
+        if agg == "min":
+            return np.minimum.reduceat(values, starts).astype(np.float64)
+        if agg == "last":
+            ends = np.append(starts[1:], len(values)) - 1
+            return values[ends].astype(np.float64)
+
+        sums = np.add.reduceat(values, starts).astype(np.float64)
+        if agg == "sum":
+            return sums
+
+        return sums / np.diff(np.append(starts, len(values)))
+
+    def __group_codes(self, server_ids, by: str) -> tuple[list, object]:
+        """
+        Returns the labels of the groups and the group code of each server id.
+        """
+
+        np = self.__np
+        if by not in GROUPS:
+            raise ValueError(f"Expected a group of {', '.join(GROUPS)}.")
+
+        if by == "all":
+            return ["all"], np.zeros(len(server_ids), dtype=np.int64)
+
+        unique_ids, inverse = np.unique(server_ids, return_inverse=True)
+        if by == "server":
+            return unique_ids.tolist(), inverse
+
+        server_labels = [
+            getattr(self.__servers.get(server_id), by, None) or ""
+            for server_id in unique_ids.tolist()
+        ]
+        labels = sorted(set(server_labels))
+        label_codes = np.array([labels.index(label) for label in server_labels], dtype=np.int64)
+        return labels, label_codes[inverse]
+
+
+def rolling_mean(values, window: int):
+    """
+    Returns the trailing rolling mean of an array, averaging over
+    fewer values at the start where the window isn't full yet.
+    NaN values are skipped, a window of only NaN values is NaN.
+
+    :param values: A 1-D array of values.
+    :param window: How many values each mean covers.
+    :return: Returns a numpy array of the rolling means.
+    """
+
+    np = _numpy()
+    values = np.asarray(values, dtype=np.float64)
+    present = ~np.isnan(values)
+    sums = np.cumsum(np.where(present, values, 0.0))
+    counts = np.cumsum(present)
+    sums[window:] = sums[window:] - sums[:-window]
+    counts[window:] = counts[window:] - counts[:-window]
+    return np.divide(sums, counts, out=np.full(len(values), np.nan), where=counts > 0)
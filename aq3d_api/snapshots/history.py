@@ -0,0 +1,238 @@
+""" This module contains the ServerHistory and HistoryStore classes. """
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from time import time
+
+from aq3d_api import utils
+from aq3d_api.enums.server_status import ServerStatus
+from aq3d_api.servers.server import Server
+
+# Converts the stored status codes back into ServerStatus members.
+_STATUSES = {status.value: status for status in ServerStatus}
+
+
+class ServerHistory:
+    """
+    A fixed-capacity ring buffer of the player count and status of a
+    single server over time.
+
+    Samples are kept in typed arrays instead of snapshot dicts, 13 bytes per
+    sample, and once the capacity is reached each append overwrites the
+    oldest sample.
+    """
+
+    def __init__(self, server_id: int, capacity: int):
+        """
+        :param server_id: The id of the server the history belongs to.
+        :param capacity: The most samples which are kept.
+        """
+
+        if capacity < 1:
+            raise ValueError("Expected a history capacity of at least 1.")
+
+        self.__server_id = server_id
+        self.__capacity = capacity
+        self.__timestamps = array("d")
+        self.__players = array("i")
+        self.__statuses = array("b")
+        # The physical index of the oldest sample once the buffer is full.
+        self.__start = 0
+
+    @property
+    def server_id(self) -> int:
+        """
+        Returns the id of the server the history belongs to.
+
+        :return: Returns the server id.
+        """
+
+        return self.__server_id
+
+    @property
+    def capacity(self) -> int:
+        """
+        Returns the most samples which are kept.
+
+        :return: Returns the capacity of the history.
+        """
+
+        return self.__capacity
+
+    @property
+    def latest(self) -> tuple[float, int, ServerStatus] | None:
+        """
+        Returns the most recent sample.
+
+        :return: Returns a tuple of the timestamp, players and status, or None.
+        """
+
+        if not self.__timestamps:
+            return None
+
+        index = (self.__start - 1) % len(self.__timestamps)
+        return (
+            self.__timestamps[index],
+            self.__players[index],
+            _STATUSES[self.__statuses[index]]
+        )
+
+    def append(self, timestamp: float, players: int, status: ServerStatus):
+        """
+        Appends a sample, overwriting the oldest sample once full.
+
+        :param timestamp: The timestamp of the sample, since epoch.
+        :param players: The amount of players online.
+        :param status: The status of the server.
+        """
+
+        if self.__timestamps and timestamp < self.__timestamp_at(len(self.__timestamps) - 1):
+            raise ValueError("Expected samples in chronological order.")
+
+        if len(self.__timestamps) < self.__capacity:
+            self.__timestamps.append(timestamp)
+            self.__players.append(players)
+            self.__statuses.append(status.value)
+            return
+
+        self.__timestamps[self.__start] = timestamp
+        self.__players[self.__start] = players
+        self.__statuses[self.__start] = status.value
+        self.__start = (self.__start + 1) % self.__capacity
+
+    def between(self, start: float | None = None, end: float | None = None) -> dict[str, array]:
+        """
+        Returns the samples within a time range as columns, oldest first.
+
+        Samples are found with a binary search over the timestamps,
+        so only the returned range is copied.
+
+        :param start: The earliest timestamp to include, from the oldest sample if None.
+        :param end: The latest timestamp to include, up to the newest sample if None.
+        :return: Returns a dict of the timestamp, players and status (as status codes) arrays.
+        """
+
+        size = len(self.__timestamps)
+        logical = range(size)
+        first = 0 if start is None else bisect_left(logical, start, key=self.__timestamp_at)
+        last = size if end is None else bisect_right(logical, end, key=self.__timestamp_at)
+
+        return {
+            "timestamp": self.__slice(self.__timestamps, first, last),
+            "players": self.__slice(self.__players, first, last),
+            "status": self.__slice(self.__statuses, first, last)
+        }
+
+    def __timestamp_at(self, index: int) -> float:
+        return self.__timestamps[(self.__start + index) % len(self.__timestamps)]
+
+    def __slice(self, column: array, first: int, last: int) -> array:
+        """
+        Copies the logical range of a column, which wraps around
+        the end of the buffer at most once.
+        """
+
+        if first >= last:
+            return array(column.typecode)
+
+        size = len(column)
+        first = (self.__start + first) % size
+        last = (self.__start + last - 1) % size + 1
+        if first < last:
+            return column[first:last]
+
+        return column[first:] + column[:last]
+
+    def __len__(self) -> int:
+        return len(self.__timestamps)
+
+
+class HistoryStore:
+    """
+    Keeps a ServerHistory for every server that is recorded.
+
+    Useful for population graphs, a week of samples every 10 seconds
+    takes under 1 MiB per server.
+    """
+
+    def __init__(self, capacity: int = 60480):
+        """
+        :param capacity: The most samples kept per server, a week of 10 second samples by default.
+        """
+
+        if capacity < 1:
+            raise ValueError("Expected a history capacity of at least 1.")
+
+        self.__capacity = capacity
+        self.__histories = {}
+
+    @property
+    def capacity(self) -> int:
+        """
+        Returns the most samples kept per server.
+
+        :return: Returns the capacity of each history.
+        """
+
+        return self.__capacity
+
+    def record(self, servers: Iterable[Server], timestamp: float | None = None):
+        """
+        Appends a sample of each server to its history.
+
+        :param servers: The servers to sample.
+        :param timestamp: The timestamp of the samples, the current time if None.
+        """
+
+        timestamp = time() if timestamp is None else timestamp
+        for server in servers:
+            self.__history(server.id).append(timestamp, server.players, server.status)
+
+    def record_snapshots(self, snapshots: Iterable):
+        """
+        Appends a sample of each server snapshot to the history of its server,
+        using the timestamp of the snapshot.
+
+        :param snapshots: The ServerSnapshot objects to record.
+        """
+
+        for snapshot in snapshots:
+            # The server is rebuilt so the public player count and
+            # status are recorded instead of the stored values.
+            server = utils.create_trusted(Server, **snapshot.server_data)
+            self.__history(server.id).append(snapshot.timestamp, server.players, server.status)
+
+    def between(self, start: float | None = None, end: float | None = None) -> dict[int, dict]:
+        """
+        Returns the samples of every server within a time range.
+
+        :param start: The earliest timestamp to include.
+        :param end: The latest timestamp to include.
+        :return: Returns a dict of server ids to their columns, see `ServerHistory.between`.
+        """
+
+        return {
+            server_id: history.between(start, end)
+            for server_id, history in self.__histories.items()
+        }
+
+    def __history(self, server_id: int) -> ServerHistory:
+        history = self.__histories.get(server_id)
+        if history is None:
+            history = ServerHistory(server_id, self.__capacity)
+            self.__histories[server_id] = history
+
+        return history
+
+    def __getitem__(self, server_id: int) -> ServerHistory:
+        return self.__histories[server_id]
+
+    def __contains__(self, server_id: int) -> bool:
+        return server_id in self.__histories
+
+    def __iter__(self):
+        return iter(self.__histories.values())
+
+    def __len__(self) -> int:
+        return len(self.__histories)
@@ -0,0 +1,123 @@
+""" This module contains the SnapshotLog class. """
+
+from collections.abc import Generator, Iterable
+from time import time
+
+from aq3d_api import utils
+from aq3d_api.snapshots.server import ServerSnapshot
+
+
+class SnapshotLog:
+    """
+    A delta encoded log of server snapshots.
+
+    The first capture of a server and every `keyframe_interval` captures
+    after it store all of its fields, every other capture only stores the
+    fields which changed since the previous capture, usually just the player
+    count. Full snapshots are rebuilt when they are read.
+    """
+
+    def __init__(self, keyframe_interval: int = 360):
+        """
+        :param keyframe_interval: How many captures of a server are stored between
+        full captures, which bounds how many captures are replayed to rebuild one.
+        """
+
+        if keyframe_interval < 1:
+            raise ValueError("Expected a keyframe interval of at least 1.")
+
+        self.__keyframe_interval = keyframe_interval
+        # Each server has a list of (timestamp, is keyframe, changed fields) entries.
+        self.__entries = {}
+        # The latest full fields of each server, to find the changes against.
+        self.__states = {}
+
+    @property
+    def keyframe_interval(self) -> int:
+        """
+        Returns how many captures are stored between full captures.
+
+        :return: Returns the keyframe interval.
+        """
+
+        return self.__keyframe_interval
+
+    @property
+    def server_ids(self) -> list[int]:
+        """
+        Returns the ids of every captured server.
+
+        :return: Returns a list of server ids.
+        """
+
+        return list(self.__entries)
+
+    def capture(self, servers: Iterable, timestamp: float | None = None):
+        """
+        Captures the current fields of each server.
+
+        :param servers: The Server objects to capture.
+        :param timestamp: The timestamp of the captures, the current time if None.
+        """
+
+        timestamp = time() if timestamp is None else timestamp
+        for server in servers:
+            self.__append(utils.attributes(server), timestamp)
+
+    def append(self, snapshot: ServerSnapshot):
+        """
+        Stores an already created snapshot.
+
+        :param snapshot: The ServerSnapshot to store.
+        """
+
+        self.__append(snapshot.server_data, snapshot.timestamp)
+
+    def snapshots(self, server_id: int) -> Generator[ServerSnapshot]:
+        """
+        Rebuilds every stored snapshot of a server, oldest first.
+
+        :param server_id: The id of the server.
+        :return: Returns a generator of the rebuilt ServerSnapshot objects.
+        """
+
+        state = {}
+        for timestamp, keyframe, fields in self.__entries.get(server_id, ()):
+            if keyframe:
+                state = dict(fields)
+            else:
+                state = {**state, **dict(fields)}
+
+            yield ServerSnapshot.restore(state, timestamp)
+
+    def latest(self, server_id: int) -> ServerSnapshot | None:
+        """
+        Rebuilds the latest snapshot of a server.
+
+        :param server_id: The id of the server.
+        :return: Returns the latest ServerSnapshot or None.
+        """
+
+        entries = self.__entries.get(server_id)
+        if not entries:
+            return None
+
+        return ServerSnapshot.restore(dict(self.__states[server_id]), entries[-1][0])
+
+    def __append(self, data: dict, timestamp: float):
+        server_id = data["id"]
+        entries = self.__entries.setdefault(server_id, [])
+        previous = self.__states.get(server_id)
+
+        if previous is None or len(entries) % self.__keyframe_interval == 0:
+            entries.append((timestamp, True, tuple(data.items())))
+        else:
+            entries.append((timestamp, False, tuple(
+                (key, value) for key, value in data.items()
+                if key not in previous or previous[key] != value
+            )))
+
+        self.__states[server_id] = dict(data)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self.__entries.values())
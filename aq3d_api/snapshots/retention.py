@@ -0,0 +1,151 @@
+""" This module contains the SnapshotRetention class. """
+
+import sqlite3
+from pathlib import Path
+from time import time
+
+from aq3d_api.snapshots.sinks import COLUMNS
+
+MINUTE = 60
+HOUR = 3600
+DAY = 86400
+
+
+class SnapshotRetention:
+    """
+    Applies tiered retention to the snapshots written by a SQLiteSink.
+
+    Snapshots are kept raw for `raw_for` seconds, then rolled up into
+    1 minute buckets which are kept for `minute_for` seconds, then rolled
+    up into 1 hour buckets which are kept forever. Each bucket stores the
+    amount of samples and the min, max and average player count of a server,
+    so older data takes a fixed amount of rows per server no matter how
+    often it was sampled.
+
+    Rollups are kept in the `<table>_1m` and `<table>_1h` tables.
+    """
+
+    def __init__(self,
+                 path: Path | str,
+                 table: str = "server_snapshots",
+                 raw_for: float = DAY,
+                 minute_for: float = 30 * DAY):
+        """
+        :param path: The path of the database file of the SQLiteSink.
+        :param table: The table of the raw snapshots.
+        :param raw_for: How many seconds raw snapshots are kept.
+        :param minute_for: How many seconds minute rollups are kept.
+        """
+
+        if raw_for < 0 or minute_for < raw_for:
+            raise ValueError("Expected raw snapshots to be kept no longer than minute rollups.")
+
+        # Waits on the sink writing to the same database instead of failing.
+        self.__connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.__table = table
+        self.__raw_for = raw_for
+        self.__minute_for = minute_for
+
+        with self.__connection:
+            self.__connection.execute(
+                f'CREATE TABLE IF NOT EXISTS "{table}" ({", ".join(COLUMNS)})'
+            )
+            for tier in ("1m", "1h"):
+                self.__connection.execute(
+                    f'CREATE TABLE IF NOT EXISTS "{table}_{tier}" ('
+                    f'id, timestamp, samples, players_min, players_max, players_avg, '
+                    f'PRIMARY KEY (id, timestamp))'
+                )
+
+    def compact(self, now: float | None = None) -> dict[str, int]:
+        """
+        Rolls up the snapshots older than their tier's retention and deletes them.
+        Only whole buckets are rolled up, in a single transaction.
+
+        :param now: The current timestamp, the current time if None.
+        :return: Returns a dict of how many raw and minute rows were rolled up.
+        """
+
+        now = time() if now is None else now
+        raw_cutoff = (now - self.__raw_for) // MINUTE * MINUTE
+        minute_cutoff = (now - self.__minute_for) // HOUR * HOUR
+
+        with self.__connection:
+            raw = self.__roll_up(
+                self.__table, f"{self.__table}_1m", MINUTE, raw_cutoff,
+                "COUNT(*), MIN(players), MAX(players), AVG(players)"
+            )
+            minutes = self.__roll_up(
+                f"{self.__table}_1m", f"{self.__table}_1h", HOUR, minute_cutoff,
+                "SUM(samples), MIN(players_min), MAX(players_max), "
+                "SUM(players_avg * samples) / SUM(samples)"
+            )
+
+        return {"raw": raw, "minutes": minutes}
+
+    def series(self, server_id: int, start: float | None = None,
+               end: float | None = None) -> list[tuple]:
+        """
+        Returns the player counts of a server over time, reading each tier
+        for the time range it covers. Raw snapshots are returned as buckets
+        of one sample.
+
+        :param server_id: The id of the server.
+        :param start: The earliest timestamp to include.
+        :param end: The latest timestamp to include.
+        :return: Returns a list of (timestamp, samples, min, max, avg) tuples, oldest first.
+        """
+
+        start = float("-inf") if start is None else start
+        end = float("inf") if end is None else end
+        return self.__connection.execute(
+            f'SELECT timestamp, samples, players_min, players_max, players_avg '
+            f'FROM "{self.__table}_1h" WHERE id = ?1 AND timestamp BETWEEN ?2 AND ?3 '
+            f'UNION ALL '
+            f'SELECT timestamp, samples, players_min, players_max, players_avg '
+            f'FROM "{self.__table}_1m" WHERE id = ?1 AND timestamp BETWEEN ?2 AND ?3 '
+            f'UNION ALL '
+            f'SELECT timestamp, 1, players, players, players '
+            f'FROM "{self.__table}" WHERE id = ?1 AND timestamp BETWEEN ?2 AND ?3 '
+            f'ORDER BY timestamp',
+            (server_id, start, end)
+        ).fetchall()
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+
+        self.__connection.close()
+
+    def __roll_up(self, source: str, target: str, interval: int, cutoff: float,
+                  aggregates: str) -> int:
+        """
+        Merges the rows of the source table before the cutoff into the buckets
+        of the target table, then deletes them.
+        """
+
+        # Buckets which already exist, such as from snapshots written late,
+        # are merged with the new rollup by weighting their averages.
+        self.__connection.execute(
+            f'INSERT INTO "{target}" '
+            f'SELECT id, CAST(timestamp / {interval} AS INTEGER) * {interval} AS bucket, '
+            f'{aggregates} FROM "{source}" WHERE timestamp < ? GROUP BY id, bucket '
+            f'ON CONFLICT (id, timestamp) DO UPDATE SET '
+            f'players_avg = (players_avg * samples + excluded.players_avg * excluded.samples) '
+            f'/ (samples + excluded.samples), '
+            f'samples = samples + excluded.samples, '
+            f'players_min = MIN(players_min, excluded.players_min), '
+            f'players_max = MAX(players_max, excluded.players_max)',
+            (cutoff,)
+        )
+
+        return self.__connection.execute(
+            f'DELETE FROM "{source}" WHERE timestamp < ?', (cutoff,)
+        ).rowcount
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,419 @@
+""" This module contains the snapshot sinks and the SnapshotPipeline class. """
+
+import csv
+import json
+import sqlite3
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Iterable
+from enum import Enum
+from pathlib import Path
+from threading import Condition, Thread
+from time import monotonic
+
+from requests import post
+
+from aq3d_api import utils
+from aq3d_api.servers.server import Server
+from aq3d_api.snapshots.server import ServerSnapshot
+
+# The columns of a snapshot record, the timestamp followed by the server fields.
+COLUMNS = ("timestamp", *(field.name for field in Server.schema))
+
+DROP_OLDEST = "drop-oldest"
+DROP_NEWEST = "drop-newest"
+BLOCK = "block"
+
+
+def snapshot_record(snapshot: ServerSnapshot) -> dict:
+    """
+    Converts a snapshot into a flat, JSON friendly record.
+
+    :param snapshot: The ServerSnapshot to convert.
+    :return: Returns a dict of the timestamp and server fields, Enum members by name.
+    """
+
+    # The server is rebuilt so the public player count and status are
+    # written, the same values as SnapshotHistory and SnapshotFrame use.
+    server = utils.create_trusted(Server, **snapshot.server_data)
+    record = {"timestamp": snapshot.timestamp}
+    for name in COLUMNS[1:]:
+        value = getattr(server, name)
+        record[name] = value.name if isinstance(value, Enum) else value
+
+    return record
+
+
+class SnapshotSink(ABC):
+    """
+    The snapshot sink class is an abstract interface for writing
+    batches of snapshots to an external store.
+    """
+
+    @abstractmethod
+    def write(self, snapshots: list[ServerSnapshot]):
+        """
+        Writes a batch of snapshots.
+
+        :param snapshots: The snapshots to write, oldest first.
+        """
+
+        pass
+
+    def close(self):
+        """
+        Releases any resources of the sink.
+        """
+
+        pass
+
+
+class CSVSink(SnapshotSink):
+    """ Appends snapshots to a CSV file, writing the header to new files. """
+
+    def __init__(self, path: Path):
+        """
+        :param path: The path of the CSV file.
+        """
+
+        if not isinstance(path, Path):
+            raise ValueError("Expected a path to save snapshots to a csv file.")
+
+        self.__path = path
+
+    def write(self, snapshots: list[ServerSnapshot]):
+        new = not self.__path.exists() or not self.__path.stat().st_size
+        with open(self.__path, "a", newline="") as file:
+            writer = csv.writer(file)
+            if new:
+                writer.writerow(COLUMNS)
+
+            writer.writerows(
+                snapshot_record(snapshot).values() for snapshot in snapshots
+            )
+
+
+class JSONLSink(SnapshotSink):
+    """ Appends snapshots to a JSON Lines file, one record per line. """
+
+    def __init__(self, path: Path):
+        """
+        :param path: The path of the JSON Lines file.
+        """
+
+        if not isinstance(path, Path):
+            raise ValueError("Expected a path to save snapshots to a json lines file.")
+
+        self.__path = path
+
+    def write(self, snapshots: list[ServerSnapshot]):
+        with open(self.__path, "a") as file:
+            file.writelines(
+                json.dumps(snapshot_record(snapshot), separators=(",", ":")) + "\n"
+                for snapshot in snapshots
+            )
+
+
+class SQLiteSink(SnapshotSink):
+    """ Inserts snapshots into a SQLite table, indexed by server and time. """
+
+    def __init__(self, path: Path | str, table: str = "server_snapshots"):
+        """
+        :param path: The path of the database file.
+        :param table: The name of the table to insert into.
+        """
+
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__insert = (
+            f'INSERT INTO "{table}" ({", ".join(COLUMNS)}) '
+            f'VALUES ({", ".join("?" for _ in COLUMNS)})'
+        )
+
+        with self.__connection:
+            self.__connection.execute(
+                f'CREATE TABLE IF NOT EXISTS "{table}" ({", ".join(COLUMNS)})'
+            )
+            self.__connection.execute(
+                f'CREATE INDEX IF NOT EXISTS "{table}_id_timestamp" ON "{table}" (id, timestamp)'
+            )
+
+    def write(self, snapshots: list[ServerSnapshot]):
+        with self.__connection:
+            self.__connection.executemany(
+                self.__insert,
+                (tuple(snapshot_record(snapshot).values()) for snapshot in snapshots)
+            )
+
+    def close(self):
+        self.__connection.close()
+
+
+class HTTPSink(SnapshotSink):
+    """ Posts each batch of snapshots as a JSON list to an HTTP endpoint. """
+
+    def __init__(self, url: str, timeout: float = 10.0, headers: dict | None = None):
+        """
+        :param url: The URL of the endpoint.
+        :param timeout: The most seconds to wait on the endpoint.
+        :param headers: Any headers to send with each request.
+        """
+
+        self.__url = url
+        self.__timeout = timeout
+        self.__headers = headers or {}
+
+    def write(self, snapshots: list[ServerSnapshot]):
+        response = post(
+            self.__url,
+            json=[snapshot_record(snapshot) for snapshot in snapshots],
+            headers=self.__headers,
+            timeout=self.__timeout
+        )
+        response.raise_for_status()
+
+
+class SnapshotPipeline:
+    """
+    Writes snapshots to sinks in the background, in batches.
+
+    Every sink has its own bounded queue and writer thread, so a slow sink
+    only holds back its own queue. Batches are written once `batch_size`
+    snapshots are queued or `flush_interval` seconds have passed. When a queue
+    is full the policy decides what happens to new snapshots:
+
+        - `drop-oldest`: The oldest queued snapshot is dropped.
+        - `drop-newest`: The new snapshot is dropped.
+        - `block`: Waits for room, up to `block_timeout` seconds, then drops it.
+
+    Failed writes are counted and their batch dropped, see `stats`.
+    """
+
+    def __init__(self,
+                 sinks: Iterable[SnapshotSink],
+                 batch_size: int = 500,
+                 flush_interval: float = 5.0,
+                 queue_size: int = 10000,
+                 policy: str = DROP_OLDEST,
+                 block_timeout: float | None = None):
+        """
+        :param sinks: The sinks to write to.
+        :param batch_size: The most snapshots written to a sink at once.
+        :param flush_interval: The most seconds a snapshot waits before being written.
+        :param queue_size: The most snapshots queued per sink.
+        :param policy: What happens to snapshots once a queue is full, see the class.
+        :param block_timeout: The most seconds the block policy waits, forever if None.
+        """
+
+        if policy not in (DROP_OLDEST, DROP_NEWEST, BLOCK):
+            raise ValueError("Expected a policy of drop-oldest, drop-newest or block.")
+
+        if batch_size < 1 or queue_size < 1:
+            raise ValueError("Expected a batch and queue size of at least 1.")
+
+        self.__workers = [
+            _SinkWorker(sink, batch_size, flush_interval, queue_size, policy, block_timeout)
+            for sink in sinks
+        ]
+
+        if not self.__workers:
+            raise ValueError("Expected at least one sink to write to.")
+
+    @property
+    def stats(self) -> list[dict]:
+        """
+        Returns the counters of each sink.
+
+        :return: Returns a list of dicts of the written, dropped, failed and queued
+        snapshot counts and the last error of each sink.
+        """
+
+        return [worker.stats for worker in self.__workers]
+
+    def put(self, snapshot: ServerSnapshot) -> bool:
+        """
+        Queues a snapshot for every sink, never blocking unless
+        the block policy is used.
+
+        :param snapshot: The snapshot to write.
+        :return: Returns if every sink queued the snapshot without dropping any.
+        """
+
+        accepted = True
+        for worker in self.__workers:
+            accepted &= worker.put(snapshot)
+
+        return accepted
+
+    def put_many(self, snapshots: Iterable[ServerSnapshot]) -> int:
+        """
+        Queues several snapshots, see `put`.
+
+        :param snapshots: The snapshots to write.
+        :return: Returns how many snapshots were queued without dropping any.
+        """
+
+        return sum(self.put(snapshot) for snapshot in snapshots)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Writes every queued snapshot and waits until they are written.
+
+        :param timeout: The most seconds to wait per sink, forever if None.
+        :return: Returns if every queue was emptied.
+        """
+
+        return all([worker.flush(timeout) for worker in self.__workers])
+
+    def close(self, timeout: float | None = None) -> bool:
+        """
+        Writes the remaining snapshots, stops the writer threads and closes the sinks.
+
+        A sink still writing after the timeout isn't closed under its writer,
+        the writer closes it once done and the timeout is reported in `stats`.
+
+        :param timeout: The most seconds to wait per sink, forever if None.
+        :return: Returns if every sink was closed.
+        """
+
+        return all([worker.close(timeout) for worker in self.__workers])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _SinkWorker:
+    """ The bounded queue and writer thread of a single sink. """
+
+    def __init__(self,
+                 sink: SnapshotSink,
+                 batch_size: int,
+                 flush_interval: float,
+                 queue_size: int,
+                 policy: str,
+                 block_timeout: float | None):
+        self.__sink = sink
+        self.__batch_size = batch_size
+        self.__flush_interval = flush_interval
+        self.__queue_size = queue_size
+        self.__policy = policy
+        self.__block_timeout = block_timeout
+        self.__queue = deque()
+        self.__condition = Condition()
+        self.__writing = 0
+        self.__flushing = False
+        self.__closing = False
+        self.__finished = False
+        # Set once close gave up waiting, so the writer closes the sink.
+        self.__abandoned = False
+        self.__stats = {"written": 0, "dropped": 0, "failed": 0, "last_error": None}
+        self.__thread = Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    @property
+    def stats(self) -> dict:
+        with self.__condition:
+            return {**self.__stats, "queued": len(self.__queue)}
+
+    def put(self, snapshot: ServerSnapshot) -> bool:
+        with self.__condition:
+            if self.__closing:
+                raise ValueError("Can't write snapshots to a closed pipeline.")
+
+            accepted = True
+            if len(self.__queue) >= self.__queue_size:
+                if self.__policy == DROP_NEWEST:
+                    self.__stats["dropped"] += 1
+                    return False
+
+                if self.__policy == DROP_OLDEST:
+                    self.__queue.popleft()
+                    self.__stats["dropped"] += 1
+                    accepted = False
+                elif not self.__condition.wait_for(
+                        lambda: len(self.__queue) < self.__queue_size, self.__block_timeout):
+                    self.__stats["dropped"] += 1
+                    return False
+
+            self.__queue.append(snapshot)
+            if len(self.__queue) >= self.__batch_size:
+                self.__condition.notify_all()
+
+            return accepted
+
+    def flush(self, timeout: float | None) -> bool:
+        with self.__condition:
+            self.__flushing = True
+            self.__condition.notify_all()
+            emptied = self.__condition.wait_for(
+                lambda: not self.__queue and not self.__writing, timeout
+            )
+            self.__flushing = False
+            return emptied
+
+    def close(self, timeout: float | None) -> bool:
+        with self.__condition:
+            self.__closing = True
+            self.__condition.notify_all()
+
+        self.__thread.join(timeout)
+        with self.__condition:
+            if not self.__finished:
+                self.__abandoned = True
+                self.__stats["last_error"] = (
+                    f"Timed out after {timeout}s closing, {len(self.__queue)} snapshots queued."
+                )
+                return False
+
+        self.__sink.close()
+        return True
+
+    def __run(self):
+        abandoned = False
+        while True:
+            with self.__condition:
+                deadline = monotonic() + self.__flush_interval
+                while (len(self.__queue) < self.__batch_size and not self.__closing
+                       and not (self.__flushing and self.__queue)):
+                    remaining = deadline - monotonic()
+                    if remaining <= 0:
+                        break
+
+                    self.__condition.wait(remaining)
+
+                if not self.__queue and self.__closing:
+                    self.__finished = True
+                    abandoned = self.__abandoned
+                    break
+
+                count = min(len(self.__queue), self.__batch_size)
+                batch = [self.__queue.popleft() for _ in range(count)]
+                self.__writing = count
+                # Frees room for producers blocked by the block policy.
+                self.__condition.notify_all()
+
+            if batch:
+                try:
+                    self.__sink.write(batch)
+                    failed = None
+                except Exception as ex:
+                    failed = ex
+
+            with self.__condition:
+                if batch and failed is None:
+                    self.__stats["written"] += count
+                elif batch:
+                    self.__stats["failed"] += count
+                    self.__stats["last_error"] = repr(failed)
+
+                self.__writing = 0
+                self.__condition.notify_all()
+
+        if abandoned:
+            try:
+                self.__sink.close()
+            except Exception as ex:
+                with self.__condition:
+                    self.__stats["last_error"] = repr(ex)
@@ -3,6 +3,8 @@
 from time import time
 from abc import ABC
 
+from aq3d_api import utils
+
 class Snapshot(ABC):
     """
     The snapshot class is an abstract interface for capturing
@@ -14,12 +16,25 @@ class Snapshot(ABC):
         :param obj: The object which should be captured as a snapshot.
         """
 
-        self.__dict = {
-            key.split("__")[-1]: value
-            for key, value in tuple(obj.__dict__.items())
-        }
+        self.__dict = utils.attributes(obj)
         self.__timestamp = time()
 
+    @classmethod
+    def restore(cls, data: dict, timestamp: float):
+        """
+        Rebuilds a snapshot from previously captured data, such as
+        data stored by a SnapshotLog.
+
+        :param data: The dict of the snapshotted object.
+        :param timestamp: The timestamp of when the snapshot was created.
+        :return: Returns the rebuilt snapshot.
+        """
+
+        snapshot = cls.__new__(cls)
+        snapshot.__dict = data
+        snapshot.__timestamp = timestamp
+        return snapshot
+
     @property
     def _dict(self):
         """
@@ -0,0 +1,405 @@
+"""
+This module defines the Catalog class, a read-only sequence of models backed
+by a memory-mapped binary file, along with `write_catalog` which writes them.
+
+### Format (version 1, little endian):
+    - A header of the magic, version, field count, record count, record size,
+      string count and the offsets of the records and of the string table.
+    - The model class name followed by the name and type code of each field.
+    - Fixed-width records, with integers, floats, booleans and Enum members
+      (by their position in the Enum) stored inline and strings as indexes
+      into the string table.
+    - The string table, the end offset of each string followed by their
+      UTF-8 bytes. Equal strings are only stored once.
+"""
+
+import json
+import math
+import mmap
+import struct
+from collections.abc import Callable, Generator, Iterable, Sequence
+from enum import Enum
+from itertools import chain
+from pathlib import Path
+
+from aq3d_api import utils
+from aq3d_api.containers.lazy import RecordView
+from aq3d_api.decoder import get_decoder
+
+MAGIC = b"AQ3D"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHIIIQQ")
+_NAME = struct.Struct("<H")
+_OFFSET = struct.Struct("<I")
+
+# The struct codes of the stored value types. Strings and nested models (as
+# JSON) are indexes into the string table.
+_INT, _FLOAT, _BOOL, _ENUM, _STR, _JSON = range(6)
+_CODES = {_INT: "q", _FLOAT: "d", _BOOL: "b", _ENUM: "h", _STR: "I", _JSON: "I"}
+
+# The stored values of None.
+_NULL_INT = -2 ** 63
+_NULL_INDEX = 2 ** 32 - 1
+
+
+class Catalog(Sequence):
+    """
+    A read-only sequence of the model objects stored in a catalog file.
+
+    The file is memory-mapped rather than read, so opening a catalog is near
+    instant and processes opening the same file share its pages. Values are
+    only decoded from the mapped records when they are accessed.
+    """
+
+    def __init__(self, path: Path, cls: type):
+        """
+        ### Parameters:
+            **path (Path)**: The path of a file written by `write_catalog`.
+            **cls (type)**: The model class the catalog was written from.
+
+        ### Raises:
+            **ValueError**: If the file isn't a catalog of the current version,
+            or it was written from another class or schema.
+        """
+
+        if not isinstance(path, Path):
+            raise ValueError("Expected a path to open a catalog file.")
+
+        with open(path, "rb") as file:
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            fields, string_count, strings = self.__read_header(path, cls)
+        except Exception:
+            # The map would otherwise stay open until collected.
+            self.__map.close()
+            raise
+
+        self.__cls = cls
+        self.__string_offsets = strings
+        self.__strings = strings + _OFFSET.size * (string_count + 1)
+        self.__record = struct.Struct("<" + "".join(_CODES[kind] for _, kind in fields))
+        self.__columns = {}
+        offset = 0
+        for position, (field, kind) in enumerate(fields):
+            code = struct.Struct("<" + _CODES[kind])
+            self.__columns[field.name] = (position, offset, code, _to_value(self, field, kind))
+            offset += code.size
+
+    @property
+    def cls(self) -> type:
+        """
+        Returns the model class of the catalog.
+
+        ### Returns:
+            **type**: The model class.
+        """
+
+        return self.__cls
+
+    def value(self, index: int, name: str):
+        """
+        Decodes a single attribute of a record.
+
+        ### Parameters:
+            **index (int)**: The index of the record.
+            **name (str)**: The attribute name of the model.
+
+        ### Returns:
+            **Any**: The value of the attribute.
+        """
+
+        if name not in self.__columns:
+            return getattr(self[index], name)
+
+        _, offset, code, to_value = self.__columns[name]
+        return to_value(code.unpack_from(self.__map, self.__record_offset(index) + offset)[0])
+
+    def views(self) -> list:
+        """
+        Returns a RecordView for each record, which can stand in for
+        the objects, decoding only the attributes which are read.
+
+        ### Returns:
+            **list[RecordView]**: A view of each record.
+        """
+
+        return [RecordView(self, index) for index in range(self.__count)]
+
+    def where(self, name: str, test: Callable) -> Generator:
+        """
+        Yields the objects whose attribute passes a test, only decoding
+        the attribute of each record and the objects which pass.
+
+        ### Parameters:
+            **name (str)**: The attribute name of the model.
+            **test (Callable)**: Returns true for the attribute values to keep.
+
+        ### Yields:
+            **Generator (obj)**: Each object whose attribute passes the test.
+        """
+
+        for index in range(self.__count):
+            if test(self.value(index, name)):
+                yield self[index]
+
+    def string(self, index: int) -> str | None:
+        """
+        Decodes a string of the string table.
+
+        ### Parameters:
+            **index (int)**: The index of the string.
+
+        ### Returns:
+            **str | None**: The string, or None for the null index.
+        """
+
+        if index == _NULL_INDEX:
+            return None
+
+        start, end = struct.unpack_from("<II", self.__map, self.__string_offsets + _OFFSET.size * index)
+        return str(self.__map[self.__strings + start:self.__strings + end], "utf-8")
+
+    def close(self):
+        """
+        Unmaps the catalog file.
+        """
+
+        self.__map.close()
+
+    def __read_header(self, path: Path, cls: type) -> tuple[list, int, int]:
+        """
+        Validates the header of the mapped file against the schema of `cls`,
+        returning its fields, string count and string table offset.
+        """
+
+        try:
+            (magic, version, field_count, self.__count, self.__size,
+             string_count, self.__records, strings) = _HEADER.unpack_from(self.__map)
+        except struct.error as ex:
+            raise ValueError(f"{path} is not a catalog file.") from ex
+
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a catalog file.")
+
+        if version != VERSION:
+            raise ValueError(f"{path} is a version {version} catalog, expected version {VERSION}.")
+
+        offset = _HEADER.size
+        name, offset = _read_name(self.__map, offset)
+        stored = []
+        for _ in range(field_count):
+            kind = self.__map[offset]
+            field_name, offset = _read_name(self.__map, offset + 1)
+            stored.append((field_name, kind))
+
+        fields = _fields(cls)
+        if name != cls.__name__ or stored != [(field.name, kind) for field, kind in fields]:
+            raise ValueError(f"{path} wasn't written from the current {cls.__name__} schema.")
+
+        return fields, string_count, strings
+
+    def __record_offset(self, index: int) -> int:
+        if index < 0:
+            index += self.__count
+
+        if not 0 <= index < self.__count:
+            raise IndexError("Catalog index out of range.")
+
+        return self.__records + index * self.__size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.__count))]
+
+        raws = self.__record.unpack_from(self.__map, self.__record_offset(index))
+        return utils.create_trusted(self.__cls, **{
+            name: to_value(raws[position])
+            for name, (position, _, _, to_value) in self.__columns.items()
+        })
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def __iter__(self) -> Generator:
+        return (self[index] for index in range(self.__count))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_catalog(objs: Iterable, path: Path, cls: type | None = None) -> int:
+    """
+    Writes model objects into a catalog file, streaming the records
+    so only the string table is held in memory.
+
+    ### Parameters:
+        **objs (Iterable)**: The objects to write, all of the same model class.
+        **path (Path)**: The path to write the catalog to.
+        **cls (type, optional)**: The model class, by default the class of the first object.
+
+    ### Returns:
+        **int**: The amount of written records.
+
+    ### Raises:
+        **ValueError**: If the path isn't a Path, there are no objects to infer
+        the class from or the class has no schema.
+    """
+
+    if not isinstance(path, Path):
+        raise ValueError("Expected a path to save to a catalog file.")
+
+    objs = iter(objs)
+    if cls is None:
+        first = next(objs, None)
+        if first is None:
+            raise ValueError("There were no objects to write to a catalog file.")
+
+        cls = first.__class__
+        objs = chain((first,), objs)
+
+    fields = _fields(cls)
+    record = struct.Struct("<" + "".join(_CODES[kind] for _, kind in fields))
+    slots = utils.slot_names(cls)
+    strings = {}
+    columns = [
+        (slots[field.name], field.default, _to_raw(field, kind, strings))
+        for field, kind in fields
+    ]
+
+    header = bytearray(_NAME.pack(len(cls.__name__.encode())) + cls.__name__.encode())
+    for field, kind in fields:
+        name = field.name.encode()
+        header += bytes((kind,)) + _NAME.pack(len(name)) + name
+
+    records_offset = _HEADER.size + len(header)
+    count = 0
+    with open(path, "wb") as file:
+        file.write(bytes(_HEADER.size))
+        file.write(header)
+        for obj in objs:
+            file.write(record.pack(*(
+                to_raw(getattr(obj, slot, default)) for slot, default, to_raw in columns
+            )))
+            count += 1
+
+        strings_offset = records_offset + count * record.size
+        encoded = [string.encode() for string in strings]
+        end = 0
+        file.write(_OFFSET.pack(0))
+        for string in encoded:
+            end += len(string)
+            file.write(_OFFSET.pack(end))
+
+        for string in encoded:
+            file.write(string)
+
+        file.seek(0)
+        file.write(_HEADER.pack(
+            MAGIC, VERSION, len(fields), count, record.size,
+            len(strings), records_offset, strings_offset
+        ))
+
+    return count
+
+
+def _read_name(data, offset: int) -> tuple[str, int]:
+    """
+    Reads a length prefixed name, returning it and the offset after it.
+    """
+
+    length = _NAME.unpack_from(data, offset)[0]
+    offset += _NAME.size
+    return str(data[offset:offset + length], "utf-8"), offset + length
+
+
+def _fields(cls: type) -> list[tuple]:
+    """
+    Returns each Field of a model class with the type code it's stored as.
+
+    ### Raises:
+        **ValueError**: If the class has no schema.
+    """
+
+    schema = getattr(cls, "schema", None)
+    if not schema:
+        raise ValueError(f"Can't store {cls.__name__} objects without a field schema.")
+
+    fields = []
+    for field in schema:
+        kind = field.kind or type(field.default)
+        if field.model:
+            code = _JSON
+        elif field.enum or isinstance(field.default, Enum):
+            code = _ENUM
+        elif kind is bool:
+            code = _BOOL
+        elif kind is int:
+            code = _INT
+        elif kind is float:
+            code = _FLOAT
+        else:
+            code = _STR
+
+        fields.append((field, code))
+
+    return fields
+
+
+def _enum_of(field) -> type[Enum]:
+    return field.enum or type(field.default)
+
+
+def _to_raw(field, kind: int, strings: dict) -> Callable:
+    """
+    Returns a function converting a value of a Field into the value it's
+    stored as, adding strings to the string table as it goes.
+    """
+
+    def string_index(value) -> int:
+        if value is None:
+            return _NULL_INDEX
+
+        return strings.setdefault(value, len(strings))
+
+    if kind == _INT:
+        return lambda value: _NULL_INT if value is None else value
+    if kind == _FLOAT:
+        return lambda value: math.nan if value is None else value
+    if kind == _BOOL:
+        return lambda value: -1 if value is None else int(value)
+    if kind == _ENUM:
+        positions = {member: position for position, member in enumerate(_enum_of(field))}
+        return lambda value: positions.get(value, -1)
+    if kind == _JSON:
+        return lambda value: string_index(json.dumps(
+            [utils.to_record(nested) for nested in value or ()],
+            cls=utils.EnumEncoder, separators=(",", ":")
+        ))
+
+    return string_index
+
+
+def _to_value(catalog: Catalog, field, kind: int) -> Callable:
+    """
+    Returns a function converting the stored value of a Field back.
+    """
+
+    if kind == _INT:
+        return lambda raw: None if raw == _NULL_INT else raw
+    if kind == _FLOAT:
+        return lambda raw: None if math.isnan(raw) else raw
+    if kind == _BOOL:
+        return lambda raw: None if raw == -1 else bool(raw)
+    if kind == _ENUM:
+        members = tuple(_enum_of(field))
+        return lambda raw: None if raw == -1 else members[raw]
+    if kind == _JSON:
+        decoder = get_decoder(field.model, record=True)
+        return lambda raw: tuple(decoder.decode_many(json.loads(catalog.string(raw) or "[]")))
+
+    return catalog.string
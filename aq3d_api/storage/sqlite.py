@@ -0,0 +1,657 @@
+"""
+This module defines the SQLiteStorage class, a persistent on-disk catalog of
+models which several processes can share, and StoredRecords, a sequence of
+the models in the catalog which are only loaded once accessed.
+"""
+
+import json
+import sqlite3
+from collections.abc import Generator, Iterable
+from contextlib import contextmanager, nullcontext
+from enum import Enum
+from itertools import islice
+from pathlib import Path
+from threading import RLock, local
+
+from aq3d_api import utils
+from aq3d_api.containers.lazy import RecordView
+from aq3d_api.decoder import get_decoder
+
+# The SQLite column types of the Python types stored by the models.
+_TYPES = {bool: "INTEGER", int: "INTEGER", float: "REAL", str: "TEXT"}
+
+
+class SQLiteStorage:
+    """
+    Stores models in a SQLite database, with a table per model class built
+    from its schema.
+
+    Enum attributes are stored by their member names and nested models, such
+    as dialog frames, as JSON. The columns named in `indexed` are indexed
+    whenever the model has them, along with the id as the primary key.
+
+    File databases open a connection per thread, so a refresh writing in a
+    background thread never shares a transaction with readers. In-memory
+    databases only exist within their connection, so its use is serialised
+    with a lock instead and reads are fetched at once.
+    """
+
+    indexed = ("type", "rarity", "level")
+
+    def __init__(self, path: Path | str = ":memory:", batch_size: int = 1000):
+        """
+        ### Parameters:
+            **path (Path | str, optional)**: The database file, an in-memory database by default.
+            **batch_size (int, optional)**: How many raw records are decoded and written at once.
+        """
+
+        if batch_size < 1:
+            raise ValueError("Expected a batch size of at least 1.")
+
+        self.__path = str(path)
+        self.__shared = self.__path == ":memory:"
+        self.__lock = RLock()
+        self.__local = local()
+        self.__connections = []
+        self.__batch_size = batch_size
+        self.__tables = {}
+        self.__connect()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """
+        Returns the connection to the database of the current thread.
+
+        ### Returns:
+            **sqlite3.Connection**: The database connection.
+        """
+
+        return self.__connect()
+
+    def upsert(self, cls: type, objs: Iterable) -> int:
+        """
+        Inserts the objects, replacing any stored objects with the same id,
+        within a single transaction.
+
+        ### Parameters:
+            **cls (type)**: The model class of the objects.
+            **objs (Iterable)**: The objects to store.
+
+        ### Returns:
+            **int**: The amount of stored objects.
+        """
+
+        table = self.__table(cls)
+        count = 0
+        objs = iter(objs)
+        with self.__use() as connection, connection:
+            while chunk := list(islice(objs, self.__batch_size)):
+                connection.executemany(table.upsert, map(table.to_row, chunk))
+                count += len(chunk)
+
+        return count
+
+    def upsert_raw(self, cls: type, raws: Iterable[dict]) -> int:
+        """
+        Decodes raw API records a batch at a time and upserts them within a
+        single transaction, so only a batch of objects is held in memory.
+
+        ### Parameters:
+            **cls (type)**: The model class to decode the records into.
+            **raws (Iterable[dict])**: The raw records, structured as from the official API.
+
+        ### Returns:
+            **int**: The amount of stored objects.
+        """
+
+        table = self.__table(cls)
+        decoder = get_decoder(cls)
+        count = 0
+        raws = iter(raws)
+        with self.__use() as connection, connection:
+            while chunk := list(islice(raws, self.__batch_size)):
+                objs = decoder.decode_many(chunk)
+                connection.executemany(table.upsert, map(table.to_row, objs))
+                count += len(objs)
+
+        return count
+
+    def sync_raw(self, cls: type, raws: Iterable[dict], id_range: tuple[int, int] | None = None) -> int:
+        """
+        Upserts raw API records like `upsert_raw`, and deletes the stored
+        objects of the class which aren't in the records, within the same
+        transaction. The stored objects then match a fresh fetch.
+
+        ### Parameters:
+            **cls (type)**: The model class to decode the records into.
+            **raws (Iterable[dict])**: The raw records, structured as from the official API.
+            **id_range (tuple[int, int], optional)**: Only deletes objects with ids within
+            this inclusive range, such as the range that was fetched. Deletes from every
+            id if None.
+
+        ### Returns:
+            **int**: The amount of stored objects.
+        """
+
+        table = self.__table(cls)
+        decoder = get_decoder(cls)
+        count = 0
+        raws = iter(raws)
+        with self.__use() as connection, connection:
+            connection.execute("CREATE TEMP TABLE IF NOT EXISTS synced_ids (id PRIMARY KEY)")
+            connection.execute("DELETE FROM temp.synced_ids")
+            while chunk := list(islice(raws, self.__batch_size)):
+                objs = decoder.decode_many(chunk)
+                connection.executemany(table.upsert, map(table.to_row, objs))
+                connection.executemany(
+                    "INSERT OR IGNORE INTO temp.synced_ids VALUES (?)", ((obj.id,) for obj in objs)
+                )
+                count += len(objs)
+
+            where = "id NOT IN (SELECT id FROM temp.synced_ids)"
+            params = []
+            if id_range is not None:
+                where += " AND id BETWEEN ? AND ?"
+                params = list(id_range)
+
+            connection.execute(f"DELETE FROM {table.name} WHERE {where}", params)
+            connection.execute("DELETE FROM temp.synced_ids")
+
+        return count
+
+    def select(self,
+               cls: type,
+               where: str = "",
+               params: Iterable = (),
+               order_by: str = "id",
+               limit: int = -1,
+               offset: int = 0) -> Generator:
+        """
+        Yields the stored objects matching an SQL condition, decoding
+        each row as it's read.
+
+        ### Parameters:
+            **cls (type)**: The model class of the objects.
+            **where (str, optional)**: An SQL condition over the attribute names,
+            such as `level >= ? AND rarity = ?`. Enum members are compared by name.
+            **params (Iterable, optional)**: The parameters of the condition.
+            **order_by (str, optional)**: The SQL ordering of the results.
+            **limit (int, optional)**: The most objects to return, -1 for no limit.
+            **offset (int, optional)**: How many matching objects to skip.
+
+        ### Yields:
+            **Generator (obj)**: Each matching object.
+        """
+
+        table = self.__table(cls)
+        sql = f"SELECT {table.columns} FROM {table.name}"
+        if where:
+            sql += f" WHERE {where}"
+
+        with self.__use() as connection:
+            cursor = connection.execute(
+                f"{sql} ORDER BY {order_by} LIMIT ? OFFSET ?",
+                [*(_to_sql(param) for param in params), limit, offset]
+            )
+            # The shared connection is read at once, so no write of
+            # another thread can happen while its rows are streamed.
+            rows = cursor.fetchall() if self.__shared else cursor
+
+        return (table.to_obj(row) for row in rows)
+
+    def find(self, cls: type, **values) -> Generator:
+        """
+        Yields the stored objects whose attributes equal the values,
+        using the column indexes where they exist.
+
+        ### Parameters:
+            **cls (type)**: The model class of the objects.
+            **values (Any)**: The attribute names and the values to match.
+
+        ### Yields:
+            **Generator (obj)**: Each matching object.
+
+        ### Raises:
+            **ValueError**: If an attribute isn't in the schema of the class.
+        """
+
+        where, params = self.__equals(cls, values)
+        return self.select(cls, where, params)
+
+    def get(self, cls: type, oid: int) -> object | None:
+        """
+        Returns the stored object with the id, if any.
+
+        ### Parameters:
+            **cls (type)**: The model class of the object.
+            **oid (int)**: The id of the object.
+
+        ### Returns:
+            **object | None**: The stored object or None.
+        """
+
+        return next(self.find(cls, id=oid), None)
+
+    def count(self, cls: type, where: str = "", params: Iterable = ()) -> int:
+        """
+        Returns the amount of stored objects matching an SQL condition.
+
+        ### Parameters:
+            **cls (type)**: The model class of the objects.
+            **where (str, optional)**: An SQL condition, see `select`.
+            **params (Iterable, optional)**: The parameters of the condition.
+
+        ### Returns:
+            **int**: The amount of matching objects.
+        """
+
+        table = self.__table(cls)
+        sql = f"SELECT COUNT(*) FROM {table.name}"
+        if where:
+            sql += f" WHERE {where}"
+
+        with self.__use() as connection:
+            return connection.execute(sql, [_to_sql(param) for param in params]).fetchone()[0]
+
+    def ids(self, cls: type) -> list:
+        """
+        Returns the ids of the stored objects of a class, in order.
+
+        ### Parameters:
+            **cls (type)**: The model class of the objects.
+
+        ### Returns:
+            **list**: The stored ids.
+        """
+
+        table = self.__table(cls)
+        with self.__use() as connection:
+            return [row[0] for row in connection.execute(f"SELECT id FROM {table.name} ORDER BY id")]
+
+    def column(self, cls: type, name: str) -> dict:
+        """
+        Returns an attribute of every stored object of a class, read from
+        its column without creating the objects.
+
+        ### Parameters:
+            **cls (type)**: The model class of the objects.
+            **name (str)**: The attribute name of the model.
+
+        ### Returns:
+            **dict**: The attribute values keyed by the id of their object.
+
+        ### Raises:
+            **ValueError**: If the attribute isn't in the schema of the class.
+        """
+
+        table = self.__table(cls)
+        if name not in table.fields:
+            raise ValueError(f"{cls.__name__} has no stored attribute {name}.")
+
+        with self.__use() as connection:
+            rows = connection.execute(f'SELECT id, "{name}" FROM {table.name}').fetchall()
+
+        return {oid: table.to_value(name, value) for oid, value in rows}
+
+    def records(self, cls: type) -> "StoredRecords":
+        """
+        Returns a sequence of the stored objects of a class.
+
+        ### Parameters:
+            **cls (type)**: The model class of the objects.
+
+        ### Returns:
+            **StoredRecords**: The sequence of stored objects.
+        """
+
+        self.__table(cls)
+        return StoredRecords(self, cls)
+
+    def close(self):
+        """
+        Closes every connection to the database.
+        """
+
+        with self.__lock:
+            for connection in self.__connections:
+                connection.close()
+
+            self.__connections = []
+            self.__local = local()
+
+    def __connect(self) -> sqlite3.Connection:
+        """
+        Returns the connection of the current thread, opening it if needed.
+        """
+
+        if self.__shared:
+            with self.__lock:
+                if not self.__connections:
+                    self.__connections.append(sqlite3.connect(":memory:", check_same_thread=False))
+
+                return self.__connections[0]
+
+        connection = getattr(self.__local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.__path, timeout=30, check_same_thread=False)
+            # Readers aren't blocked while another connection writes.
+            connection.execute("PRAGMA journal_mode=WAL")
+            with self.__lock:
+                self.__connections.append(connection)
+
+            self.__local.connection = connection
+
+        return connection
+
+    @contextmanager
+    def __use(self):
+        """
+        Yields the connection of the current thread, holding the lock
+        for the shared in-memory connection.
+        """
+
+        with self.__lock if self.__shared else nullcontext():
+            yield self.__connect()
+
+    def __equals(self, cls: type, values: dict) -> tuple[str, list]:
+        table = self.__table(cls)
+        for name in values:
+            if name not in table.fields:
+                raise ValueError(f"{cls.__name__} has no stored attribute {name!r}.")
+
+        where = " AND ".join(f'"{name}" IS ?' for name in values)
+        return where, list(values.values())
+
+    def __table(self, cls: type) -> "_Table":
+        with self.__lock:
+            table = self.__tables.get(cls)
+            if table is None:
+                table = _Table(cls)
+                with self.__use() as connection:
+                    table.create(connection, self.indexed)
+
+                self.__tables[cls] = table
+
+        return table
+
+
+class StoredRecords:
+    """
+    A sequence of the objects of a model class stored in a SQLiteStorage,
+    ordered by id. Objects are read from the database when accessed
+    rather than held in memory.
+
+    The ids are read once on the first positional access or `len`, so each
+    index is a primary key lookup. Containers create a new sequence on every
+    refresh; objects stored by other connections afterwards are only listed
+    once the sequence is recreated.
+    """
+
+    def __init__(self, storage: SQLiteStorage, cls: type):
+        """
+        ### Parameters:
+            **storage (SQLiteStorage)**: The storage holding the objects.
+            **cls (type)**: The model class of the objects.
+        """
+
+        self.__storage = storage
+        self.__cls = cls
+        self.__ids = None
+        self.__columns = {}
+        # The attributes which can be read from their column.
+        self.__stored = {field.name for field in cls.schema if not field.computed}
+
+    @property
+    def cls(self) -> type:
+        """
+        Returns the model class of the stored objects.
+
+        ### Returns:
+            **type**: The model class.
+        """
+
+        return self.__cls
+
+    @property
+    def storage(self) -> SQLiteStorage:
+        """
+        Returns the storage holding the objects.
+
+        ### Returns:
+            **SQLiteStorage**: The storage.
+        """
+
+        return self.__storage
+
+    def append(self, obj: object):
+        """
+        Stores an object, replacing any stored object with the same id.
+
+        ### Parameters:
+            **obj (object)**: The object to store.
+        """
+
+        self.__storage.upsert(self.__cls, (obj,))
+        self.__ids = None
+        self.__columns = {}
+
+    def value(self, index: int, name: str):
+        """
+        Returns an attribute of a stored object. The attribute is read for
+        every object at once, from its column, on first access.
+
+        ### Parameters:
+            **index (int)**: The index of the object.
+            **name (str)**: The attribute name of the model.
+
+        ### Returns:
+            **Any**: The value of the attribute.
+        """
+
+        oid = self.__stored_ids()[index]
+        if name == "id":
+            return oid
+
+        if name not in self.__stored:
+            return getattr(self.__get(oid), name)
+
+        column = self.__columns.get(name)
+        if column is None:
+            column = self.__columns[name] = self.__storage.column(self.__cls, name)
+
+        if oid not in column:
+            return getattr(self.__get(oid), name)
+
+        return column[oid]
+
+    def views(self) -> list:
+        """
+        Returns a RecordView for each stored object, which can stand in
+        for the objects without reading them (see `value`).
+
+        ### Returns:
+            **list[RecordView]**: A view of each object.
+        """
+
+        return [RecordView(self, index) for index in range(len(self))]
+
+    def find(self, **values) -> Generator:
+        """
+        Yields the objects whose attributes equal the values, see `SQLiteStorage.find`.
+        """
+
+        return self.__storage.find(self.__cls, **values)
+
+    def where(self, name: str, test) -> Generator:
+        """
+        Yields the objects whose attribute passes a test.
+
+        ### Parameters:
+            **name (str)**: The attribute name of the model.
+            **test (Callable)**: Returns true for the attribute values to keep.
+
+        ### Yields:
+            **Generator (obj)**: Each object whose attribute passes the test.
+        """
+
+        return (obj for obj in self if test(getattr(obj, name)))
+
+    def __getitem__(self, index):
+        ids = self.__stored_ids()
+        if isinstance(index, slice):
+            selected = ids[index]
+            if index.step not in (None, 1) or not selected:
+                return [self.__get(oid) for oid in selected]
+
+            # A contiguous slice is a single range query over the primary key.
+            return list(self.__storage.select(
+                self.__cls, "id BETWEEN ? AND ?", (selected[0], selected[-1])
+            ))
+
+        return self.__get(ids[index])
+
+    def __len__(self) -> int:
+        return len(self.__stored_ids())
+
+    def __get(self, oid):
+        obj = self.__storage.get(self.__cls, oid)
+        if obj is None:
+            raise IndexError("Stored record was deleted since the sequence was read.")
+
+        return obj
+
+    def __stored_ids(self) -> list:
+        if self.__ids is None:
+            self.__ids = self.__storage.ids(self.__cls)
+
+        return self.__ids
+
+    def __iter__(self) -> Generator:
+        return self.__storage.select(self.__cls)
+
+
+class _Table:
+    """
+    The table of a model class, and the conversions between its
+    objects and rows.
+    """
+
+    def __init__(self, cls: type):
+        schema = getattr(cls, "schema", None)
+        if not schema:
+            raise ValueError(f"Can't store {cls.__name__} objects without a field schema.")
+
+        self.cls = cls
+        self.name = f'"{cls.__name__.lower()}"'
+        self.fields = {field.name: field for field in schema}
+        self.columns = ", ".join(f'"{name}"' for name in self.fields)
+        self.upsert = (
+            f"INSERT INTO {self.name} ({self.columns}) "
+            f"VALUES ({', '.join('?' for _ in self.fields)}) "
+            "ON CONFLICT(id) DO UPDATE SET "
+            + ", ".join(f'"{name}" = excluded."{name}"' for name in self.fields if name != "id")
+        )
+        self.__decoder = get_decoder(cls, record=True)
+        self.__bools = [field.name for field in schema if _kind_of(field) is bool]
+        self.__nested = [field.name for field in schema if field.model]
+
+    def create(self, connection: sqlite3.Connection, indexed: tuple[str, ...]):
+        """
+        Creates the table and its indexes if they don't exist, adding any
+        columns missing from a table created by an older schema.
+        """
+
+        columns = [
+            f'"{name}" {_column_type(field)}' + (" PRIMARY KEY" if name == "id" else "")
+            for name, field in self.fields.items()
+        ]
+
+        if "id" not in self.fields:
+            raise ValueError(f"Can't store {self.cls.__name__} objects without an id.")
+
+        with connection:
+            connection.execute(f"CREATE TABLE IF NOT EXISTS {self.name} ({', '.join(columns)})")
+            existing = {row[1] for row in connection.execute(f"PRAGMA table_info({self.name})")}
+            for name, field in self.fields.items():
+                if name not in existing:
+                    connection.execute(
+                        f'ALTER TABLE {self.name} ADD COLUMN "{name}" {_column_type(field)}'
+                    )
+
+            for name in indexed:
+                if name in self.fields:
+                    connection.execute(
+                        f'CREATE INDEX IF NOT EXISTS "{self.name[1:-1]}_{name}" '
+                        f'ON {self.name} ("{name}")'
+                    )
+
+    def to_row(self, obj) -> tuple:
+        """
+        Converts an object into the values of its row.
+        """
+
+        record = utils.to_record(obj)
+        return tuple(_to_sql(record.get(name)) for name in self.fields)
+
+    def to_obj(self, row: tuple):
+        """
+        Decodes a row back into an object.
+        """
+
+        return self.__decoder.decode(self.__to_record(dict(zip(self.fields, row))))
+
+    def to_value(self, name: str, value):
+        """
+        Decodes the value of a single column back into its attribute.
+        """
+
+        return self.__decoder.getter(name)(self.__to_record({name: value}))
+
+    def __to_record(self, record: dict) -> dict:
+        """
+        Converts the values of a row into the values of an exported record.
+        """
+
+        for name in self.__bools:
+            if record.get(name) is not None:
+                record[name] = bool(record[name])
+
+        for name in self.__nested:
+            if name in record:
+                record[name] = json.loads(record[name]) if record[name] else []
+
+        return record
+
+
+def _kind_of(field) -> type:
+    """
+    Returns the Python type of a Field's stored values.
+    """
+
+    if field.model or field.enum or isinstance(field.default, Enum):
+        return str
+
+    return field.kind or type(field.default)
+
+
+def _column_type(field) -> str:
+    """
+    Returns the SQLite column type of a Field.
+    """
+
+    return _TYPES.get(_kind_of(field), "TEXT")
+
+
+def _to_sql(value):
+    """
+    Converts a value into one SQLite can store, Enum members become
+    their names and nested records JSON.
+    """
+
+    if isinstance(value, Enum):
+        return value.name
+
+    if isinstance(value, list):
+        return json.dumps(value, cls=utils.EnumEncoder, separators=(",", ":"))
+
+    return value
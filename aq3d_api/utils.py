@@ -4,14 +4,16 @@ modules in this package use.
 """
 import json
 import csv
+import gzip
 
+from collections.abc import Callable, Generator, Iterable
+from functools import cache
+from itertools import chain, islice
 from json import JSONDecodeError
+from operator import attrgetter
 from pathlib import Path
 from enum import Enum
 
-from aq3d_api.dialogs.actor import DialogActor
-from aq3d_api.dialogs.frame import DialogFrame
-
 
 class EnumEncoder(json.JSONEncoder):
     """
@@ -23,10 +25,8 @@ class EnumEncoder(json.JSONEncoder):
         if isinstance(o, Enum):
             return o.name
 
-        if isinstance(o, DialogFrame):
-            return o.to_dict()
-
-        if isinstance(o, DialogActor):
+        # Nested models such as dialog frames and actors.
+        if hasattr(o, "to_dict"):
             return o.to_dict()
 
         return None
@@ -43,7 +43,96 @@ def to_enum(enum, value, fallback = None):
     :return: Returns the matched Enum type or fallback if there is no match.
     """
 
-    return next((enum_value for enum_value in enum if enum_value.value == value), fallback)
+    try:
+        return _enum_values(enum).get(value, fallback)
+    except TypeError:
+        # Unhashable values can't be a value of the Enum.
+        return fallback
+
+
+@cache
+def _enum_values(enum) -> dict:
+    """
+    Maps the values of an Enum class to their members, so values
+    can be converted without scanning the whole Enum.
+
+    :param enum: The Enum class to map.
+    :return: A dict of the Enum values to their members.
+    """
+
+    return {enum_value.value: enum_value for enum_value in enum}
+
+
+@cache
+def slot_names(cls: type) -> dict:
+    """
+    Maps the attribute names of a slotted class to the (name mangled)
+    slot names they are stored under, in declaration order.
+
+    :param cls: The slotted class.
+    :return: A dict of attribute names to slot names.
+    """
+
+    names = {}
+    for klass in cls.__mro__:
+        slots = klass.__dict__.get("__slots__", ())
+        for slot in (slots,) if isinstance(slots, str) else slots:
+            if slot.endswith("__"):
+                continue
+
+            name = slot.lstrip("_")
+            if slot.startswith("__"):
+                slot = f"_{klass.__name__.lstrip('_')}{slot}"
+
+            names.setdefault(name, slot)
+
+    return names
+
+
+def attributes(obj) -> dict:
+    """
+    Returns all the attributes of an object, without their name mangling.
+    Works for both slotted objects and objects with a `__dict__`.
+
+    :param obj: The object to get the attributes of.
+    :return: A dict of attribute names to their values.
+    """
+
+    if hasattr(obj, "__dict__"):
+        return {
+            key.split("__")[-1]: value
+            for key, value in obj.__dict__.items()
+        }
+
+    values = {}
+    for name, slot in slot_names(type(obj)).items():
+        try:
+            values[name] = object.__getattribute__(obj, slot)
+        except AttributeError:
+            continue
+
+    return values
+
+
+def create_trusted(cls, **data):
+    """
+    Creates an instance of a slotted class directly from trusted data,
+    such as data from the API, skipping the validating property setters.
+
+    User built objects should go through the class constructor instead,
+    which validates every value.
+
+    :param cls: The slotted class to create an instance of.
+    :param data: The value of each attribute by its unmangled name.
+    :return: Returns the new instance of the class.
+    """
+
+    obj = cls.__new__(cls)
+    slots = slot_names(cls)
+    for name, value in data.items():
+        object.__setattr__(obj, slots[name], value)
+
+    return obj
 
 
 def to_dict(obj) -> dict:
@@ -56,23 +145,33 @@ def to_dict(obj) -> dict:
 
     # Filter any redundant keypair values from the object dict.
     filtered_dict = {
-        key.split("__")[-1]: value
-        for key, value in obj.__dict__.items() if value
+        key: value
+        for key, value in attributes(obj).items() if value
     }
 
     return filtered_dict
 
 
-def to_csv(objs: list, path: Path):
+def to_csv(objs: Iterable,
+           path: Path,
+           chunk_size: int = 1000,
+           compress: bool | None = None):
     """
-    Creates a csv file in the path supplied with all the objects
-    dict keys and values.
+    Streams objects into a csv file in the path supplied, writing the rows
+    in chunks so any iterable or generator is written in constant memory.
+
+    The columns are fixed by the schema of the first objects class, or
+    by the attributes of the first object for classes without a schema.
 
-    :param objs: A list of objects to save their dict values.
+    :param objs: An iterable of objects to save their attribute values.
     :param path: The path to write the csv data to.
+    :param chunk_size: How many rows are written at once.
+    :param compress: Gzip compresses the file, by default if the path ends in .gz.
     """
 
-    if not objs:
+    objs = iter(objs)
+    first = next(objs, None)
+    if first is None:
         raise ValueError(
             "There were no objects in the list to write to a csv file."
         )
@@ -80,14 +179,136 @@ def to_csv(objs: list, path: Path):
     if not isinstance(path, Path):
         raise ValueError("Expected a path to save to a csv file.")
 
-    with open(path, "w", newline="") as file:
-        writer = csv.writer(file)
+    if compress is None:
+        compress = path.suffix == ".gz"
+
+    keys, to_row = _csv_columns(first)
+    rows = map(to_row, chain((first,), objs))
 
-        keys = [key.split("__")[-1] for key in objs[0].__dict__.keys()]
+    with (gzip.open if compress else open)(path, "wt", newline="") as file:
+        writer = csv.writer(file)
         writer.writerow(keys)
 
-        rows = [list(obj.__dict__.values()) for obj in objs]
-        writer.writerows(rows)
+        while chunk := list(islice(rows, chunk_size)):
+            writer.writerows(chunk)
+
+
+def _csv_columns(obj) -> tuple[list, Callable]:
+    """
+    Returns the csv column names for objects like the one supplied, and
+    a function converting such an object into a row of those columns.
+
+    :param obj: The first object which will be written.
+    :return: The column names and the row function.
+    """
+
+    schema = getattr(obj.__class__, "schema", None)
+    if not schema:
+        keys = list(attributes(obj).keys())
+        return keys, lambda row_obj: [attributes(row_obj).get(key, "") for key in keys]
+
+    keys = [field.name for field in schema]
+    slots = slot_names(obj.__class__)
+    getter = attrgetter(*(slots[key] for key in keys))
+    # Tuples of nested models, such as dialog frames, are written as json.
+    nested = [index for index, field in enumerate(schema) if field.model]
+
+    def to_row(row_obj) -> list:
+        try:
+            values = getter(row_obj)
+            values = list(values) if len(keys) > 1 else [values]
+        except AttributeError:
+            # Objects with unset attributes or of another class.
+            values = [attributes(row_obj).get(key, "") for key in keys]
+
+        for index in nested:
+            values[index] = json.dumps(
+                [value.to_dict() for value in values[index] or ()], cls=EnumEncoder
+            )
+
+        return values
+
+    return keys, to_row
+
+
+def to_record(obj) -> dict:
+    """
+    Converts an object to a complete, flat record of its attributes,
+    which its class schema can decode back into an equal object.
+
+    Unlike `to_dict` no values are filtered, and nested models are
+    converted into lists of records.
+
+    :param obj: The object to convert to a record.
+    :return: The record of the object.
+    """
+
+    schema = getattr(obj.__class__, "schema", None)
+    if not schema:
+        return attributes(obj)
+
+    values = attributes(obj)
+    record = {}
+    for field in schema:
+        value = values.get(field.name, field.default)
+        if field.model:
+            value = [to_record(nested) for nested in value or ()]
+
+        record[field.name] = value
+
+    return record
+
+
+def to_jsonl(objs: Iterable, path: Path, compress: bool | None = None):
+    """
+    Streams objects into a JSON Lines file in the path supplied,
+    writing one record (see `to_record`) per line as it goes.
+
+    :param objs: An iterable of objects to save their records.
+    :param path: The path to write the json lines to.
+    :param compress: Gzip compresses the file, by default if the path ends in .gz.
+    """
+
+    if not isinstance(path, Path):
+        raise ValueError("Expected a path to save to a json lines file.")
+
+    if compress is None:
+        compress = path.suffix == ".gz"
+
+    encoder = EnumEncoder(separators=(",", ":"))
+    with (gzip.open if compress else open)(path, "wt") as file:
+        for obj in objs:
+            file.write(encoder.encode(to_record(obj)))
+            file.write("\n")
+
+
+def read_jsonl(path: Path) -> Generator[dict]:
+    """
+    Yields each record of a JSON Lines file. A gzip compressed file is
+    read if the path ends in .gz.
+
+    A truncated last line, such as from a file which is still being
+    written, is skipped.
+
+    :param path: The path to read the json lines from.
+    :return: A generator of the records in the file.
+    """
+
+    if not isinstance(path, Path):
+        raise ValueError("Expected a path to read a json lines file.")
+
+    with (gzip.open if path.suffix == ".gz" else open)(path, "rt") as file:
+        for line in file:
+            if not line.strip():
+                continue
+
+            try:
+                yield json.loads(line)
+            except JSONDecodeError:
+                if not line.endswith("\n"):
+                    return
+
+                raise
 
 
 def to_json_file(objs: list, path: Path):
@@ -110,7 +331,7 @@ def to_json_file(objs: list, path: Path):
     try:
         dict_objects = [
             obj.to_dict() if obj.__getattribute__("to_dict")
-                          else obj.__dict__ for obj in objs
+                          else attributes(obj) for obj in objs
         ]
 
         path.write_text(json.dumps(dict_objects, indent=4, cls=EnumEncoder))
@@ -0,0 +1,106 @@
+import sys
+sys.path.append(".")
+
+from datetime import datetime
+from time import perf_counter
+
+from aq3d_api import utils
+from aq3d_api.items.item import Item
+from aq3d_api.servers.server import Server
+from aq3d_api.enums.item_type import ItemType
+from aq3d_api.enums.item_equip_type import ItemEquipType
+from aq3d_api.enums.item_rarity import ItemRarity
+from aq3d_api.enums.server_status import ServerStatus
+
+COUNT = 100_000
+
+
+def raw_item(item_id: int) -> dict:
+    return {
+        "ID": item_id, "Name": f"Item {item_id}", "Level": 10,
+        "Desc": "An item used for benchmarking.", "Cost": 100,
+        "Type": item_id % 33, "EquipSlot": item_id % 19, "Rarity": item_id % 6,
+        "MaxStack": 1, "bundle": {"Version": 2}, "MaxHealth": 10, "Attack": 20,
+        "Armor": 30, "Evasion": 1, "Crit": 2, "IsCosmetic": False, "IsMC": False
+    }
+
+
+def raw_server(server_id: int) -> dict:
+    return {
+        "ID": server_id, "Name": f"Server {server_id} [NA]", "Region": "na",
+        "Language": "en", "UserCount": 100, "MaxUsers": 500,
+        "HostName": "na.aq3d.com", "Port": 5000, "AccessLevel": 0, "Status": 1,
+        "LastUpdated": "2024-01-31T12:00:00"
+    }
+
+
+def linear_enum(enum, value, fallback):
+    # How Enum values were converted before, scanning every member.
+    return next((member for member in enum if member.value == value), fallback)
+
+
+def legacy_item(raw: dict) -> Item:
+    # Field by field parsing as create_raw did before the compiled decoders.
+    return utils.create_trusted(
+        Item,
+        id=raw.get("ID", -1),
+        name=raw.get("Name", ""),
+        level=raw.get("Level", 1),
+        description=raw.get("Desc", ""),
+        price=raw.get("Cost", 0),
+        type=linear_enum(ItemType, raw.get("Type", 0), ItemType.ITEM),
+        equip_type=linear_enum(ItemEquipType, raw.get("EquipSlot", 0), ItemEquipType.NONE),
+        rarity=linear_enum(ItemRarity, raw.get("Rarity", 0), ItemRarity.JUNK),
+        stack_size=raw.get("MaxStack", 1),
+        version=raw.get("bundle")["Version"] if "bundle" in raw else 1,
+        cosmetic=raw.get("IsCosmetic", False),
+        dc_purchasable=raw.get("IsMC", False),
+        health=raw.get("MaxHealth", 0),
+        attack=raw.get("Attack", 0),
+        armor=raw.get("Armor", 0),
+        evasion=raw.get("Evasion", 0),
+        critical=raw.get("Crit", 0)
+    )
+
+
+def legacy_server(raw: dict) -> Server:
+    name = raw.get("Name", "")
+    return utils.create_trusted(
+        Server,
+        id=raw.get("ID", -1),
+        name=name.split("[")[0].strip() if "[" in name else name,
+        region=raw.get("Region", "NA").upper(),
+        language=raw.get("Language", "en"),
+        players=raw.get("UserCount", 0),
+        max_players=raw.get("MaxUsers", 0),
+        hostname=raw.get("HostName"),
+        port=raw.get("Port", 0),
+        access_level=raw.get("AccessLevel", 0),
+        status=ServerStatus.OFFLINE if raw.get("Status") == 0 else ServerStatus.ONLINE,
+        last_updated=datetime.strptime(
+            raw.get("LastUpdated", ""), "%Y-%m-%dT%H:%M:%S"
+        ).timestamp()
+    )
+
+
+def measure(name: str, decode, raws: list):
+    start = perf_counter()
+    objs = decode(raws)
+    elapsed = perf_counter() - start
+
+    print(f"{name:>16}: {len(objs) / elapsed:>12,.0f} records/s")
+
+
+if __name__ == "__main__":
+    items = [raw_item(item_id) for item_id in range(1, COUNT + 1)]
+    servers = [raw_server(server_id) for server_id in range(1, COUNT + 1)]
+
+    print("Items")
+    measure("before", lambda raws: [legacy_item(raw) for raw in raws], items)
+    measure("create_raw", lambda raws: [Item.create_raw(raw) for raw in raws], items)
+    measure("create_many", Item.create_many, items)
+
+    print("Servers")
+    measure("before", lambda raws: [legacy_server(raw) for raw in raws], servers)
+    measure("create_raw", lambda raws: [Server.create_raw(raw) for raw in raws], servers)
+    measure("create_many", Server.create_many, servers)
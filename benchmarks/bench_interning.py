@@ -0,0 +1,88 @@
+import sys
+sys.path.append(".")
+
+import json
+import random
+import tracemalloc
+
+from aq3d_api import utils
+from aq3d_api.api.handlers.dialog import get_dialogs
+from aq3d_api.dialogs.dialog import Dialog
+from aq3d_api.dialogs.frame import DialogFrame
+from aq3d_api.dialogs.actor import DialogActor
+
+DIALOGS = 20_000
+
+
+def synthetic_pages() -> list[str]:
+    # Dialogs reuse a small cast of speakers, titles and common lines,
+    # every page is kept as JSON text as if it just came from the API.
+    rng = random.Random(1)
+    speakers = [(f"Speaker {index}", f"The Title {index % 40}") for index in range(300)]
+    lines = [f"A commonly repeated line of dialog number {index}." for index in range(2_000)]
+
+    pages = []
+    for dialog_id in range(1, DIALOGS + 1):
+        frames = []
+        for _ in range(rng.randint(3, 12)):
+            speaker, title = rng.choice(speakers)
+            frames.append({
+                "DialogueName": speaker,
+                "DialogueTitle": title,
+                "DialogueText": rng.choice(lines)
+            })
+
+        pages.append(json.dumps({
+            "ID": dialog_id,
+            "FrameCollection": frames,
+            "Characters": [{"NPCID": rng.randint(1, 500)}]
+        }))
+
+    return pages
+
+
+def crawled_pages(max_index: int) -> list[str]:
+    return [json.dumps(raw) for raw in get_dialogs(1, max_index)]
+
+
+def legacy_dialog(raw: dict) -> Dialog:
+    # Every frame and actor decoded into its own objects, without interning.
+    return utils.create_trusted(
+        Dialog,
+        id=raw.get("ID", -1),
+        frames=tuple(
+            utils.create_trusted(
+                DialogFrame,
+                speaker=frame.get("DialogueName", ""),
+                title=frame.get("DialogueTitle", ""),
+                text=frame.get("DialogueText", "")
+            ) for frame in raw.get("FrameCollection", [])
+        ),
+        actors=tuple(
+            utils.create_trusted(DialogActor, npc_id=actor.get("NPCID", -1))
+            for actor in raw.get("Characters", []) if actor.get("NPCID")
+        )
+    )
+
+
+def measure(name: str, pages: list[str], decode):
+    # The raw records are dropped after decoding, only what the
+    # dialogs keep alive is counted.
+    tracemalloc.start()
+    raws = [json.loads(page) for page in pages]
+    dialogs = decode(raws)
+    del raws
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    frames = sum(len(dialog.frames) for dialog in dialogs)
+    print(f"{name:>10}: {len(dialogs):,} dialogs, {frames:,} frames, "
+          f"{memory / 1024 ** 2:.1f} MiB")
+
+
+if __name__ == "__main__":
+    # Pass a maximum dialog ID to measure a live crawl instead.
+    pages = crawled_pages(int(sys.argv[1])) if len(sys.argv) > 1 else synthetic_pages()
+
+    measure("before", pages, lambda raws: [legacy_dialog(raw) for raw in raws])
+    measure("interned", pages, Dialog.create_many)
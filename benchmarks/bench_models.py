@@ -0,0 +1,66 @@
+import sys
+sys.path.append(".")
+
+import tracemalloc
+from time import perf_counter
+
+from aq3d_api import utils
+from aq3d_api.items.item import Item
+from aq3d_api.enums.item_type import ItemType
+from aq3d_api.enums.item_equip_type import ItemEquipType
+from aq3d_api.enums.item_rarity import ItemRarity
+
+COUNT = 100_000
+
+
+def raw_item(item_id: int) -> dict:
+    # A record structured like the items from the official API.
+    return {
+        "ID": item_id, "Name": f"Item {item_id}", "Level": 10,
+        "Desc": "An item used for benchmarking.", "Cost": 100, "Type": 12,
+        "EquipSlot": 10, "Rarity": 3, "MaxStack": 1, "bundle": {"Version": 2},
+        "MaxHealth": 10, "Attack": 20, "Armor": 30, "Evasion": 1, "Crit": 2,
+        "IsCosmetic": False, "IsMC": False
+    }
+
+
+def item_data(item_id: int) -> dict:
+    # Already parsed item values, keyed by the attribute names.
+    return {
+        "id": item_id, "name": f"Item {item_id}", "level": 10,
+        "description": "An item used for benchmarking.", "price": 100,
+        "type": ItemType.SWORD, "equip_type": ItemEquipType.WEAPON,
+        "rarity": ItemRarity.RARE, "stack_size": 1, "version": 2,
+        "cosmetic": False, "dc_purchasable": False, "health": 10,
+        "attack": 20, "armor": 30, "evasion": 1, "critical": 2
+    }
+
+
+def strict_item(data: dict) -> Item:
+    # A user built item, validated by every property setter.
+    return Item(is_cosmetic=data["cosmetic"], **data)
+
+
+def measure(name: str, build):
+    start = perf_counter()
+    objs = build()
+    elapsed = perf_counter() - start
+    del objs
+
+    # Memory is traced separately, tracing slows down the build itself.
+    tracemalloc.start()
+    objs = build()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"{name:>10}: {len(objs):,} objects in {elapsed:.3f}s "
+          f"({len(objs) / elapsed:,.0f}/s), {memory / len(objs):.0f} bytes/object")
+
+
+if __name__ == "__main__":
+    raws = [raw_item(item_id) for item_id in range(1, COUNT + 1)]
+    parsed = [item_data(item_id) for item_id in range(1, COUNT + 1)]
+
+    measure("strict", lambda: [strict_item(data) for data in parsed])
+    measure("trusted", lambda: [utils.create_trusted(Item, **data) for data in parsed])
+    measure("create_raw", lambda: [Item.create_raw(raw) for raw in raws])
@@ -6,5 +6,6 @@ setuptools.setup(
     version="1.0.0",
     long_description=Path("README.md").read_text(),
     long_description_content_type="text/markdown",
-    packages=setuptools.find_packages(exclude=["tests", "examples"])
+    packages=setuptools.find_packages(exclude=["tests", "examples", "benchmarks"]),
+    extras_require={"arrow": ["pyarrow"], "analytics": ["numpy"]}
 )
\ No newline at end of file
@@ -0,0 +1,52 @@
+"""
+Raw API records and offline containers shared by the tests.
+"""
+
+
+def raw_item(oid: int, name: str = "Sword", desc: str = "A sword", kind: int = 12,
+             rarity: int = 3) -> dict:
+    return {
+        "ID": oid, "Name": name, "Level": 5, "Desc": desc, "Cost": 10, "Type": kind,
+        "EquipSlot": 10, "Rarity": rarity, "MaxStack": 1, "bundle": {"Version": 2},
+        "MaxHealth": 1, "Attack": 2, "Armor": 3, "Evasion": 4, "Crit": 5,
+        "IsCosmetic": False, "IsMC": True
+    }
+
+
+def raw_map(oid: int, name: str = "Battleon", desc: str = "A town") -> dict:
+    return {"map": {
+        "ID": oid, "DisplayName": name, "Description": desc, "MaxUsers": 8, "MinLevel": 1
+    }}
+
+
+def raw_dialog(oid: int, frames=(("Cysero", "Hello"),), npcs=()) -> dict:
+    return {
+        "ID": oid,
+        "FrameCollection": [
+            {"DialogueName": speaker, "DialogueTitle": "The Bold", "DialogueText": text}
+            for speaker, text in frames
+        ],
+        "Characters": [{"NPCID": npc_id} for npc_id in npcs]
+    }
+
+
+def raw_server(oid: int, players: int = 50, region: str = "na", status: int = 1,
+               hostname: str | None = None, port: int | None = None) -> dict:
+    return {
+        "ID": oid, "Name": f"Server{oid} [NA]", "Region": region, "Language": "en",
+        "UserCount": players, "MaxUsers": 500,
+        "HostName": hostname or f"host{oid}.aq3d.com", "Port": port or 5000 + oid,
+        "AccessLevel": 0, "Status": status, "LastUpdated": "2024-01-02T03:04:05"
+    }
+
+
+def offline(container: type, cls: type, data: list, options: dict | None = None):
+    """
+    Creates a container whose API requests return the current contents of `data`.
+    """
+
+    class Offline(container):
+        def _fetch(self):
+            return self, lambda *args: [dict(raw) for raw in data], cls
+
+    return Offline(options or {})
@@ -0,0 +1,34 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from aq3d_api.snapshots.analytics import SnapshotFrame, rolling_mean
+
+
+def test_rolling_mean_skips_missing_values():
+    means = rolling_mean([1.0, np.nan, 3.0, np.nan, np.nan], 2)
+    assert means[:4].tolist() == [1.0, 1.0, 3.0, 3.0]
+    assert np.isnan(means[4])
+
+
+def test_resample_aggregates_each_bucket():
+    frame = SnapshotFrame([0, 30, 60, 330], [1, 1, 1, 1], [10, 30, 20, 30])
+    starts, values = frame.resample(60)[1]
+    assert starts.tolist() == [0, 60, 300]
+    assert values.tolist() == [20, 20, 30]
+
+
+def test_rolling_windows_span_time_not_present_buckets():
+    # Server 1 has no samples in the buckets between 60 and 300.
+    frame = SnapshotFrame([0, 60, 300, 0, 60, 120], [1, 1, 1, 2, 2, 2], [10, 20, 30, 1, 2, 3])
+    rolled = frame.rolling(60, 2)
+
+    starts, means = rolled[1]
+    assert starts.tolist() == [0, 60, 300]
+    assert means.tolist() == [10, 15, 30]
+    assert rolled[2][1].tolist() == [1, 1.5, 2.5]
+
+
+def test_rolling_rejects_an_empty_window():
+    with pytest.raises(ValueError):
+        SnapshotFrame([0], [1], [1]).rolling(60, 0)
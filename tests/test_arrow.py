@@ -0,0 +1,48 @@
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from aq3d_api.containers.items import Items
+from aq3d_api.decoder import get_decoder
+from aq3d_api.exports.arrow import snapshots_to_arrow
+from aq3d_api.items.item import Item
+from aq3d_api.servers.server import Server
+from aq3d_api.snapshots.server import ServerSnapshot
+
+from tests.helpers import offline, raw_item, raw_server
+
+
+def items():
+    items = offline(Items, Item, [raw_item(1, "Sword", rarity=3), raw_item(2, "Axe", rarity=5)],
+                    {"max-index": 2})
+    items.refresh()
+    return items
+
+
+def test_items_convert_to_typed_columns():
+    table = items().to_arrow()
+    assert table.num_rows == 2
+    assert table.column("name").to_pylist() == ["Sword", "Axe"]
+    assert pa.types.is_dictionary(table.schema.field("rarity").type)
+    assert table.column("rarity").to_pylist() == [item.rarity.name for item in items()]
+
+
+def test_parquet_files_read_back_the_same_table(tmp_path):
+    path = tmp_path / "items.parquet"
+    container = items()
+    container.to_parquet(path)
+    assert pq.read_table(path).column("id").to_pylist() == [1, 2]
+
+
+def test_snapshots_convert_with_their_timestamps():
+    decode = get_decoder(Server).decode
+    snapshots = [ServerSnapshot.restore(ServerSnapshot(decode(raw_server(1))).server_data, 5)]
+    table = snapshots_to_arrow(snapshots)
+    assert table.column("timestamp").to_pylist() == [5]
+    assert table.column("id").to_pylist() == [1]
+
+
+def test_empty_containers_are_rejected():
+    with pytest.raises(ValueError):
+        Items().to_arrow()
@@ -0,0 +1,68 @@
+import mmap
+
+import pytest
+
+from aq3d_api.containers.items import Items
+from aq3d_api.dialogs.dialog import Dialog
+from aq3d_api.items.item import Item
+from aq3d_api.storage import catalog as catalog_module
+from aq3d_api.storage.catalog import Catalog
+
+from tests.helpers import offline, raw_item
+
+
+def write_items(path, names=("Sword", "Axe")):
+    items = offline(Items, Item, [raw_item(oid, name) for oid, name in enumerate(names, 1)],
+                    {"max-index": len(names)})
+    items.refresh()
+    items.to_catalog(path)
+
+
+@pytest.fixture
+def maps(monkeypatch):
+    opened = []
+    create = mmap.mmap
+
+    def tracked(*args, **kwargs):
+        opened.append(create(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(catalog_module.mmap, "mmap", tracked)
+    return opened
+
+
+def test_catalog_round_trips_the_objects(tmp_path):
+    path = tmp_path / "items.cat"
+    write_items(path)
+    with Catalog(path, Item) as catalog:
+        assert [item.name for item in catalog] == ["Sword", "Axe"]
+        assert catalog.value(1, "name") == "Axe"
+
+
+@pytest.mark.parametrize("content", [b"not a catalog file at all" * 10, None],
+                         ids=["garbage", "other-class"])
+def test_invalid_catalogs_are_unmapped(tmp_path, maps, content):
+    path = tmp_path / "items.cat"
+    if content is None:
+        # A catalog of another class.
+        write_items(path)
+    else:
+        path.write_bytes(content)
+
+    with pytest.raises(ValueError):
+        Catalog(path, Dialog)
+
+    assert len(maps) == 1
+    assert maps[0].closed
+
+
+def test_loading_a_catalog_closes_the_replaced_one(tmp_path, maps):
+    first, second = tmp_path / "first.cat", tmp_path / "second.cat"
+    write_items(first)
+    write_items(second, ("Bow",))
+
+    items = Items.from_catalog(first)
+    items.open_catalog(second)
+    assert maps[0].closed
+    assert not maps[1].closed
+    assert [item.name for item in items] == ["Bow"]
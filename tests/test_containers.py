@@ -0,0 +1,46 @@
+import subprocess
+import sys
+
+import pytest
+
+from aq3d_api.containers.items import Items
+from aq3d_api.containers.maps import Maps
+from aq3d_api.items.item import Item
+from aq3d_api.maps.map import Map
+from aq3d_api.storage.sqlite import SQLiteStorage
+
+from tests.helpers import offline, raw_item, raw_map
+
+
+@pytest.mark.parametrize("options", [{}, {"lazy": True}, {"storage": SQLiteStorage()}])
+def test_items_by_keypair_match_the_value(options):
+    data = [raw_item(1, "Sword"), raw_item(2, "Staff"), raw_item(3, "Sword")]
+    items = offline(Items, Item, data, {"max-index": 3, **options})
+
+    assert [item.id for item in items.by_keypair("name", "Sword")] == [1, 3]
+    assert list(items.by_keypair("name", "Axe")) == []
+
+
+def test_maps_by_keypair_match_the_value():
+    data = [raw_map(1, "Battleon"), raw_map(2, "Doomwood", desc="A forest")]
+    maps = offline(Maps, Map, data, {"max-index": 2})
+
+    assert [obj.id for obj in maps.by_keypair("description", "A forest")] == [2]
+
+
+def test_by_keypair_requires_a_value():
+    items = offline(Items, Item, [raw_item(1)], {"max-index": 1})
+    with pytest.raises(ValueError):
+        items.by_keypair("name", "")
+
+
+def test_containers_import_their_backends_on_use():
+    code = (
+        "import sys\n"
+        "from aq3d_api.containers.dialogs import Dialogs\n"
+        "from aq3d_api.containers.items import Items\n"
+        "from aq3d_api.containers.servers import Servers\n"
+        "print(sorted(name for name in sys.modules if name.startswith(('aq3d_api.storage', 'aq3d_api.exports'))))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
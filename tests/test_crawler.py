@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+from aq3d_api.api import crawler as crawler_module
+from aq3d_api.api.crawler import DialogCrawler
+
+from tests.helpers import raw_dialog
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, data=None, headers: dict | None = None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.__data = data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise crawler_module.RequestException(f"{self.status_code} error")
+
+    def json(self):
+        return self.__data
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """
+    Serves dialog requests from `responses`, a dict of ids to lists of
+    responses which are returned in order, the last one repeating.
+    """
+
+    responses = {}
+    sleeps = []
+
+    class FakeSession:
+        closed = []
+
+        def close(self):
+            FakeSession.closed.append(self)
+
+        def get(self, url, params, timeout):
+            dialog_id = next(iter(params.values()))
+            queue = responses.get(dialog_id, [FakeResponse(200, {"ID": -1})])
+            return queue.pop(0) if len(queue) > 1 else queue[0]
+
+    monkeypatch.setattr(crawler_module, "Session", FakeSession)
+    monkeypatch.setattr(crawler_module, "sleep", sleeps.append)
+    return responses, sleeps
+
+
+def test_missing_ids_are_gaps(api):
+    responses, _ = api
+    responses[1] = [FakeResponse(200, raw_dialog(1))]
+    responses[3] = [FakeResponse(404)]
+
+    crawler = DialogCrawler(max_index=3, workers=2, retries=1)
+    report = crawler.crawl()
+    assert (report["found"], report["gaps"], report["failed"]) == (1, 2, 0)
+    assert [raw["ID"] for raw in crawler.records()] == [1]
+
+
+def test_rate_limits_are_retried_honouring_retry_after(api):
+    responses, sleeps = api
+    responses[1] = [
+        FakeResponse(429, headers={"Retry-After": "3"}),
+        FakeResponse(408),
+        FakeResponse(200, raw_dialog(1))
+    ]
+
+    crawler = DialogCrawler(max_index=1, retries=2)
+    report = crawler.crawl()
+    assert (report["found"], report["gaps"], report["failed"]) == (1, 0, 0)
+    assert sleeps == [3.0, 1.0]
+
+
+def test_exhausted_rate_limits_fail_and_are_crawled_again(api, tmp_path):
+    responses, _ = api
+    responses[1] = [FakeResponse(200, raw_dialog(1))]
+    responses[2] = [FakeResponse(429)]
+    responses[3] = [FakeResponse(200, raw_dialog(3))]
+    checkpoint = tmp_path / "dialogs.json"
+
+    crawler = DialogCrawler(max_index=3, workers=1, retries=1, checkpoint=checkpoint)
+    report = crawler.crawl()
+    assert (report["found"], report["gaps"], report["failed"]) == (2, 0, 1)
+    assert [raw["ID"] for raw in crawler.records()] == [1, 3]
+
+    state = json.loads(checkpoint.read_text())
+    assert state["watermark"] == 2
+    assert 2 not in state["done"]
+
+    responses[2] = [FakeResponse(200, raw_dialog(2))]
+    resumed = DialogCrawler(max_index=3, workers=1, retries=1, checkpoint=checkpoint)
+    resumed.crawl()
+    assert [raw["ID"] for raw in resumed.records()] == [1, 2, 3]
+    assert json.loads(checkpoint.read_text())["watermark"] == 4
+
+
+def test_malformed_ids_fail_without_aborting_the_crawl(api):
+    responses, _ = api
+    responses[1] = [FakeResponse(200, {"ID": None})]
+    responses[2] = [FakeResponse(200, {"ID": "2"})]
+    responses[3] = [FakeResponse(200, raw_dialog(3))]
+
+    crawler = DialogCrawler(max_index=3, workers=2)
+    report = crawler.crawl()
+    assert (report["found"], report["gaps"], report["failed"]) == (1, 0, 2)
+    assert [raw["ID"] for raw in crawler.records()] == [3]
+
+
+def test_worker_sessions_are_closed_after_the_crawl(api):
+    DialogCrawler(max_index=4, workers=2).crawl()
+    assert 1 <= len(crawler_module.Session.closed) <= 2
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from aq3d_api import utils
+from aq3d_api.decoder import get_decoder
+from aq3d_api.dialogs.dialog import Dialog
+from aq3d_api.dialogs.frame import DialogFrame
+from aq3d_api.enums.item_rarity import ItemRarity
+from aq3d_api.enums.item_type import ItemType
+from aq3d_api.items.item import Item
+
+from tests.helpers import raw_dialog, raw_item
+
+
+def test_raw_records_are_decoded_into_their_fields():
+    item = get_decoder(Item).decode(raw_item(7, "Sword", "Sharp", rarity=3))
+    assert (item.id, item.name, item.description, item.level) == (7, "Sword", "Sharp", 5)
+    assert item.version == 2
+    assert isinstance(item.type, ItemType) and isinstance(item.rarity, ItemRarity)
+    assert item.dc_purchasable is True
+
+
+def test_missing_and_unknown_values_use_the_defaults():
+    item = get_decoder(Item).decode({"ID": 1, "Rarity": 999})
+    assert item.name == "" and item.level == 1 and item.version == 1
+    assert item.rarity is ItemRarity.JUNK
+    assert item.type is ItemType.ITEM
+
+
+def test_decode_many_matches_decode():
+    raws = [raw_item(1, "Sword"), raw_item(2, "Axe", kind=1)]
+    decoder = get_decoder(Item)
+    assert [utils.to_record(item) for item in decoder.decode_many(raws)] == [
+        utils.to_record(decoder.decode(raw)) for raw in raws
+    ]
+
+
+def test_exported_records_decode_back_into_the_same_item():
+    item = get_decoder(Item).decode(raw_item(3, "Bow"))
+    record = utils.to_record(item)
+    # Exported records store Enum members by name.
+    exported = json.loads(json.dumps(record, cls=utils.EnumEncoder))
+    assert utils.to_record(get_decoder(Item, record=True).decode(exported)) == record
+
+
+def test_getters_read_a_single_attribute():
+    getter = get_decoder(Item).getter("name")
+    assert getter(raw_item(1, "Staff")) == "Staff"
+    assert get_decoder(Item).getter("missing") is None
+
+
+def test_decoders_require_a_schema():
+    with pytest.raises(ValueError):
+        get_decoder(object)
+
+
+def test_speakers_are_interned_but_dialog_text_is_not():
+    field = {field.name: field for field in DialogFrame.schema}
+    assert field["speaker"].intern and field["title"].intern
+    assert not field["text"].intern
+    assert not {field.name: field for field in Item.schema}["description"].intern
+
+    decode = get_decoder(Dialog).decode
+    first = decode(raw_dialog(1, frames=(("".join(["Cy", "sero"]), "Hello"),)))
+    second = decode(raw_dialog(2, frames=(("".join(["Cys", "ero"]), "Bye"),)))
+    assert first.frames[0].speaker is second.frames[0].speaker
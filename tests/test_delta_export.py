@@ -0,0 +1,62 @@
+from aq3d_api import utils
+from aq3d_api.decoder import get_decoder
+from aq3d_api.exports.delta import DeltaExporter
+from aq3d_api.items.item import Item
+
+from tests.helpers import raw_item
+
+
+def items(*pairs):
+    decode = get_decoder(Item).decode
+    return [decode(raw_item(oid, name)) for oid, name in pairs]
+
+
+def names(exporter):
+    return [(record["id"], record["name"]) for record in exporter.records()]
+
+
+def test_exports_write_a_base_then_only_the_changes(tmp_path):
+    exporter = DeltaExporter(tmp_path, "items")
+    assert exporter.export(items((1, "Sword"), (2, "Axe"))) == exporter.base_path
+    assert exporter.export(items((1, "Sword"), (2, "Axe"))) is None
+
+    delta = exporter.export(items((1, "Sword"), (3, "Bow"), (2, "Great Axe")))
+    operations = list(utils.read_jsonl(delta))
+    assert sorted((op["op"], op["record"]["id"]) for op in operations) == [
+        ("upsert", 2), ("upsert", 3)
+    ]
+
+    delta = exporter.export(items((3, "Bow"), (2, "Great Axe")))
+    assert list(utils.read_jsonl(delta)) == [{"op": "remove", "id": 1}]
+    assert names(exporter) == [(2, "Great Axe"), (3, "Bow")]
+
+
+def test_state_survives_a_new_exporter(tmp_path):
+    DeltaExporter(tmp_path).export(items((1, "Sword")))
+    exporter = DeltaExporter(tmp_path)
+    assert exporter.export(items((1, "Sword"))) is None
+    assert exporter.export(items((1, "Axe"))) is not None
+    assert len(exporter.delta_paths) == 1
+
+
+def test_compact_folds_the_deltas_into_the_base(tmp_path):
+    exporter = DeltaExporter(tmp_path)
+    exporter.export(items((1, "Sword"), (2, "Axe")))
+    exporter.export(items((2, "Bow")))
+    deltas = exporter.delta_paths
+
+    exporter.compact()
+    assert exporter.delta_paths == []
+    assert not any(path.exists() for path in deltas)
+    assert names(exporter) == [(2, "Bow")]
+    assert exporter.export(items((2, "Bow"))) is None
+
+
+def test_records_are_replayed_in_id_order(tmp_path):
+    exporter = DeltaExporter(tmp_path)
+    exporter.export(items((10, "Sword"), (2, "Axe"), (30, "Bow")))
+    exporter.export(items((30, "Bow"), (10, "Sword"), (3, "Staff"), (1, "Dagger")))
+
+    assert [oid for oid, _ in names(exporter)] == [1, 3, 10, 30]
+    exporter.compact()
+    assert [record["id"] for record in utils.read_jsonl(exporter.base_path)] == [1, 3, 10, 30]
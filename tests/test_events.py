@@ -0,0 +1,116 @@
+import logging
+from threading import Barrier, Thread
+
+import pytest
+
+from aq3d_api.api.events import ChangeEvents, ChangeSet
+from aq3d_api.containers.items import Items
+from aq3d_api.containers.servers import Servers
+from aq3d_api.items.item import Item
+from aq3d_api.servers.server import Server
+
+from tests.helpers import offline, raw_item, raw_server
+
+
+def test_updates_report_added_removed_and_changed_ids():
+    data = [raw_item(1), raw_item(2)]
+    items = offline(Items, Item, data, {"max-index": 3})
+    received = []
+    items.events.subscribe(received.append)
+
+    items.refresh()
+    data[0] = raw_item(1, "Axe")
+    data[1] = raw_item(3)
+    items.refresh()
+    items.refresh()
+
+    assert len(received) == 2
+    assert received[0].added == {1, 2}
+    assert (received[1].added, received[1].removed, received[1].changed) == ({3}, {2}, {1})
+
+
+def test_nothing_is_tracked_without_subscribers():
+    events = ChangeEvents()
+    assert events.track(Item, [raw_item(1)]) is None
+
+    unsubscribe = events.subscribe(lambda changes: None)
+    events.track(Item, [raw_item(1)])
+    unsubscribe()
+
+    events.subscribe(lambda changes: None)
+    assert events.track(Item, [raw_item(1)]).added == {1}
+
+
+def test_concurrent_updates_each_compare_against_the_previous_one():
+    events = ChangeEvents()
+    events.subscribe(lambda changes: None)
+    threads = 16
+    barrier = Barrier(threads)
+    results = []
+
+    def update(oid: int):
+        barrier.wait()
+        results.append(events.track(Item, [raw_item(oid)]))
+
+    workers = [Thread(target=update, args=(oid,)) for oid in range(threads)]
+    for worker in workers:
+        worker.start()
+
+    for worker in workers:
+        worker.join()
+
+    # Every update replaced exactly one other, apart from the first.
+    assert sum(len(changes.added) for changes in results) == threads
+    assert sum(len(changes.removed) for changes in results) == threads - 1
+
+
+def test_failing_subscribers_are_logged_and_skipped(caplog):
+    events = ChangeEvents()
+    received = []
+
+    def failing(changes):
+        raise RuntimeError("subscriber broke")
+
+    events.subscribe(failing)
+    events.subscribe(received.append)
+    changes = ChangeSet(Item, added=[1])
+
+    with caplog.at_level(logging.ERROR, logger="aq3d_api.api.events"):
+        events.publish(changes)
+
+    assert received == [changes]
+    assert "subscriber broke" in caplog.text
+
+
+def test_servers_are_not_changed_by_their_timestamp_alone():
+    data = [raw_server(1, 101), raw_server(2, 201)]
+    servers = offline(Servers, Server, data)
+    received = []
+    servers.events.subscribe(received.append)
+    servers.refresh()
+
+    data[0] = {**raw_server(1, 101), "LastUpdated": "2024-01-02T03:05:05"}
+    data[1] = {**raw_server(2, 301), "LastUpdated": "2024-01-02T03:05:05"}
+    servers.refresh()
+    assert received[-1].changed == {2}
+
+
+def test_failed_updates_are_not_tracked(monkeypatch):
+    data = [raw_item(1)]
+    items = offline(Items, Item, data, {"max-index": 1})
+    received = []
+    items.events.subscribe(received.append)
+    items.refresh()
+
+    def fail(raws):
+        raise ValueError("Undecodable item")
+
+    data[0] = raw_item(1, "Axe")
+    monkeypatch.setattr(Item, "create_many", fail)
+    with pytest.raises(ValueError):
+        items.refresh()
+
+    monkeypatch.undo()
+    items.refresh()
+    assert received[-1].changed == {1}
+    assert items[0].name == "Axe"
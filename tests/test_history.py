@@ -0,0 +1,53 @@
+import pytest
+
+from aq3d_api.decoder import get_decoder
+from aq3d_api.enums.server_status import ServerStatus
+from aq3d_api.servers.server import Server
+from aq3d_api.snapshots.history import HistoryStore, ServerHistory
+from aq3d_api.snapshots.server import ServerSnapshot
+
+from tests.helpers import raw_server
+
+
+def test_full_histories_overwrite_the_oldest_samples():
+    history = ServerHistory(1, capacity=3)
+    for second in range(5):
+        history.append(second, second * 10, ServerStatus.ONLINE)
+
+    assert len(history) == 3
+    assert list(history.between()["timestamp"]) == [2, 3, 4]
+    assert list(history.between()["players"]) == [20, 30, 40]
+    assert history.latest == (4, 40, ServerStatus.ONLINE)
+
+
+def test_ranges_are_found_across_the_wrap_around():
+    history = ServerHistory(1, capacity=4)
+    for second in range(6):
+        history.append(second, second, ServerStatus.ONLINE)
+
+    assert list(history.between(3, 4)["timestamp"]) == [3, 4]
+    assert list(history.between(start=4)["timestamp"]) == [4, 5]
+    assert list(history.between(end=2.5)["timestamp"]) == [2]
+    assert list(history.between(10, 20)["timestamp"]) == []
+
+
+def test_samples_must_be_in_order():
+    history = ServerHistory(1, capacity=2)
+    history.append(5, 1, ServerStatus.ONLINE)
+    with pytest.raises(ValueError):
+        history.append(4, 1, ServerStatus.ONLINE)
+
+    with pytest.raises(ValueError):
+        ServerHistory(1, capacity=0)
+
+
+def test_store_records_the_public_player_counts():
+    decode = get_decoder(Server).decode
+    store = HistoryStore(capacity=10)
+    store.record([decode(raw_server(1, 101)), decode(raw_server(2, 0, status=0))], timestamp=1)
+    store.record_snapshots([ServerSnapshot(decode(raw_server(1, 201)))])
+
+    assert len(store) == 2 and 1 in store
+    assert list(store[1].between()["players"]) == [100, 200]
+    assert store[2].latest == (1, 0, ServerStatus.OFFLINE)
+    assert set(store.between(0, 1)) == {1, 2}
@@ -0,0 +1,177 @@
+from aq3d_api.containers.dialogs import Dialogs
+from aq3d_api.containers.items import Items
+from aq3d_api.containers.lazy import LazyRecords
+from aq3d_api.dialogs.dialog import Dialog
+from aq3d_api.indexes.dialog import DialogIndex
+from aq3d_api.indexes.index import ObjectIndex
+from aq3d_api.indexes.search import SearchIndex
+from aq3d_api.indexes.trigram import TrigramIndex
+from aq3d_api.items.item import Item
+from aq3d_api.storage.catalog import Catalog
+from aq3d_api.storage.sqlite import SQLiteStorage
+
+from tests.helpers import offline, raw_dialog, raw_item
+
+
+def lazy_items():
+    items = offline(Items, Item, [raw_item(1, "Red Dragon Blade"), raw_item(2, "Ice Staff")],
+                    {"lazy": True, "max-index": 2})
+    items.update()
+    return items
+
+
+def test_search_returns_the_lazily_created_objects():
+    items = lazy_items()
+    index = SearchIndex()
+    items.add_index(index)
+
+    obj, _ = index.search("dragon")[0]
+    assert type(obj) is Item
+    assert obj is items[0]
+
+
+def test_trigram_lookups_return_the_lazily_created_objects():
+    items = lazy_items()
+    names = TrigramIndex()
+    items.add_index(names)
+    items.refresh()
+
+    obj, _ = names.similar("ice staf")[0]
+    assert type(obj) is Item
+    assert obj is items[1]
+    assert names.get(("Item", 2)) is obj
+
+
+def test_record_views_report_their_model_class_through_cls():
+    view = LazyRecords(Item, [raw_item(1, "Ice Staff")]).views()[0]
+
+    assert not isinstance(view, Item)
+    assert view.cls is Item
+    assert ObjectIndex.key(view) == ("Item", 1)
+
+
+def test_lazy_dialogs_are_searched_by_their_frames():
+    dialogs = offline(Dialogs, Dialog, dialog_data(), {"lazy": True, "max-index": 3})
+    index = SearchIndex()
+    dialogs.add_index(index)
+    dialogs.refresh()
+
+    assert sorted(obj.id for obj, _ in index.search("cysero")) == [1, 2]
+
+
+def dialog_data():
+    return [
+        raw_dialog(1, frames=(("Cysero", "Hello"), ("Ash", "Hi")), npcs=(10,)),
+        raw_dialog(2, frames=(("cysero ", "Bye"),), npcs=(10, 20)),
+        raw_dialog(3, frames=(("Ash", "Yes"),), npcs=(30,))
+    ]
+
+
+def test_dialog_lookups_build_an_index_on_first_use():
+    data = dialog_data()
+    dialogs = offline(Dialogs, Dialog, data, {"max-index": 3})
+    assert [dialog.id for dialog in dialogs.by_npc(10)] == [1, 2]
+    assert dialogs.dialog_ids_by_npc(30) == {3}
+
+    data[2] = raw_dialog(3, frames=(("Ash", "Yes"),), npcs=(10,))
+    dialogs.refresh()
+    assert dialogs.dialog_ids_by_npc(10) == {1, 2, 3}
+
+
+def test_an_attached_dialog_index_is_used_for_lookups():
+    dialogs = offline(Dialogs, Dialog, dialog_data(), {"max-index": 3})
+    index = DialogIndex()
+    dialogs.add_index(index)
+    dialogs.by_npc(10)
+    assert index.npc_ids == [10, 20, 30]
+
+
+def test_dialog_index_follows_refreshes():
+    data = dialog_data()
+    dialogs = offline(Dialogs, Dialog, data, {"max-index": 3})
+    dialogs.add_index(DialogIndex())
+    dialogs.refresh()
+
+    data[2] = raw_dialog(3, frames=(("Cysero", "Again"),), npcs=(10,))
+    dialogs.refresh()
+    assert dialogs.dialog_ids_by_npc(10) == {1, 2, 3}
+    assert dialogs.dialog_ids_by_npc(30) == set()
+    assert [frame.text for _, frame in dialogs.frames_by_speaker("ash")] == ["Hi"]
+
+
+def test_lazy_dialog_lookups_return_dialogs_without_decoding_again():
+    dialogs = offline(Dialogs, Dialog, dialog_data(), {"lazy": True, "max-index": 3})
+    dialogs.add_index(DialogIndex())
+    dialogs.refresh()
+
+    lines = dialogs.frames_by_speaker("CYSERO")
+    assert [(dialog.id, frame.text) for dialog, frame in lines] == [(1, "Hello"), (2, "Bye")]
+    assert all(type(dialog) is Dialog for dialog, _ in lines)
+    assert lines[0][0] is dialogs[0]
+
+    again = dialogs.frames_by_speaker("cysero")
+    assert again[0][0] is lines[0][0]
+    assert again[0][1] is lines[0][1]
+    assert type(dialogs.by_npc(20)[0]) is Dialog
+
+
+def test_stored_dialogs_are_indexed_from_their_columns():
+    storage = SQLiteStorage()
+    dialogs = offline(Dialogs, Dialog, dialog_data(), {"storage": storage, "max-index": 3})
+    dialogs.refresh()
+
+    statements = []
+    storage.connection.set_trace_callback(statements.append)
+    dialogs.add_index(DialogIndex())
+    dialogs.refresh()
+    storage.connection.set_trace_callback(None)
+
+    # The ids, actors and frames are read a column at a time, for attaching
+    # and for the refresh, rather than a whole row per dialog.
+    reads = [sql for sql in statements if sql.startswith("SELECT")]
+    assert not any('"id", "frames", "actors"' in sql for sql in reads)
+    assert len(reads) == 6
+
+    assert [dialog.id for dialog in dialogs.by_npc(10)] == [1, 2]
+    assert type(dialogs.by_npc(10)[0]) is Dialog
+    assert [dialog.id for dialog, _ in dialogs.frames_by_speaker("ash")] == [1, 3]
+
+
+def test_catalog_dialogs_are_indexed_without_decoding_them(tmp_path, monkeypatch):
+    path = tmp_path / "dialogs.catalog"
+    source = offline(Dialogs, Dialog, dialog_data(), {"max-index": 3})
+    source.refresh()
+    source.to_catalog(path)
+
+    decoded = []
+    getitem = Catalog.__getitem__
+    monkeypatch.setattr(Catalog, "__getitem__",
+                        lambda self, index: decoded.append(index) or getitem(self, index))
+
+    dialogs = Dialogs.from_catalog(path)
+    dialogs.add_index(DialogIndex())
+    assert decoded == []
+
+    found = dialogs.by_npc(20)
+    assert [dialog.id for dialog in found] == [2]
+    assert type(found[0]) is Dialog
+    assert decoded == [1]
+
+
+def test_null_names_are_indexed_as_empty_text():
+    items = offline(Items, Item, [raw_item(1, None), raw_item(2, "Ice Staff")], {"max-index": 2})
+    names = TrigramIndex()
+    items.add_index(names)
+    items.refresh()
+
+    assert [obj.id for obj, _ in names.similar("ice staf")] == [2]
+
+
+def test_null_text_is_searched_as_empty_text():
+    items = offline(Items, Item, [raw_item(1, None, desc=None), raw_item(2, "Red Dragon Blade")],
+                    {"max-index": 2})
+    index = SearchIndex()
+    items.add_index(index)
+    items.refresh()
+
+    assert [obj.id for obj, _ in index.search("dragon")] == [2]
@@ -0,0 +1,35 @@
+import pytest
+
+from aq3d_api.containers.dialogs import Dialogs
+from aq3d_api.containers.items import Items
+from aq3d_api.dialogs.dialog import Dialog
+from aq3d_api.items.item import Item
+
+from tests.helpers import offline, raw_dialog, raw_item
+
+
+@pytest.mark.parametrize("name", ["items.jsonl", "items.jsonl.gz"])
+def test_items_round_trip_through_json_lines(tmp_path, name):
+    path = tmp_path / name
+    items = offline(Items, Item, [raw_item(1, "Sword"), raw_item(2, "Axe", rarity=5)],
+                    {"max-index": 2})
+    items.refresh()
+    items.to_jsonl(path)
+
+    loaded = Items.from_jsonl(path)
+    assert [(item.id, item.name, item.rarity) for item in loaded] == [
+        (item.id, item.name, item.rarity) for item in items
+    ]
+    assert all(type(item) is Item for item in loaded)
+
+
+def test_nested_dialog_frames_round_trip(tmp_path):
+    path = tmp_path / "dialogs.jsonl"
+    dialogs = offline(Dialogs, Dialog, [raw_dialog(1, (("Cysero", "Hi"), ("Ash", "Yo")), (7,))],
+                      {"max-index": 1})
+    dialogs.refresh()
+    dialogs.to_jsonl(path)
+
+    dialog = Dialogs.from_jsonl(path)[0]
+    assert [(frame.speaker, frame.text) for frame in dialog.frames] == [("Cysero", "Hi"), ("Ash", "Yo")]
+    assert [actor.npc_id for actor in dialog.actors] == [7]
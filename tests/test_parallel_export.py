@@ -0,0 +1,53 @@
+import hashlib
+import json
+
+import pytest
+
+from aq3d_api import utils
+from aq3d_api.decoder import get_decoder
+from aq3d_api.exports.parallel import export_shards
+from aq3d_api.items.item import Item
+from aq3d_api.storage.catalog import Catalog
+
+from tests.helpers import raw_item
+
+
+def items(count: int) -> list[Item]:
+    decode = get_decoder(Item).decode
+    return [decode(raw_item(oid, f"Item {oid}")) for oid in range(1, count + 1)]
+
+
+def test_shards_are_written_in_every_format_with_a_manifest(tmp_path):
+    manifest = export_shards(items(5), tmp_path, ("jsonl", "catalog", "csv"),
+                             shard_size=2, workers=2)
+
+    assert manifest["records"] == 5
+    assert [shard["records"] for shard in manifest["shards"]] == [2, 2, 1]
+    assert json.loads((tmp_path / "item-manifest.json").read_text()) == manifest
+
+    ids = []
+    for shard in manifest["shards"]:
+        files = shard["files"]
+        for entry in files.values():
+            path = tmp_path / entry["path"]
+            assert hashlib.sha256(path.read_bytes()).hexdigest() == entry["sha256"]
+
+        ids.extend(record["id"] for record in utils.read_jsonl(tmp_path / files["jsonl"]["path"]))
+        with Catalog(tmp_path / files["catalog"]["path"], Item) as catalog:
+            assert len(catalog) == shard["records"]
+
+    assert ids == [1, 2, 3, 4, 5]
+
+
+def test_exports_are_deterministic(tmp_path):
+    first = export_shards(items(3), tmp_path / "a", ("jsonl",), shard_size=2, workers=1)
+    second = export_shards(items(3), tmp_path / "b", ("jsonl",), shard_size=2, workers=2)
+    assert first == second
+
+
+@pytest.mark.parametrize("objs, formats, shard_size", [
+    (items(1), ("xml",), 10), (items(1), ("csv",), 0), ([], ("csv",), 10)
+], ids=["unknown-format", "empty-shards", "no-objects"])
+def test_invalid_exports_are_rejected(tmp_path, objs, formats, shard_size):
+    with pytest.raises(ValueError):
+        export_shards(objs, tmp_path, formats, shard_size)
@@ -0,0 +1,114 @@
+from threading import Event, Thread
+from time import monotonic, sleep
+
+import pytest
+
+from aq3d_api.containers.servers import Servers
+from aq3d_api.servers.poller import ADDED, CHANGED, REMOVED, ServerPoller
+from aq3d_api.servers.server import Server
+
+from tests.helpers import offline, raw_server
+
+
+@pytest.fixture
+def data():
+    return [raw_server(1, 101), raw_server(2, 201)]
+
+
+@pytest.fixture
+def poller(data):
+    poller = ServerPoller(offline(Servers, Server, data), min_interval=10, max_interval=100)
+    assert poller.poll() == []
+    return poller
+
+
+def test_quiet_polls_slow_down_up_to_the_max(poller):
+    poller.poll()
+    assert poller.interval == 15
+
+    for _ in range(10):
+        poller.poll()
+
+    assert poller.interval == 100
+
+
+def test_large_player_swings_speed_up(poller, data):
+    poller.poll()
+    poller.poll()
+    assert poller.interval == 22.5
+
+    data[0] = raw_server(1, 301)
+    changes = poller.poll()
+    assert [(change.kind, change.previous_players) for change in changes] == [(CHANGED, 100)]
+    assert poller.interval == 11.25
+
+
+def test_small_player_changes_are_quiet(poller, data):
+    data[0] = raw_server(1, 102)
+    assert len(poller.poll()) == 1
+    assert poller.interval == 15
+
+
+@pytest.mark.parametrize("change", [
+    lambda data: data.append(raw_server(3, 101)),
+    lambda data: data.pop(),
+    lambda data: data.__setitem__(0, raw_server(1, 101, status=0))
+], ids=[ADDED, REMOVED, "status"])
+def test_added_removed_or_status_changes_reset_to_the_min(poller, data, change):
+    poller.poll()
+    poller.poll()
+    change(data)
+    changes = poller.poll()
+    assert len(changes) == 1
+    assert poller.interval == 10
+
+
+def test_failed_refreshes_are_counted(poller, data):
+    data.clear()
+    assert poller.poll() == []
+    assert poller.interval == 15
+    assert poller.stats == {"polls": 2, "failures": 1, "last_error": "The API returned no servers."}
+
+
+def test_background_errors_are_recorded():
+    class Failing(Servers):
+        def _fetch(self):
+            def fail(*args):
+                raise RuntimeError("API down")
+
+            return self, fail, Server
+
+    with ServerPoller(Failing(), min_interval=0.01, max_interval=0.02) as poller:
+        deadline = monotonic() + 5
+        while poller.stats["failures"] < 2 and monotonic() < deadline:
+            sleep(0.01)
+
+        assert poller.running
+
+    assert poller.stats["failures"] >= 2
+    assert "API down" in poller.stats["last_error"]
+
+
+def test_stats_are_readable_while_a_refresh_is_in_flight(data):
+    requested, release = Event(), Event()
+
+    class Slow(Servers):
+        def _fetch(self):
+            def fetch(*args):
+                requested.set()
+                release.wait(5)
+                return [dict(raw) for raw in data]
+
+            return self, fetch, Server
+
+    poller = ServerPoller(Slow(), min_interval=10, max_interval=100)
+    polling = Thread(target=poller.poll)
+    polling.start()
+    assert requested.wait(5)
+
+    started = monotonic()
+    assert poller.stats["polls"] == 1
+    assert monotonic() - started < 1
+
+    release.set()
+    polling.join(5)
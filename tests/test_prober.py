@@ -0,0 +1,99 @@
+import socket
+
+import pytest
+
+from aq3d_api.decoder import get_decoder
+from aq3d_api.servers.prober import LatencyHistogram, ProbeResult, ServerProber
+from aq3d_api.servers.server import Server
+
+from tests.helpers import raw_server
+
+
+@pytest.fixture
+def listening():
+    with socket.socket() as listener:
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        yield listener.getsockname()[1]
+
+
+@pytest.fixture
+def closed_port():
+    with socket.socket() as unused:
+        unused.bind(("127.0.0.1", 0))
+        return unused.getsockname()[1]
+
+
+def server(oid: int, hostname: str, port: int) -> Server:
+    return get_decoder(Server).decode(raw_server(oid, hostname=hostname, port=port))
+
+
+def test_histogram_percentiles_are_bucket_bounds():
+    histogram = LatencyHistogram((10, 20, 50))
+    for latency in (1, 2, 15, 30, 70):
+        histogram.record(latency)
+
+    assert histogram.counts == [2, 1, 1, 1]
+    assert (histogram.min, histogram.max, histogram.mean) == (1, 70, 23.6)
+    assert histogram.percentile(40) == 10
+    assert histogram.percentile(60) == 20
+    assert histogram.percentile(100) == 70
+
+
+def test_empty_histograms_have_no_statistics():
+    histogram = LatencyHistogram()
+    assert histogram.count == 0
+    assert histogram.percentile(50) is None
+    assert histogram.min is None and histogram.max is None and histogram.mean is None
+
+
+def test_histograms_merge_with_the_same_bounds_only():
+    first, second = LatencyHistogram((10, 20)), LatencyHistogram((10, 20))
+    first.record(5)
+    second.record(15)
+    first.merge(second)
+    assert first.counts == [1, 1, 0]
+    assert (first.min, first.max, first.mean) == (5, 15, 10)
+
+    with pytest.raises(ValueError):
+        first.merge(LatencyHistogram((10,)))
+
+    with pytest.raises(ValueError):
+        LatencyHistogram((20, 10))
+
+
+def test_probe_records_reachable_and_unreachable_servers(listening, closed_port):
+    prober = ServerProber(timeout=2)
+    servers = [
+        server(1, "127.0.0.1", listening),
+        server(2, "127.0.0.1", closed_port),
+        server(3, "unresolvable.invalid", 5000)
+    ]
+    results = prober.run(servers)
+
+    assert isinstance(results[1], ProbeResult)
+    assert results[1].reachable and results[1].latency >= 0 and results[1].error is None
+    for server_id in (2, 3):
+        assert not results[server_id].reachable
+        assert results[server_id].latency is None
+        assert results[server_id].error
+
+    prober.run(servers[:1])
+    assert prober.reachability(1) == 1.0
+    assert prober.reachability(2) == 0.0
+    assert prober.reachability(4) is None
+    assert prober.histogram(1).count == 2
+    assert prober.histogram(2).count == 0
+
+    rows = {row["id"]: row for row in prober.report(servers)}
+    assert rows[1]["reachable"] and rows[1]["p50"] is not None
+    assert rows[2]["reachable"] is False and rows[2]["p99"] is None
+    assert prober.by_region(servers)["NA"].count == 2
+
+
+def test_prober_rejects_invalid_limits():
+    with pytest.raises(ValueError):
+        ServerProber(timeout=0)
+
+    with pytest.raises(ValueError):
+        ServerProber(concurrency=0)
@@ -0,0 +1,47 @@
+import pytest
+
+from aq3d_api.decoder import get_decoder
+from aq3d_api.servers.server import Server
+from aq3d_api.snapshots.retention import DAY, SnapshotRetention
+from aq3d_api.snapshots.server import ServerSnapshot
+from aq3d_api.snapshots.sinks import SQLiteSink
+
+from tests.helpers import raw_server
+
+
+def write(path, samples):
+    decode = get_decoder(Server).decode
+    sink = SQLiteSink(path)
+    sink.write([
+        ServerSnapshot.restore(ServerSnapshot(decode(raw_server(1, players))).server_data, timestamp)
+        for timestamp, players in samples
+    ])
+    sink.close()
+
+
+def test_old_snapshots_are_rolled_up_into_minutes_then_hours(tmp_path):
+    path = tmp_path / "snapshots.db"
+    # The API counts one user more than the public player count of a server.
+    write(path, [(0, 101), (10, 301), (70, 201), (19900, 501)])
+
+    with SnapshotRetention(path, raw_for=120, minute_for=7200) as retention:
+        assert retention.compact(now=20000) == {"raw": 3, "minutes": 2}
+        assert retention.series(1) == [(0, 3, 100, 300, 200.0), (19900, 1, 500, 500, 500)]
+        assert retention.compact(now=20000) == {"raw": 0, "minutes": 0}
+
+
+def test_late_snapshots_are_merged_into_existing_buckets(tmp_path):
+    path = tmp_path / "snapshots.db"
+    write(path, [(0, 101), (10, 301)])
+
+    with SnapshotRetention(path, raw_for=60, minute_for=DAY) as retention:
+        retention.compact(now=1000)
+        write(path, [(20, 601)])
+        retention.compact(now=1000)
+        assert retention.series(1, 0, 60) == [(0, 3, 100, 600, 1000 / 3)]
+
+
+def test_retention_tiers_must_be_ordered(tmp_path):
+    with pytest.raises(ValueError):
+        SnapshotRetention(tmp_path / "snapshots.db", raw_for=100, minute_for=10)
+
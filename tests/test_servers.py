@@ -0,0 +1,72 @@
+import pytest
+
+from aq3d_api.containers.servers import Servers
+from aq3d_api.servers.server import Server
+
+from tests.helpers import offline, raw_server
+
+
+def servers_of(data):
+    servers = offline(Servers, Server, data)
+    servers.refresh()
+    return servers
+
+
+def test_aggregates_are_cached_until_a_refresh():
+    # The API counts the server itself as a player.
+    data = [raw_server(1, 101), raw_server(2, 301, region="eu"), raw_server(3, 201)]
+    servers = servers_of(data)
+
+    assert servers.players_by_region is servers.players_by_region
+    assert dict(servers.players_by_region) == {"NA": 300, "EU": 300}
+    assert servers.total_players == 600
+
+    data[0] = raw_server(1, 501)
+    servers.refresh()
+    assert dict(servers.players_by_region) == {"NA": 700, "EU": 300}
+
+
+def test_players_by_region_is_read_only():
+    servers = servers_of([raw_server(1)])
+    with pytest.raises(TypeError):
+        servers.players_by_region["NA"] = 0
+
+
+def test_server_lists_are_copies_of_the_cache():
+    servers = servers_of([raw_server(1, 101), raw_server(2, 301)])
+    online = servers.online_servers
+    assert isinstance(online, list)
+    online.clear()
+    assert [server.id for server in servers.online_servers] == [1, 2]
+
+    ordered = servers.sorted_servers()
+    ordered.reverse()
+    assert [server.id for server in servers.sorted_servers()] == [2, 1]
+
+
+def test_aggregates_of_replaced_servers_are_not_cached(monkeypatch):
+    data = [raw_server(1, 101)]
+    servers = servers_of(data)
+    players = Server.players
+
+    def refresh_while_computing(server):
+        # A refresh from another thread lands while the total is computed.
+        monkeypatch.setattr(Server, "players", players)
+        data[0] = raw_server(1, 201)
+        servers.refresh()
+        return players.fget(server)
+
+    monkeypatch.setattr(Server, "players", property(refresh_while_computing))
+    assert servers.total_players == 100
+    assert servers.total_players == 200
+
+
+def test_top_servers_match_the_sorted_order():
+    servers = servers_of([raw_server(1, 101), raw_server(2, 301), raw_server(3, 201),
+                          raw_server(4, 901, status=0)])
+
+    assert [server.id for server in servers.top_servers(2)] == [2, 3]
+    assert [server.id for server in servers.sorted_servers(online=True)] == [2, 3, 1]
+    assert [server.id for server in servers.top_servers(2)] == [2, 3]
+    assert [server.id for server in servers.top_servers(1, online=False)] == [4]
+    assert servers.highest_population.id == 2
@@ -0,0 +1,67 @@
+from threading import Event
+from time import monotonic, sleep
+
+from aq3d_api.decoder import get_decoder
+from aq3d_api.servers.server import Server
+from aq3d_api.snapshots.server import ServerSnapshot
+from aq3d_api.snapshots.sinks import SnapshotPipeline, SnapshotSink, snapshot_record
+
+from tests.helpers import raw_server
+
+
+class RecordingSink(SnapshotSink):
+    def __init__(self, release: Event | None = None):
+        self.written = []
+        self.closed = False
+        self.__release = release
+
+    def write(self, snapshots):
+        if self.__release is not None:
+            self.__release.wait()
+
+        self.written.extend(snapshots)
+
+    def close(self):
+        self.closed = True
+
+
+def snapshot(oid: int = 1) -> ServerSnapshot:
+    return ServerSnapshot(get_decoder(Server).decode(raw_server(oid)))
+
+
+def test_close_writes_the_remaining_snapshots_and_closes_the_sink():
+    sink = RecordingSink()
+    pipeline = SnapshotPipeline([sink], batch_size=10, flush_interval=60)
+    pipeline.put_many(snapshot(oid) for oid in range(3))
+
+    assert pipeline.close(timeout=5)
+    assert len(sink.written) == 3
+    assert sink.closed
+    assert pipeline.stats[0]["written"] == 3
+
+
+def test_close_timeout_leaves_the_sink_to_its_writer():
+    release = Event()
+    sink = RecordingSink(release)
+    pipeline = SnapshotPipeline([sink], batch_size=1, flush_interval=60)
+    pipeline.put(snapshot())
+
+    assert not pipeline.close(timeout=0.05)
+    assert not sink.closed
+    assert "Timed out" in pipeline.stats[0]["last_error"]
+
+    release.set()
+    deadline = monotonic() + 5
+    while not sink.closed and monotonic() < deadline:
+        sleep(0.01)
+
+    assert sink.closed
+    assert len(sink.written) == 1
+
+
+def test_records_use_the_public_player_count_and_status():
+    decode = get_decoder(Server).decode
+    online = snapshot_record(ServerSnapshot(decode(raw_server(1, 101))))
+    maintenance = snapshot_record(ServerSnapshot(decode(raw_server(2, 3))))
+    assert (online["players"], online["status"]) == (100, "ONLINE")
+    assert maintenance["status"] == "MAINTENANCE"
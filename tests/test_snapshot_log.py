@@ -0,0 +1,48 @@
+import pytest
+
+from aq3d_api.decoder import get_decoder
+from aq3d_api.enums.server_status import ServerStatus
+from aq3d_api.servers.server import Server
+from aq3d_api.snapshots.log import SnapshotLog
+
+from tests.helpers import raw_server
+
+
+def servers(*players):
+    decode = get_decoder(Server).decode
+    return [decode(raw_server(oid, count)) for oid, count in enumerate(players, 1)]
+
+
+def test_snapshots_are_rebuilt_from_keyframes_and_changes():
+    log = SnapshotLog(keyframe_interval=3)
+    for timestamp, players in enumerate((101, 102, 102, 150, 0)):
+        log.capture(servers(players), timestamp)
+
+    snapshots = list(log.snapshots(1))
+    assert [snapshot.timestamp for snapshot in snapshots] == [0, 1, 2, 3, 4]
+    assert [snapshot.server_data["players"] for snapshot in snapshots] == [101, 102, 102, 150, 0]
+    assert all(snapshot.server_data["name"] == "Server1" for snapshot in snapshots)
+    assert log.latest(1).server_data["players"] == 0
+    assert log.latest(1).timestamp == 4
+
+
+def test_servers_are_rebuilt_independently():
+    log = SnapshotLog(keyframe_interval=100)
+    log.capture(servers(101, 201), 0)
+    log.capture(servers(101, 202), 1)
+
+    assert len(log) == 4 and log.server_ids == [1, 2]
+    assert [snapshot.server_data["players"] for snapshot in log.snapshots(1)] == [101, 101]
+    assert [snapshot.server_data["players"] for snapshot in log.snapshots(2)] == [201, 202]
+
+
+def test_appended_snapshots_are_kept():
+    log = SnapshotLog()
+    snapshot = servers(101)[0].create_snapshot()
+    log.append(snapshot)
+    assert log.latest(1).server_data == snapshot.server_data
+    assert log.latest(1).server_data["status"] is ServerStatus.ONLINE
+    assert log.latest(2) is None
+
+    with pytest.raises(ValueError):
+        SnapshotLog(keyframe_interval=0)
@@ -0,0 +1,106 @@
+from threading import Event, Thread
+
+from aq3d_api.containers.dialogs import Dialogs
+from aq3d_api.containers.items import Items
+from aq3d_api.containers.servers import Servers
+from aq3d_api.dialogs.dialog import Dialog
+from aq3d_api.items.item import Item
+from aq3d_api.servers.server import Server
+from aq3d_api.storage.sqlite import SQLiteStorage
+
+from tests.helpers import offline, raw_dialog, raw_item, raw_server
+
+
+def test_refresh_removes_objects_missing_from_the_fetch():
+    data = [raw_dialog(1, npcs=(10,)), raw_dialog(2, npcs=(20,))]
+    dialogs = offline(Dialogs, Dialog, data, {
+        "storage": SQLiteStorage(), "min-index": 1, "max-index": 2
+    })
+    dialogs.refresh()
+    assert [dialog.id for dialog in dialogs] == [1, 2]
+
+    del data[0]
+    dialogs.refresh()
+    assert len(dialogs.dialogs) == 1
+    assert [dialog.id for dialog in dialogs] == [2]
+
+
+def test_refresh_keeps_objects_outside_the_fetched_range():
+    storage = SQLiteStorage()
+    storage.upsert_raw(Item, [raw_item(50)])
+    items = offline(Items, Item, [raw_item(1), raw_item(2)], {
+        "storage": storage, "min-index": 1, "max-index": 10
+    })
+    items.refresh()
+    assert [item.id for item in items] == [1, 2, 50]
+
+
+def test_servers_are_synced_regardless_of_range():
+    data = [raw_server(1), raw_server(7)]
+    servers = offline(Servers, Server, data, {"storage": SQLiteStorage()})
+    servers.refresh()
+    data.pop()
+    servers.refresh()
+    assert [server.id for server in servers] == [1]
+
+
+def test_stored_records_index_by_id():
+    storage = SQLiteStorage()
+    storage.upsert_raw(Item, [raw_item(oid) for oid in (3, 9, 4, 20)])
+    records = storage.records(Item)
+
+    assert len(records) == 4
+    assert records[0].id == 3
+    assert records[-1].id == 20
+    assert [item.id for item in records[1:3]] == [4, 9]
+    assert [item.id for item in records[::2]] == [3, 9]
+
+    records.append(next(storage.find(Item, id=3)))
+    assert len(records) == 4
+
+
+def test_stored_records_count_is_read_once():
+    storage = SQLiteStorage()
+    storage.upsert_raw(Item, [raw_item(oid) for oid in range(1, 50)])
+    records = storage.records(Item)
+    statements = []
+    storage.connection.set_trace_callback(statements.append)
+
+    for index in range(len(records)):
+        records[index]
+
+    assert sum("ORDER BY id" in sql and "SELECT id FROM" in sql for sql in statements) == 1
+    assert not any("COUNT(*)" in sql or "OFFSET 1" in sql for sql in statements)
+
+
+def test_threads_use_their_own_connection(tmp_path):
+    storage = SQLiteStorage(tmp_path / "catalog.db")
+    connections = []
+    thread = Thread(target=lambda: connections.append(storage.connection))
+    thread.start()
+    thread.join()
+
+    assert connections[0] is not storage.connection
+    storage.close()
+
+
+def test_readers_never_see_a_partial_refresh(tmp_path):
+    storage = SQLiteStorage(tmp_path / "catalog.db", batch_size=10)
+    storage.upsert_raw(Item, [raw_item(oid, name="Old") for oid in range(1, 201)])
+    finished = Event()
+    seen = []
+
+    def write():
+        for round in range(10):
+            storage.upsert_raw(Item, [raw_item(oid, name=f"R{round}") for oid in range(1, 201)])
+
+        finished.set()
+
+    writer = Thread(target=write)
+    writer.start()
+    while not finished.is_set():
+        seen.append({item.name for item in storage.select(Item)})
+
+    writer.join()
+    assert all(len(names) == 1 for names in seen)
+    storage.close()
@@ -0,0 +1,83 @@
+from aq3d_api import utils
+from aq3d_api.containers.items import Items
+from aq3d_api.items.item import Item
+from aq3d_api.storage.catalog import Catalog
+
+from tests.helpers import offline, raw_item
+
+
+def test_warm_start_file_is_rewritten_at_most_once_per_interval(tmp_path):
+    path = tmp_path / "items.jsonl"
+    data = [raw_item(1, "Sword")]
+    items = offline(Items, Item, data, {"max-index": 1, "warm-start": path})
+
+    items.refresh()
+    assert [record["name"] for record in utils.read_jsonl(path)] == ["Sword"]
+
+    data[0] = raw_item(1, "Axe")
+    items.refresh()
+    assert [record["name"] for record in utils.read_jsonl(path)] == ["Sword"]
+
+
+def test_warm_start_file_is_rewritten_once_the_interval_passed(tmp_path):
+    path = tmp_path / "items.jsonl"
+    data = [raw_item(1, "Sword")]
+    items = offline(Items, Item, data, {
+        "max-index": 1, "warm-start": path, "save-warm-start-interval": 0
+    })
+
+    items.refresh()
+    data[0] = raw_item(1, "Axe")
+    items.refresh()
+    assert [record["name"] for record in utils.read_jsonl(path)] == ["Axe"]
+
+
+def test_served_catalog_is_closed_before_being_replaced(tmp_path, monkeypatch):
+    path = tmp_path / "items.cat"
+    source = offline(Items, Item, [raw_item(1, "Sword")], {"max-index": 1})
+    source.refresh()
+    source.to_catalog(path)
+
+    closed = []
+    close = Catalog.close
+    monkeypatch.setattr(Catalog, "close", lambda self: closed.append(self) or close(self))
+
+    items = offline(Items, Item, [raw_item(1, "Axe"), raw_item(2, "Bow")], {
+        "max-index": 2, "warm-start": path
+    })
+    items.update()
+    assert items.wait_for_refresh(5)
+
+    assert len(closed) == 1
+    assert [item.name for item in items] == ["Axe", "Bow"]
+    with Catalog(path, Item) as catalog:
+        assert [item.name for item in catalog] == ["Axe", "Bow"]
+
+
+def test_failed_background_update_is_recorded_and_retried(tmp_path):
+    path = tmp_path / "items.jsonl"
+    source = offline(Items, Item, [raw_item(1, "Sword")], {"max-index": 1})
+    source.refresh()
+    source.to_jsonl(path)
+
+    responses = [ConnectionError("API unreachable"), [raw_item(1, "Axe")]]
+
+    class Flaky(Items):
+        def _fetch(self):
+            def fetch(*args):
+                response = responses.pop(0)
+                if isinstance(response, Exception):
+                    raise response
+
+                return response
+
+            return self, fetch, Item
+
+    items = Flaky({"max-index": 1, "warm-start": path, "save-warm-start": False})
+    items.update()
+    assert items.wait_for_refresh(5)
+    assert isinstance(items.last_refresh_error, ConnectionError)
+
+    # The update interval is disabled, the failed update is still retried.
+    assert [item.name for item in items] == ["Axe"]
+    assert items.last_refresh_error is None